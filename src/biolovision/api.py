@@ -2,6 +2,15 @@
 
 Methods, see each class.
 
+Functions:
+
+- get_session                - Return the HTTP session shared by a site
+- close_sessions             - Close all shared HTTP sessions
+- get_rate_limiter           - Return the rate limiter shared by a site
+- get_circuit_breaker        - Return the circuit breaker shared by a site
+- set_json_decoder           - Select the JSON decoder used for API responses
+- decode_json                - Decode an API response body
+
 Properties:
 
 - transfer_errors            - Return number of HTTP errors
@@ -10,23 +19,60 @@ Exceptions:
 
 - BiolovisionApiException    - General exception
 - HTTPError                  - HTTP protocol error
+- CircuitOpenError           - Requests suspended after too many errors
 - MaxChunksError             - Too many chunks returned from API calls
+- MaxRequestsError           - Too many requests from an API instance
 - IncorrectParameter         - Incorrect or missing parameter
 
 """
 
 import json
 import logging
+import math
+import random
 import re
+import threading
 import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 from functools import lru_cache
+from typing import Any
 from urllib import parse
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth1
+from urllib3.util.retry import Retry
 
 from . import __version__
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+try:
+    import simdjson
+except ImportError:  # pragma: no cover
+    simdjson = None
+
+# HTTP sessions shared by all API instances, one per site
+_sessions = {}
+_sessions_lock = threading.Lock()
+# Rate limiters shared by all API instances, one per site
+_rate_limiters = {}
+# Circuit breakers shared by all API instances, one per site
+_circuit_breakers = {}
+
+# Remove DEBUG logging level of HTTP libraries, to avoid too many details
+for _name in ("urllib3", "requests_oauthlib", "oauthlib"):
+    logging.getLogger(_name).setLevel(logging.INFO)
+
+# Max length of extra text, before or after JSON content, searched in responses
+_MAX_EXTRA_TEXT = 65536
+# JSON decoder for response bodies, selected by set_json_decoder
+_json_loads = json.loads
+
 
 class HashableDict(dict):
     """Provide hashable dict type, to enable @lru_cache."""
@@ -35,6 +81,412 @@ class HashableDict(dict):
         return hash(frozenset(self))
 
 
+def get_session(base_url: str, pool_size: int = 10, max_retry: int = 5) -> requests.Session:
+    """Return the HTTP session shared by all API instances of a site.
+
+    The session is created on first call and reused afterwards, so that
+    all controlers of a site share the same keep-alive connection pool.
+    Parameters are only used when the session is created.
+
+    Parameters
+    ----------
+    base_url : str
+        Site URL, used as session key.
+    pool_size : int
+        Maximum number of connections kept alive in the pool.
+    max_retry : int
+        Number of retries on connection errors. HTTP status errors
+        are handled by _url_get.
+
+    Returns
+    -------
+    requests.Session
+        Session shared by all API instances of this site.
+    """
+    with _sessions_lock:
+        if base_url not in _sessions:
+            logging.getLogger(__name__).debug(_("Creating HTTP session for %s, pool size %d"), base_url, pool_size)
+            retries = Retry(
+                total=max_retry,
+                connect=max_retry,
+                read=0,
+                status=0,
+                backoff_factor=0.5,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[base_url] = session
+        return _sessions[base_url]
+
+
+def close_sessions() -> None:
+    """Close all shared HTTP sessions and release their connections, rate limiters and circuit breakers."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _rate_limiters.clear()
+        _circuit_breakers.clear()
+
+
+class RateLimiter:
+    """Token bucket limiting the rate and concurrency of requests to a site.
+
+    Shared by all threads and API instances of a site. Each request takes a
+    token, refilled at requests_per_second, up to burst tokens.
+    Use as context manager around each request.
+
+    Parameters
+    ----------
+    requests_per_second : float
+        Average rate of requests. 0 means unlimited.
+    max_concurrent : int
+        Maximum number of requests in flight. 0 means unlimited.
+    burst : int or None
+        Maximum number of requests sent at once, after an idle period.
+        Defaults to requests_per_second, rounded up.
+    """
+
+    def __init__(self, requests_per_second: float = 0, max_concurrent: int = 0, burst: int | None = None) -> None:
+        self._rate = requests_per_second
+        self._burst = max(1, math.ceil(requests_per_second)) if burst is None else burst
+        self._tokens = self._burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent > 0 else None
+
+    @property
+    def requests_per_second(self) -> float:
+        """Return the average rate of requests, 0 if unlimited."""
+        return self._rate
+
+    def reserve(self) -> float:
+        """Take a token and return the delay to wait before sending the request.
+
+        Returns
+        -------
+        float
+            Delay, in seconds, until the token is available.
+        """
+        if self._rate <= 0:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            # Tokens may go negative: later requests wait longer
+            self._tokens -= 1
+            return 0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    def __enter__(self):
+        if self._slots is not None:
+            self._slots.acquire()
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._slots is not None:
+            self._slots.release()
+
+
+def get_rate_limiter(base_url: str, requests_per_second: float = 0, max_concurrent: int = 0) -> RateLimiter:
+    """Return the rate limiter shared by all API instances of a site.
+
+    The rate limiter is created on first call and reused afterwards.
+    Parameters are only used when the rate limiter is created.
+
+    Parameters
+    ----------
+    base_url : str
+        Site URL, used as rate limiter key.
+    requests_per_second : float
+        Average rate of requests. 0 means unlimited.
+    max_concurrent : int
+        Maximum number of requests in flight. 0 means unlimited.
+
+    Returns
+    -------
+    RateLimiter
+        Rate limiter shared by all API instances of this site.
+    """
+    with _sessions_lock:
+        if base_url not in _rate_limiters:
+            logging.getLogger(__name__).debug(
+                _("Creating rate limiter for %s, %s requests/s, %d concurrent requests"),
+                base_url,
+                requests_per_second,
+                max_concurrent,
+            )
+            _rate_limiters[base_url] = RateLimiter(requests_per_second, max_concurrent)
+        return _rate_limiters[base_url]
+
+
+class RetryPolicy:
+    """Delay between retries of a request: exponential backoff with jitter.
+
+    The delay doubles after each error, from retry_delay up to max_delay,
+    and is randomly reduced by up to jitter, so that clients do not retry
+    all together. A Retry-After header, sent by the server, takes precedence.
+
+    Parameters
+    ----------
+    max_retry : int
+        Retry budget of each request.
+    retry_delay : float
+        Delay before the first retry, in seconds.
+    max_delay : float
+        Maximum delay between retries, in seconds, including Retry-After.
+    backoff : float
+        Delay multiplier after each error.
+    jitter : float
+        Fraction of the delay randomly removed, between 0 and 1.
+    """
+
+    def __init__(
+        self,
+        max_retry: int = 5,
+        retry_delay: float = 5,
+        max_delay: float = 600,
+        backoff: float = 2,
+        jitter: float = 0.5,
+    ) -> None:
+        self.max_retry = max_retry
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.jitter = jitter
+
+    @staticmethod
+    def _retry_after(value: str | None) -> float | None:
+        """Return the delay requested by a Retry-After header, in seconds, or None."""
+        if value is None:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max((date - datetime.now(UTC)).total_seconds(), 0)
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """Return the delay before retrying.
+
+        Parameters
+        ----------
+        attempt : int
+            Number of errors of the request so far, starting at 1.
+        retry_after : str or None
+            Retry-After header of the response, if any.
+
+        Returns
+        -------
+        float
+            Delay, in seconds.
+        """
+        wait = self._retry_after(retry_after)
+        if wait is not None:
+            return min(wait, self.max_delay)
+        wait = min(self.max_delay, self.retry_delay * self.backoff ** (attempt - 1))
+        return wait * (1 - self.jitter * random.random())  # noqa: S311
+
+
+class CircuitBreaker:
+    """Suspend requests to a site after too many consecutive errors.
+
+    Shared by all threads and API instances of a site. After failure_threshold
+    consecutive server errors, the circuit opens and requests fail immediately
+    with CircuitOpenError. After reset_timeout, a single trial request is
+    allowed: the circuit closes if it succeeds, else opens again.
+
+    Parameters
+    ----------
+    failure_threshold : int
+        Number of consecutive errors opening the circuit. 0 disables the circuit breaker.
+    reset_timeout : float
+        Delay, in seconds, before trying again after the circuit opened.
+    """
+
+    def __init__(self, failure_threshold: int = 0, reset_timeout: float = 600) -> None:
+        self._threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if requests are suspended."""
+        return self._opened_at is not None
+
+    def before_request(self) -> None:
+        """Check that a request can be sent.
+
+        Raises
+        ------
+        CircuitOpenError
+            The circuit is open and no trial request is allowed yet.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._trial or time.monotonic() - self._opened_at < self._reset_timeout:
+                raise CircuitOpenError(503)
+            # Half-open: let this request try
+            self._trial = True
+
+    def record_success(self) -> None:
+        """Record a successful request, closing the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        """Record a server error, opening the circuit if too many."""
+        with self._lock:
+            self._failures += 1
+            if self._trial or (self._threshold > 0 and self._failures >= self._threshold):
+                if self._opened_at is None or self._trial:
+                    logging.getLogger(__name__).error(
+                        _("Too many consecutive errors %d, suspending requests for %s seconds"),
+                        self._failures,
+                        self._reset_timeout,
+                    )
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+
+def get_circuit_breaker(base_url: str, failure_threshold: int = 0, reset_timeout: float = 600) -> CircuitBreaker:
+    """Return the circuit breaker shared by all API instances of a site.
+
+    The circuit breaker is created on first call and reused afterwards.
+    Parameters are only used when the circuit breaker is created.
+
+    Parameters
+    ----------
+    base_url : str
+        Site URL, used as circuit breaker key.
+    failure_threshold : int
+        Number of consecutive errors opening the circuit. 0 disables the circuit breaker.
+    reset_timeout : float
+        Delay, in seconds, before trying again after the circuit opened.
+
+    Returns
+    -------
+    CircuitBreaker
+        Circuit breaker shared by all API instances of this site.
+    """
+    with _sessions_lock:
+        if base_url not in _circuit_breakers:
+            _circuit_breakers[base_url] = CircuitBreaker(failure_threshold, reset_timeout)
+        return _circuit_breakers[base_url]
+
+
+def set_json_decoder(loads: Callable[[bytes], Any] | None = None) -> None:
+    """Select the JSON decoder used for all API responses.
+
+    Parameters
+    ----------
+    loads : callable or None
+        Function decoding JSON from bytes. If None, use the fastest decoder
+        available: orjson, simdjson or else json from standard library.
+    """
+    global _json_loads
+    if loads is None:
+        if orjson is not None:
+            loads = orjson.loads
+        elif simdjson is not None:
+            loads = simdjson.loads
+        else:  # pragma: no cover
+            loads = json.loads
+    _json_loads = loads
+
+
+def decode_json(content: bytes) -> Any:
+    """Decode an API response body, ignoring extra text outside JSON content.
+
+    JSON content is located by scanning for the first opening and last closing
+    bracket, in a bounded window at each end of the body.
+
+    Parameters
+    ----------
+    content : bytes
+        Response body.
+
+    Returns
+    -------
+    json : dict or list
+        Decoded JSON content, or empty dict if none was found.
+
+    Raises
+    ------
+    ValueError
+        If the JSON content cannot be decoded.
+    """
+    content = content.strip()
+    if len(content) == 0:
+        return {}
+    if content[:1] not in (b"{", b"[") or content[-1:] not in (b"}", b"]"):
+        # TWEAK: remove extra text outside JSON response
+        starts = [
+            i for i in (content.find(b"{", 0, _MAX_EXTRA_TEXT), content.find(b"[", 0, _MAX_EXTRA_TEXT)) if i >= 0
+        ]
+        low = max(len(content) - _MAX_EXTRA_TEXT, 0)
+        end = max(content.rfind(b"}", low), content.rfind(b"]", low))
+        if len(starts) == 0 or end < min(starts):
+            return {}
+        content = content[min(starts) : end + 1]
+    return _json_loads(content)
+
+
+set_json_decoder()
+
+
+class RequestCounter:
+    """Count the requests of an API instance and of its copies.
+
+    Copies of an API instance, used by worker threads, share its counter,
+    so that max_requests limits the requests of all of them.
+
+    Parameters
+    ----------
+    max_requests : int
+        Maximum number of requests. 0 means unlimited.
+    """
+
+    def __init__(self, max_requests: int = 0) -> None:
+        self._max_requests = max_requests
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        """Return the number of requests counted."""
+        return self._count
+
+    def add(self) -> bool:
+        """Count a new request, unless max_requests is reached.
+
+        Returns
+        -------
+        bool
+            False if the request is not allowed.
+        """
+        with self._lock:
+            if self._max_requests > 0 and self._count >= self._max_requests:
+                return False
+            self._count += 1
+            return True
+
+
 class BiolovisionApiException(Exception):
     """An exception occurred while handling your request."""
 
@@ -43,10 +495,18 @@ class HTTPError(BiolovisionApiException):
     """An HTTP error occurred."""
 
 
+class CircuitOpenError(HTTPError):
+    """Requests to the site are suspended after too many errors."""
+
+
 class MaxChunksError(BiolovisionApiException):
     """Too many chunks returned from API calls."""
 
 
+class MaxRequestsError(BiolovisionApiException):
+    """Too many requests from an API instance."""
+
+
 class NotImplementedException(BiolovisionApiException):
     """Feature not implemented."""
 
@@ -72,6 +532,10 @@ class BiolovisionAPI:
         unavailable_delay: int | None = None,
         retry_delay: int | None = None,
         timeout: int | None = None,
+        session: requests.Session | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
     ) -> None:
         logger = logging.getLogger(__name__)
         self._logger = logger
@@ -120,10 +584,24 @@ class BiolovisionAPI:
         }
         self._transfer_errors = 0
         self._http_status = 0
+        # Shared with copies of this instance
+        self._request_counter = RequestCounter(max_requests)
+        self._last_response_bytes = 0
 
         # Using OAuth1 auth helper to get access
+        self._base_url = base_url
         self._api_url = base_url + "api/"  # URL of API
         self._oauth = OAuth1(client_key, client_secret=client_secret)
+        # Keep-alive connections, shared with other controlers of the site
+        self._session = session
+        # Requests rate, shared with other controlers of the site
+        self._rate_limiter = get_rate_limiter(base_url) if rate_limiter is None else rate_limiter
+        # Delay between retries of each request
+        if retry_policy is None:
+            retry_policy = RetryPolicy(max_retry=max_retry, retry_delay=retry_delay, max_delay=unavailable_delay)
+        self._retry_policy = retry_policy
+        # Server errors, shared with other controlers of the site
+        self._circuit_breaker = get_circuit_breaker(base_url) if circuit_breaker is None else circuit_breaker
 
     @property
     def version(self) -> str:
@@ -145,6 +623,23 @@ class BiolovisionAPI:
         """Return the controler name."""
         return self._ctrl
 
+    @property
+    def nb_requests(self) -> int:
+        """Return the number of HTTP requests sent by this instance and its copies."""
+        return self._request_counter.count
+
+    @property
+    def last_response_bytes(self) -> int:
+        """Return the byte length of the response body of the latest API call, summed over its chunks."""
+        return self._last_response_bytes
+
+    @property
+    def session(self) -> requests.Session:
+        """Return the HTTP session used for requests, shared by the site if not given."""
+        if self._session is None:
+            self._session = get_session(self._base_url, max_retry=self._limits["max_retry"])
+        return self._session
+
     # ----------------
     # Internal methods
     # ----------------
@@ -156,11 +651,300 @@ class BiolovisionAPI:
         c_params["user_pw"] = "***"
         return c_params
 
-    def _url_get(self, params, scope, method="GET", body=None, optional_headers=None):
-        """Internal function used to request from Biolovision API.
+    def _prepare_request(self, params, optional_headers=None):
+        """Encode URL parameters and build headers of a request.
+
+        Parameters
+        ----------
+        params : dict of 'parameter name': 'parameter value'
+            params is used to build URL GET string.
+        optional_headers : dict
+            Optional headers for request
+
+        Returns
+        -------
+        tuple
+            URL encoded parameters and headers.
+        """
+        payload = parse.urlencode(params, quote_via=parse.quote)
+        self._logger.debug(
+            _("Params: %s"),
+            re.sub(
+                r"user_pw=.*?(&|$)(.*)",
+                r"user_pw=***\1\2",
+                re.sub(r"user_email=.*?(&|$)(.*)", r"user_email=***\1\2", payload),
+            ),
+        )
+        headers = {"Content-Type": "application/json;charset=UTF-8"}
+        if optional_headers is not None:
+            headers.update(optional_headers)
+        return payload, headers
+
+    def _count_request(self):
+        """Count a new request, checking max_requests limit.
+
+        Raises
+        ------
+        MaxRequestsError
+            Number of requests exceeded max_requests limit.
+        """
+        if not self._request_counter.add():
+            self._logger.critical(_("Too many requests %d, raising exception"), self._request_counter.count)
+            raise MaxRequestsError
+
+    def _error_delay(self, resp, method, url, attempt):
+        """Log an HTTP error and return the delay to wait before retrying.
+
+        Parameters
+        ----------
+        resp : Response
+            HTTP response, with error status code.
+        method : str
+            HTTP method used.
+        url : str
+            URL requested.
+        attempt : int
+            Number of errors of this request so far, including this one.
+
+        Returns
+        -------
+        float
+            Delay, in seconds, before retrying.
+
+        Raises
+        ------
+        HTTPError
+            Unrecoverable error or retry budget exhausted.
+        """
+        # Request returned an error.
+        # Logging and checking if not too many errors to continue
+        self._logger.error(
+            _("%s status code: %s, text: %s, for URL %s"),
+            method,
+            resp.status_code,
+            resp.text,
+            url,
+        )
+        self._transfer_errors = attempt
+
+        if (resp.status_code >= 400) and (resp.status_code <= 499):  # pragma: no cover
+            # Unreceverable error
+            self._logger.error(resp)
+            self._logger.critical(
+                _("Unreceverable error %s, raising exception"),
+                resp.status_code,
+            )
+            raise HTTPError(resp.status_code)
+        self._circuit_breaker.record_failure()
+        if attempt > self._retry_policy.max_retry:  # pragma: no cover
+            # Too many retries. Raising exception
+            self._logger.critical(_("Too many error %s, raising exception"), attempt)
+            raise HTTPError(resp.status_code)
+        delay = self._retry_policy.delay(attempt, resp.headers.get("Retry-After"))
+        self._logger.info(_("Retrying in %.1f seconds, after error %d"), delay, attempt)
+        return delay
+
+    def _decode_response(self, resp, method):
+        """Decode the json content of a successful response.
+
+        Parameters
+        ----------
+        resp : Response
+            HTTP response, with success status code.
+        method : str
+            HTTP method used.
+
+        Returns
+        -------
+        json : dict
+            dict decoded from json, empty if no content.
+        """
+        if method in ["PUT", "DELETE"]:
+            # No response expected
+            return {}
+        try:
+            self._logger.debug(_("Response content: %s, text: %s"), resp, resp.content[:1000])
+            return decode_json(resp.content)
+        except ValueError:  # pragma: no cover
+            # Error during JSON decoding =>
+            # Logging error and no further processing of empty chunk
+            self._logger.exception(_("Incorrect response content: %s"), resp)
+            return {}
+        except Exception:
+            self._logger.exception(_("Response text causing exception: %s"), resp.text)
+            raise
+
+    def _next_chunk(self, resp, params):
+        """Update request parameters to get the next chunk, if any.
+
+        Parameters
+        ----------
+        resp : Response
+            HTTP response of the current chunk.
+        params : dict of 'parameter name': 'parameter value'
+            Request parameters, updated with the pagination key.
+
+        Returns
+        -------
+        bool
+            True if there is more data to come.
+        """
+        if (
+            ("transfer-encoding" in resp.headers)
+            and (resp.headers["transfer-encoding"] == "chunked")
+            and ("pagination_key" in resp.headers)
+        ):
+            self._logger.debug(
+                _("Chunked transfer => requesting for more, with key: %s"),
+                resp.headers["pagination_key"],
+            )
+            # Update request parameters to get next chunk
+            params["pagination_key"] = resp.headers["pagination_key"]
+            return True
+        else:
+            self._logger.debug(_("Non-chunked transfer => finished requests"))
+            if "pagination_key" in params:
+                del params["pagination_key"]
+            return False
+
+    def _merge_chunk(self, data_rec, resp_chunk, nb_chunks):
+        """Append a chunk to the response received so far.
+
+        Parameters
+        ----------
+        data_rec : dict or None
+            Response received from previous chunks.
+        resp_chunk : dict
+            Chunk to append.
+        nb_chunks : int
+            Chunk number, starting at 0.
+
+        Returns
+        -------
+        json : dict
+            Response, including this chunk.
+        """
+        # Initialize or append to response dict, depending on content
+        if "data" in resp_chunk:
+            observations = False
+            if "sightings" in resp_chunk["data"]:
+                observations = True
+                self._logger.debug(
+                    _("Received %d sightings in chunk %d"),
+                    len(resp_chunk["data"]["sightings"]),
+                    nb_chunks,
+                )
+                if nb_chunks == 0:
+                    data_rec = resp_chunk
+                else:
+                    if "sightings" in data_rec["data"]:
+                        data_rec["data"]["sightings"] += resp_chunk["data"]["sightings"]
+                    else:
+                        # self._logger.error(_("No 'sightings' in previous data"))
+                        # self._logger.error(data_rec)
+                        # self._logger.error(resp_chunk)
+                        data_rec["data"]["sightings"] = resp_chunk["data"]["sightings"]
+            if "forms" in resp_chunk["data"]:
+                observations = True
+                self._logger.debug(
+                    _("Received %d forms in chunk %d"),
+                    len(resp_chunk["data"]["forms"]),
+                    nb_chunks,
+                )
+                if nb_chunks == 0:
+                    data_rec = resp_chunk
+                else:
+                    if "forms" in data_rec["data"]:
+                        data_rec["data"]["forms"] += resp_chunk["data"]["forms"]
+                    else:  # pragma: no cover
+                        # self._logger.error(
+                        #     _("Trying to add 'forms' to another data stream")
+                        # )
+                        # self._logger.error(data_rec)
+                        # self._logger.error(resp_chunk)
+                        data_rec["data"]["forms"] = resp_chunk["data"]["forms"]
+
+            if not observations:
+                self._logger.debug(
+                    _("Received %d data items in chunk %d"),
+                    len(resp_chunk),
+                    nb_chunks,
+                )
+                if nb_chunks == 0:
+                    data_rec = resp_chunk
+                else:
+                    data_rec["data"] += resp_chunk["data"]
+        else:
+            self._logger.debug(_("Received non-data response: %s"), resp_chunk)
+            if nb_chunks == 0:
+                data_rec = resp_chunk
+            else:
+                data_rec += resp_chunk
+        return data_rec
+
+    def _send(self, method, url, payload, headers, body=None):
+        """Send an HTTP request through the session.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method to use: GET/POST/DELETE/PUT.
+        url : str
+            URL to request.
+        payload : str
+            URL encoded parameters.
+        headers : dict
+            Request headers.
+        body : str
+            Optional body for POST or PUT
+
+        Returns
+        -------
+        Response
+            HTTP response.
+        """
+        if method == "GET":
+            return self.session.get(
+                url=url,
+                auth=self._oauth,
+                params=payload,
+                headers=headers,
+                timeout=self._limits["timeout"],
+            )
+        elif method == "POST":
+            return self.session.post(
+                url=url,
+                auth=self._oauth,
+                params=payload,
+                headers=headers,
+                data=body,
+                timeout=self._limits["timeout"],
+            )
+        elif method == "PUT":
+            return self.session.put(
+                url=url,
+                auth=self._oauth,
+                params=payload,
+                headers=headers,
+                data=body,
+                timeout=self._limits["timeout"],
+            )
+        elif method == "DELETE":
+            return self.session.delete(
+                url=url,
+                auth=self._oauth,
+                params=payload,
+                headers=headers,
+                timeout=self._limits["timeout"],
+            )
+        else:
+            raise NotImplementedException
+
+    def _url_iter(self, params, scope, method="GET", body=None, optional_headers=None):
+        """Internal generator used to request chunks from Biolovision API.
 
         Prepare the URL header, perform HTTP request and get json content.
-        Test HTTP status and returns None if error, else return decoded json content.
+        Test HTTP status and yield each decoded json chunk as soon as it is received.
         Increments _transfer_errors in case of error.
 
         Parameters
@@ -176,10 +960,10 @@ class BiolovisionAPI:
         optional_headers : dict
             Optional body for request
 
-        Returns
-        -------
+        Yields
+        ------
         json : dict
-            dict decoded from json if status OK, else None.
+            dict decoded from json chunk.
 
         Raises
         ------
@@ -191,65 +975,25 @@ class BiolovisionAPI:
         """
         # Loop on chunks
         nb_chunks = 0
-        data_rec = None
+        # Error count of this request, for its retry budget
+        nb_errors = 0
+        self._last_response_bytes = 0
         while nb_chunks < self._limits["max_chunks"]:
-            # Remove DEBUG logging level to avoid too many details
-            level = logging.getLogger().level
-            logging.getLogger().setLevel(logging.INFO)
+            self._circuit_breaker.before_request()
+            self._count_request()
 
             # Prepare call to API
-            payload = parse.urlencode(params, quote_via=parse.quote)
-            self._logger.debug(
-                _("Params: %s"),
-                re.sub(
-                    r"user_pw=.*?(&|$)(.*)",
-                    r"user_pw=***\1\2",
-                    re.sub(r"user_email=.*?(&|$)(.*)", r"user_email=***\1\2", payload),
-                ),
-            )
-            headers = {"Content-Type": "application/json;charset=UTF-8"}
-            if optional_headers is not None:
-                headers.update(optional_headers)
+            payload, headers = self._prepare_request(params, optional_headers)
             protected_url = self._api_url + scope
-            if method == "GET":
-                resp = requests.get(
-                    url=protected_url,
-                    auth=self._oauth,
-                    params=payload,
-                    headers=headers,
-                    timeout=self._limits["timeout"],
-                )
-            elif method == "POST":
-                resp = requests.post(
-                    url=protected_url,
-                    auth=self._oauth,
-                    params=payload,
-                    headers=headers,
-                    data=body,
-                    timeout=self._limits["timeout"],
-                )
-            elif method == "PUT":
-                resp = requests.put(
-                    url=protected_url,
-                    auth=self._oauth,
-                    params=payload,
-                    headers=headers,
-                    data=body,
-                    timeout=self._limits["timeout"],
-                )
-            elif method == "DELETE":
-                resp = requests.delete(
-                    url=protected_url,
-                    auth=self._oauth,
-                    params=payload,
-                    headers=headers,
-                    timeout=self._limits["timeout"],
-                )
-            else:
-                raise NotImplementedException
+            with self._rate_limiter:
+                try:
+                    resp = self._send(method, protected_url, payload, headers, body)
+                except requests.RequestException:
+                    # Connection failed, after retries by the session
+                    self._circuit_breaker.record_failure()
+                    raise
 
             self._logger.debug(resp.headers)
-            logging.getLogger().setLevel(level)
             self._logger.debug(
                 _("%s status code = %s, for URL %s"),
                 method,
@@ -258,141 +1002,61 @@ class BiolovisionAPI:
             )
             self._http_status = resp.status_code
             if self._http_status >= 300:
-                # Request returned an error.
-                # Logging and checking if not too many errors to continue
-                self._logger.error(
-                    _("%s status code: %s, text: %s, for URL %s"),
-                    method,
-                    resp.status_code,
-                    resp.text,
-                    protected_url,
-                )
-
-                if (self._http_status >= 400) and (self._http_status <= 499):  # pragma: no cover
-                    # Unreceverable error
-                    self._logger.error(resp)
-                    self._logger.critical(
-                        _("Unreceverable error %s, raising exception"),
-                        self._http_status,
-                    )
-                    raise HTTPError(resp.status_code)
-                self._transfer_errors += 1  # pragma: no cover
-                if self._http_status == 503:  # pragma: no cover
-                    # Service unavailable: long wait
-                    time.sleep(self._limits["unavailable_delay"])
-                else:
-                    # A transient error: short wait
-                    time.sleep(self._limits["retry_delay"])
-
-                if self._transfer_errors > self._limits["max_retry"]:  # pragma: no cover
-                    # Too many retries. Raising exception
-                    self._logger.critical(_("Too many error %s, raising exception"), self._transfer_errors)
-                    raise HTTPError(resp.status_code)
+                nb_errors += 1
+                time.sleep(self._error_delay(resp, method, protected_url, nb_errors))
             else:
                 # No error from request: processing response if needed
                 # Resetting error count after successful transfer
+                nb_errors = 0
                 self._transfer_errors = 0
-                if method in ["PUT", "DELETE"]:
-                    # No response expected
-                    resp_chunk = json.loads("{}")
-                else:
-                    try:
-                        self._logger.debug(_("Response content: %s, text: %s"), resp, resp.text[:1000])
-                        # TWEAK: remove extra text outside JSON response
-                        if len(resp.text) > 1:
-                            rsp = re.findall(r"([\[{].*[}\]])", resp.text)
-                            resp_chunk = json.loads(rsp[0]) if len(rsp) > 0 else {}
-                        else:
-                            resp_chunk = resp.json("{}")
-                    except json.decoder.JSONDecodeError:  # pragma: no cover
-                        # Error during JSON decoding =>
-                        # Logging error and no further processing of empty chunk
-                        resp_chunk = json.loads("{}")
-                        self._logger.exception(_("Incorrect response content: %s"), resp)
-                    except Exception:
-                        self._logger.exception(_("Response text causing exception: %s"), resp.text)
-                        raise
-
-                # Initialize or append to response dict, depending on content
-                if "data" in resp_chunk:
-                    observations = False
-                    if "sightings" in resp_chunk["data"]:
-                        observations = True
-                        self._logger.debug(
-                            _("Received %d sightings in chunk %d"),
-                            len(resp_chunk["data"]["sightings"]),
-                            nb_chunks,
-                        )
-                        if nb_chunks == 0:
-                            data_rec = resp_chunk
-                        else:
-                            if "sightings" in data_rec["data"]:
-                                data_rec["data"]["sightings"] += resp_chunk["data"]["sightings"]
-                            else:
-                                # self._logger.error(_("No 'sightings' in previous data"))
-                                # self._logger.error(data_rec)
-                                # self._logger.error(resp_chunk)
-                                data_rec["data"]["sightings"] = resp_chunk["data"]["sightings"]
-                    if "forms" in resp_chunk["data"]:
-                        observations = True
-                        self._logger.debug(
-                            _("Received %d forms in chunk %d"),
-                            len(resp_chunk["data"]["forms"]),
-                            nb_chunks,
-                        )
-                        if nb_chunks == 0:
-                            data_rec = resp_chunk
-                        else:
-                            if "forms" in data_rec["data"]:
-                                data_rec["data"]["forms"] += resp_chunk["data"]["forms"]
-                            else:  # pragma: no cover
-                                # self._logger.error(
-                                #     _("Trying to add 'forms' to another data stream")
-                                # )
-                                # self._logger.error(data_rec)
-                                # self._logger.error(resp_chunk)
-                                data_rec["data"]["forms"] = resp_chunk["data"]["forms"]
-
-                    if not observations:
-                        self._logger.debug(
-                            _("Received %d data items in chunk %d"),
-                            len(resp_chunk),
-                            nb_chunks,
-                        )
-                        if nb_chunks == 0:
-                            data_rec = resp_chunk
-                        else:
-                            data_rec["data"] += resp_chunk["data"]
-                else:
-                    self._logger.debug(_("Received non-data response: %s"), resp_chunk)
-                    if nb_chunks == 0:
-                        data_rec = resp_chunk
-                    else:
-                        data_rec += resp_chunk
+                self._circuit_breaker.record_success()
+                self._last_response_bytes += len(resp.content)
+                yield self._decode_response(resp, method)
 
                 # Is there more data to come?
-                if (
-                    ("transfer-encoding" in resp.headers)
-                    and (resp.headers["transfer-encoding"] == "chunked")
-                    and ("pagination_key" in resp.headers)
-                ):
-                    self._logger.debug(
-                        _("Chunked transfer => requesting for more, with key: %s"),
-                        resp.headers["pagination_key"],
-                    )
-                    # Update request parameters to get next chunk
-                    params["pagination_key"] = resp.headers["pagination_key"]
-                    nb_chunks += 1
-                else:
-                    self._logger.debug(_("Non-chunked transfer => finished requests"))
-                    if "pagination_key" in params:
-                        del params["pagination_key"]
+                if not self._next_chunk(resp, params):
                     break
+                nb_chunks += 1
 
         self._logger.debug(_("Received %d chunks"), nb_chunks)
         if nb_chunks >= self._limits["max_chunks"]:
             raise MaxChunksError
 
+    def _url_get(self, params, scope, method="GET", body=None, optional_headers=None):
+        """Internal function used to request from Biolovision API.
+
+        Calls _url_iter and appends all chunks in a single response.
+
+        Parameters
+        ----------
+        params : dict of 'parameter name': 'parameter value'
+            params is used to build URL GET string.
+        scope : str
+            scope is the api to be queried, for example 'taxo_groups/'.
+        method : str
+            HTTP method to use: GET/POST/DELETE/PUT. Default to GET
+        body : str
+            Optional body for POST or PUT
+        optional_headers : dict
+            Optional body for request
+
+        Returns
+        -------
+        json : dict
+            dict decoded from json if status OK, else None.
+
+        Raises
+        ------
+        HTTPError
+            HTTP protocol error, returned as argument.
+        MaxChunksError
+            Loop on chunks exceeded max_chunks limit.
+
+        """
+        data_rec = None
+        for nb_chunks, resp_chunk in enumerate(self._url_iter(params, scope, method, body, optional_headers)):
+            data_rec = self._merge_chunk(data_rec, resp_chunk, nb_chunks)
+
         return data_rec
 
     def _api_list(self, opt_params=None, optional_headers=None):
@@ -427,7 +1091,7 @@ class BiolovisionAPI:
             optional_headers,
         )
         # GET from API
-        entities = self._url_get(params, self._ctrl, optional_headers=optional_headers)["data"]
+        entities = self._url_get(params, self._ctrl, optional_headers=optional_headers).get("data", [])
         self._logger.debug(_("Number of entities = %i"), len(entities))
         return {"data": entities}
 
@@ -497,6 +1161,44 @@ class BiolovisionAPI:
         )
         return self._api_list(opt_params=h_params, optional_headers=h_headers)
 
+    def api_list_iter(self, opt_params=None, optional_headers=None):
+        """Query for a list of entities of the given controler, chunk by chunk.
+
+        Calls /ctrl API, like api_list, but yields each chunk as soon as
+        it is received, instead of appending all chunks in memory.
+
+        Parameters
+        ----------
+        opt_params : dict
+            optional URL parameters, empty by default.
+            See Biolovision API documentation.
+        optional_headers : dict
+            Optional body for GET request
+
+        Yields
+        ------
+        json : dict
+            dict decoded from json chunk, with entities under 'data'.
+        """
+        # Mandatory parameters.
+        params = {
+            "user_email": self._user_email,
+            "user_pw": self._user_pw,
+        }
+        if opt_params is not None:
+            params.update(opt_params)
+        self._logger.debug(
+            _("List chunks from: %s, with options:%s, optional_headers:%s"),
+            self._ctrl,
+            self._clean_params(params),
+            optional_headers,
+        )
+        # GET from API
+        for resp_chunk in self._url_iter(params, self._ctrl, optional_headers=optional_headers):
+            if "data" in resp_chunk:
+                self._logger.debug(_("Number of entities in chunk = %i"), len(resp_chunk["data"]))
+                yield {"data": resp_chunk["data"]}
+
     # -------------------------
     # Exception testing methods
     # -------------------------
@@ -687,6 +1389,8 @@ class ObservationsAPI(BiolovisionAPI):
 
     - api_search      - Search for observations based on parameter value
 
+    - api_search_iter - Search for observations, yielding each chunk
+
     - api_create      - Create a single observation
 
     - api_update      - Update an existing observation
@@ -823,6 +1527,50 @@ class ObservationsAPI(BiolovisionAPI):
         # GET from API
         return super()._url_get(params, "observations/search/", "POST", body)
 
+    def api_search_iter(self, q_params, **kwargs):
+        """Search for observations, based on parameter conditions, chunk by chunk.
+
+        Calls /observations/search, like api_search, but yields each chunk
+        as soon as it is received, instead of appending all chunks in memory.
+
+        Parameters
+        ----------
+        q_params : dict
+            Query parameters, same as online version.
+        **kwargs :
+            optional URL parameters, empty by default.
+            See Biolovision API documentation.
+
+        Yields
+        ------
+        json : dict
+            dict decoded from json chunk, with sightings and forms under 'data'.
+        """
+        # Mandatory parameters.
+        params = {
+            "user_email": self._user_email,
+            "user_pw": self._user_pw,
+        }
+        for key, value in kwargs.items():
+            params[key] = value
+        # Specific parameters.
+        if q_params is not None:
+            body = json.dumps(q_params)
+        else:
+            raise IncorrectParameter
+        self._logger.debug(
+            _("Search chunks from %s, with option %s and body %s"),
+            self._ctrl,
+            self._clean_params(params),
+            body,
+        )
+        # POST to API
+        for resp_chunk in super()._url_iter(params, "observations/search/", "POST", body):
+            if "data" in resp_chunk:
+                # Each chunk may contain only sightings or only forms
+                resp_chunk["data"].setdefault("sightings", [])
+                yield resp_chunk
+
     def api_create(self, data: dict) -> None:
         """Create an observation.
 
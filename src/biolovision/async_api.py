@@ -0,0 +1,707 @@
+"""Provide asynchronous python interface to Biolovision API.
+
+Same as biolovision.api, using asyncio and httpx, so that a single
+process can keep many requests in flight. Only read methods of the
+main controlers are implemented. httpx is an optional dependency:
+pip install Client-API-VN[async].
+
+Example:
+
+    async with AsyncPlacesAPI(...) as places:
+        results = await asyncio.gather(*[places.api_get(p) for p in ids])
+
+http_status and last_response_bytes are those of the latest request
+of the current asyncio task, so that concurrent requests do not mix them.
+
+Methods, see each class.
+
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+
+from .api import BiolovisionAPI, BiolovisionApiException, IncorrectParameter, MaxChunksError, NotImplementedException
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class AsyncBiolovisionAPI:
+    """Top class, not for direct use. Provides internal and template methods.
+
+    Requests are sent through an httpx.AsyncClient, which can be shared
+    by several controlers. If not given, a client is created and closed
+    by aclose or when leaving async with block.
+    Requests are prepared, checked and decoded by a BiolovisionAPI instance,
+    which is not used to send them.
+    """
+
+    def __init__(
+        self,
+        controler: str = "",
+        user_email: str | None = None,
+        user_pw: str | None = None,
+        base_url: str | None = None,
+        client_key: str | None = None,
+        client_secret: str | None = None,
+        max_retry: int | None = None,
+        max_requests: int | None = None,
+        max_chunks: int | None = None,
+        unavailable_delay: int | None = None,
+        retry_delay: int | None = None,
+        timeout: int | None = None,
+        client=None,
+        pool_size: int = 10,
+    ) -> None:
+        if httpx is None:  # pragma: no cover
+            logging.getLogger(__name__).fatal(_("httpx must be installed to use asynchronous API"))
+            raise BiolovisionApiException
+        self._api = BiolovisionAPI(
+            controler=controler,
+            user_email=user_email,
+            user_pw=user_pw,
+            base_url=base_url,
+            client_key=client_key,
+            client_secret=client_secret,
+            max_retry=max_retry,
+            max_requests=max_requests,
+            max_chunks=max_chunks,
+            unavailable_delay=unavailable_delay,
+            retry_delay=retry_delay,
+            timeout=timeout,
+        )
+        self._logger = logging.getLogger(__name__)
+        self._ctrl = controler
+        self._user_email = user_email
+        self._user_pw = user_pw
+        # Status and response size of the latest request, in each asyncio task
+        self._http_status = contextvars.ContextVar("http_status", default=0)
+        self._last_response_bytes = contextvars.ContextVar("last_response_bytes", default=0)
+        self._own_client = client is None
+        if client is None:
+            limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            client = httpx.AsyncClient(limits=limits)
+        self._client = client
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    @property
+    def version(self) -> str:
+        """Return version."""
+        return self._api.version
+
+    @property
+    def transfer_errors(self) -> int:
+        """Return the number of HTTP errors during this session."""
+        return self._api.transfer_errors
+
+    @property
+    def http_status(self) -> int:
+        """Return the HTTP status code of the latest request of the current task."""
+        return self._http_status.get()
+
+    @property
+    def controler(self) -> str:
+        """Return the controler name."""
+        return self._ctrl
+
+    @property
+    def nb_requests(self) -> int:
+        """Return the number of HTTP requests sent by this instance."""
+        return self._api.nb_requests
+
+    @property
+    def last_response_bytes(self) -> int:
+        """Return the byte length of the response body of the latest API call of the current task."""
+        return self._last_response_bytes.get()
+
+    @property
+    def client(self):
+        """Return the httpx.AsyncClient used for requests."""
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the HTTP client, if created by this instance."""
+        if self._own_client:
+            await self._client.aclose()
+
+    # ----------------
+    # Internal methods
+    # ----------------
+    def _clean_params(self, params: dict):
+        """Remove sensitive data from param dict."""
+        return self._api._clean_params(params)
+
+    async def _url_iter(self, params, scope, method="GET", body=None, optional_headers=None):
+        """Internal async generator used to request chunks from Biolovision API.
+
+        Same as BiolovisionAPI._url_iter, except that requests are signed
+        and sent asynchronously.
+
+        Parameters
+        ----------
+        params : dict of 'parameter name': 'parameter value'
+            params is used to build URL GET string.
+        scope : str
+            scope is the api to be queried, for example 'taxo_groups/'.
+        method : str
+            HTTP method to use: GET/POST/DELETE/PUT. Default to GET
+        body : str
+            Optional body for POST or PUT
+        optional_headers : dict
+            Optional body for request
+
+        Yields
+        ------
+        json : dict
+            dict decoded from json chunk.
+
+        Raises
+        ------
+        HTTPError
+            HTTP protocol error, returned as argument.
+        MaxChunksError
+            Loop on chunks exceeded max_chunks limit.
+
+        """
+        if method not in ["GET", "POST", "PUT", "DELETE"]:
+            raise NotImplementedException
+        api = self._api
+        # Each request of a concurrent call needs its own parameters
+        params = dict(params)
+        # Loop on chunks
+        nb_chunks = 0
+        # Error count of this request, for its retry budget
+        nb_errors = 0
+        response_bytes = 0
+        self._last_response_bytes.set(response_bytes)
+        while nb_chunks < api._limits["max_chunks"]:
+            api._circuit_breaker.before_request()
+            api._count_request()
+            # Prepare call to API
+            payload, headers = api._prepare_request(params, optional_headers)
+            protected_url = api._api_url + scope
+            # Only requests rate is limited, concurrency is limited by pool_size
+            await asyncio.sleep(api._rate_limiter.reserve())
+            # Sign with OAuth1, body is not signed as it is not form-encoded
+            url, headers, _body = api._oauth.client.sign(protected_url + "?" + payload, method, None, headers)
+            try:
+                resp = await self._client.request(
+                    method,
+                    # URL is encoded by the OAuth1 client, as for requests
+                    url.decode() if isinstance(url, bytes) else url,
+                    headers=headers,
+                    content=body,
+                    timeout=api._limits["timeout"],
+                )
+            except httpx.TransportError:
+                # Connection failed
+                api._circuit_breaker.record_failure()
+                raise
+
+            self._logger.debug(resp.headers)
+            self._logger.debug(
+                _("%s status code = %s, for URL %s"),
+                method,
+                resp.status_code,
+                protected_url,
+            )
+            self._http_status.set(resp.status_code)
+            if resp.status_code >= 300:
+                nb_errors += 1
+                await asyncio.sleep(api._error_delay(resp, method, protected_url, nb_errors))
+            else:
+                # No error from request: processing response if needed
+                # Resetting error count after successful transfer
+                nb_errors = 0
+                api._transfer_errors = 0
+                api._circuit_breaker.record_success()
+                response_bytes += len(resp.content)
+                self._last_response_bytes.set(response_bytes)
+                yield api._decode_response(resp, method)
+
+                # Is there more data to come?
+                if not api._next_chunk(resp, params):
+                    break
+                nb_chunks += 1
+
+        self._logger.debug(_("Received %d chunks"), nb_chunks)
+        if nb_chunks >= api._limits["max_chunks"]:
+            raise MaxChunksError
+
+    async def _url_get(self, params, scope, method="GET", body=None, optional_headers=None):
+        """Internal coroutine used to request from Biolovision API.
+
+        Calls _url_iter and appends all chunks in a single response.
+
+        Parameters
+        ----------
+        params : dict of 'parameter name': 'parameter value'
+            params is used to build URL GET string.
+        scope : str
+            scope is the api to be queried, for example 'taxo_groups/'.
+        method : str
+            HTTP method to use: GET/POST/DELETE/PUT. Default to GET
+        body : str
+            Optional body for POST or PUT
+        optional_headers : dict
+            Optional body for request
+
+        Returns
+        -------
+        json : dict
+            dict decoded from json if status OK, else None.
+
+        """
+        data_rec = None
+        nb_chunks = 0
+        async for resp_chunk in self._url_iter(params, scope, method, body, optional_headers):
+            data_rec = self._api._merge_chunk(data_rec, resp_chunk, nb_chunks)
+            nb_chunks += 1
+
+        return data_rec
+
+    # -----------------------------------------
+    #  Generic methods, used by most subclasses
+    # -----------------------------------------
+
+    async def api_get(self, id_entity, **kwargs):
+        """Query for a single entity of the given controler.
+
+        Calls  /ctrl/id API.
+
+        Parameters
+        ----------
+        id_entity : str
+            entity to retrieve.
+        **kwargs :
+            optional URL parameters, empty by default.
+            See Biolovision API documentation.
+
+        Returns
+        -------
+        json : dict or None
+            dict decoded from json if status OK, else None
+        """
+        # Mandatory parameters.
+        params = {
+            "user_email": self._user_email,
+            "user_pw": self._user_pw,
+        }
+        for key, value in kwargs.items():
+            params[key] = value
+        self._logger.debug(
+            _("In api_get for controler: %s, entity: %s, with parameters:%s"),
+            self._ctrl,
+            id_entity,
+            self._clean_params(params),
+        )
+        # GET from API
+        return await self._url_get(params, self._ctrl + "/" + str(id_entity))
+
+    async def api_list(self, opt_params=None, optional_headers=None):
+        """Query for a list of entities of the given controler.
+
+        Calls /ctrl API.
+
+        Parameters
+        ----------
+        opt_params : dict
+            optional URL parameters, empty by default.
+            See Biolovision API documentation.
+        optional_headers : dict
+            Optional body for GET request
+
+        Returns
+        -------
+        json : dict or None
+            dict decoded from json if status OK, else None
+        """
+        entities = []
+        async for resp_chunk in self.api_list_iter(opt_params, optional_headers):
+            entities += resp_chunk["data"]
+        self._logger.debug(_("Number of entities = %i"), len(entities))
+        return {"data": entities}
+
+    async def api_list_iter(self, opt_params=None, optional_headers=None):
+        """Query for a list of entities of the given controler, chunk by chunk.
+
+        Parameters
+        ----------
+        opt_params : dict
+            optional URL parameters, empty by default.
+            See Biolovision API documentation.
+        optional_headers : dict
+            Optional body for GET request
+
+        Yields
+        ------
+        json : dict
+            dict decoded from json chunk, with entities under 'data'.
+        """
+        # Mandatory parameters.
+        params = {
+            "user_email": self._user_email,
+            "user_pw": self._user_pw,
+        }
+        if opt_params is not None:
+            params.update(opt_params)
+        self._logger.debug(
+            _("List chunks from: %s, with options:%s, optional_headers:%s"),
+            self._ctrl,
+            self._clean_params(params),
+            optional_headers,
+        )
+        # GET from API
+        async for resp_chunk in self._url_iter(params, self._ctrl, optional_headers=optional_headers):
+            if "data" in resp_chunk:
+                self._logger.debug(_("Number of entities in chunk = %i"), len(resp_chunk["data"]))
+                yield {"data": resp_chunk["data"]}
+
+
+class AsyncObservationsAPI(AsyncBiolovisionAPI):
+    """Implement asynchronous api calls to observations controler.
+
+    Methods:
+
+    - api_get         - Return a single observations from the controler
+
+    - api_list        - Return a list of observations from the controler
+
+    - api_diff        - Deprecated: Return all changes in observations since a given date
+
+    - api_search      - Search for observations based on parameter value
+
+    - api_search_iter - Search for observations, yielding each chunk
+
+    """
+
+    def __init__(
+        self,
+        user_email: str | None = None,
+        user_pw: str | None = None,
+        base_url: str | None = None,
+        client_key: str | None = None,
+        client_secret: str | None = None,
+        max_retry: int | None = None,
+        max_requests: int | None = None,
+        max_chunks: int | None = None,
+        unavailable_delay: int | None = None,
+        retry_delay: int | None = None,
+        timeout: int | None = None,
+        client=None,
+        pool_size: int = 10,
+    ) -> None:
+        super().__init__(
+            controler="observations",
+            user_email=user_email,
+            user_pw=user_pw,
+            base_url=base_url,
+            client_key=client_key,
+            client_secret=client_secret,
+            max_retry=max_retry,
+            max_requests=max_requests,
+            max_chunks=max_chunks,
+            unavailable_delay=unavailable_delay,
+            retry_delay=retry_delay,
+            timeout=timeout,
+            client=client,
+            pool_size=pool_size,
+        )
+        return None
+
+    async def api_list(self, id_taxo_group, **kwargs):
+        """Query for list of observations by taxo_group from the controler.
+
+        Parameters
+        ----------
+        id_taxo_group : integer
+            taxo_group to query for observations
+        **kwargs :
+            optional URL parameters, empty by default.
+            See Biolovision API documentation.
+
+        Returns
+        -------
+        json : dict or None
+            dict decoded from json if status OK, else None
+        """
+        # Mandatory parameters.
+        params = {
+            "user_email": self._user_email,
+            "user_pw": self._user_pw,
+        }
+        params["id_taxo_group"] = str(id_taxo_group)
+        for key, value in kwargs.items():
+            params[key] = value
+        self._logger.debug(_("In api_list, with parameters %s"), self._clean_params(params))
+        return await self._url_get(params, self._ctrl)
+
+    async def api_diff(self, id_taxo_group, delta_time, modification_type="all"):
+        """Query for a list of updates or deletions since a given date.
+
+        Parameters
+        ----------
+        id_taxo_group : str
+            taxo group from which to query diff.
+        delta_time : str
+            Start of time interval to query.
+        modification_type : str
+            Type of diff queried : can be only_modified, only_deleted or
+            all (default).
+
+        Returns
+        -------
+        json : dict or None
+            dict decoded from json if status OK, else None
+        """
+        # Mandatory parameters.
+        params = {
+            "user_email": self._user_email,
+            "user_pw": self._user_pw,
+        }
+        # Specific parameters.
+        params["id_taxo_group"] = str(id_taxo_group)
+        params["modification_type"] = modification_type
+        params["date"] = delta_time
+        # GET from API
+        return await self._url_get(params, "observations/diff/")
+
+    async def api_search(self, q_params, **kwargs):
+        """Search for observations, based on parameter conditions.
+
+        Parameters
+        ----------
+        q_params : dict
+            Query parameters, same as online version.
+        **kwargs :
+            optional URL parameters, empty by default.
+            See Biolovision API documentation.
+
+        Returns
+        -------
+        json : dict or None
+            dict decoded from json if status OK, else None
+        """
+        data_rec = None
+        nb_chunks = 0
+        async for resp_chunk in self.api_search_iter(q_params, **kwargs):
+            data_rec = self._api._merge_chunk(data_rec, resp_chunk, nb_chunks)
+            nb_chunks += 1
+        return data_rec
+
+    async def api_search_iter(self, q_params, **kwargs):
+        """Search for observations, based on parameter conditions, chunk by chunk.
+
+        Parameters
+        ----------
+        q_params : dict
+            Query parameters, same as online version.
+        **kwargs :
+            optional URL parameters, empty by default.
+            See Biolovision API documentation.
+
+        Yields
+        ------
+        json : dict
+            dict decoded from json chunk, with sightings and forms under 'data'.
+        """
+        # Mandatory parameters.
+        params = {
+            "user_email": self._user_email,
+            "user_pw": self._user_pw,
+        }
+        for key, value in kwargs.items():
+            params[key] = value
+        # Specific parameters.
+        if q_params is not None:
+            body = json.dumps(q_params)
+        else:
+            raise IncorrectParameter
+        self._logger.debug(
+            _("Search chunks from %s, with option %s and body %s"),
+            self._ctrl,
+            self._clean_params(params),
+            body,
+        )
+        # POST to API
+        async for resp_chunk in self._url_iter(params, "observations/search/", "POST", body):
+            if "data" in resp_chunk:
+                # Each chunk may contain only sightings or only forms
+                resp_chunk["data"].setdefault("sightings", [])
+                yield resp_chunk
+
+
+class AsyncPlacesAPI(AsyncBiolovisionAPI):
+    """Implement asynchronous api calls to places controler.
+
+    Methods:
+
+    - api_get                - Return a single place from the controler
+
+    - api_list               - Return a list of places from the controler
+
+    - api_diff               - Search for change in places
+
+    """
+
+    def __init__(
+        self,
+        user_email: str | None = None,
+        user_pw: str | None = None,
+        base_url: str | None = None,
+        client_key: str | None = None,
+        client_secret: str | None = None,
+        max_retry: int | None = None,
+        max_requests: int | None = None,
+        max_chunks: int | None = None,
+        unavailable_delay: int | None = None,
+        retry_delay: int | None = None,
+        timeout: int | None = None,
+        client=None,
+        pool_size: int = 10,
+    ) -> None:
+        super().__init__(
+            controler="places",
+            user_email=user_email,
+            user_pw=user_pw,
+            base_url=base_url,
+            client_key=client_key,
+            client_secret=client_secret,
+            max_retry=max_retry,
+            max_requests=max_requests,
+            max_chunks=max_chunks,
+            unavailable_delay=unavailable_delay,
+            retry_delay=retry_delay,
+            timeout=timeout,
+            client=client,
+            pool_size=pool_size,
+        )
+        return None
+
+    async def api_diff(self, delta_time, modification_type="all"):
+        """Query for a list of updates or deletions since a given date.
+
+        Parameters
+        ----------
+        delta_time : str
+            Start of time interval to query.
+        modification_type : str
+            Type of diff queried : can be only_modified, only_deleted or
+            all (default).
+
+        Returns
+        -------
+        json : dict or None
+            dict decoded from json if status OK, else None
+        """
+        # Mandatory parameters.
+        params = {
+            "user_email": self._user_email,
+            "user_pw": self._user_pw,
+        }
+        # Specific parameters.
+        params["modification_type"] = modification_type
+        params["date"] = delta_time
+        # GET from API
+        return await self._url_get(params, "places/diff/")
+
+
+class AsyncSpeciesAPI(AsyncBiolovisionAPI):
+    """Implement asynchronous api calls to species controler.
+
+    Methods:
+
+    - api_get                - Return a single specie from the controler
+
+    - api_list               - Return a list of species from the controler
+
+    """
+
+    def __init__(
+        self,
+        user_email: str | None = None,
+        user_pw: str | None = None,
+        base_url: str | None = None,
+        client_key: str | None = None,
+        client_secret: str | None = None,
+        max_retry: int | None = None,
+        max_requests: int | None = None,
+        max_chunks: int | None = None,
+        unavailable_delay: int | None = None,
+        retry_delay: int | None = None,
+        timeout: int | None = None,
+        client=None,
+        pool_size: int = 10,
+    ) -> None:
+        super().__init__(
+            controler="species",
+            user_email=user_email,
+            user_pw=user_pw,
+            base_url=base_url,
+            client_key=client_key,
+            client_secret=client_secret,
+            max_retry=max_retry,
+            max_requests=max_requests,
+            max_chunks=max_chunks,
+            unavailable_delay=unavailable_delay,
+            retry_delay=retry_delay,
+            timeout=timeout,
+            client=client,
+            pool_size=pool_size,
+        )
+        return None
+
+
+class AsyncTaxoGroupsAPI(AsyncBiolovisionAPI):
+    """Implement asynchronous api calls to taxo_groups controler.
+
+    Methods:
+
+    - api_get                - Return a single taxo group from the controler
+
+    - api_list               - Return a list of taxo groups from the controler
+
+    """
+
+    def __init__(
+        self,
+        user_email: str | None = None,
+        user_pw: str | None = None,
+        base_url: str | None = None,
+        client_key: str | None = None,
+        client_secret: str | None = None,
+        max_retry: int | None = None,
+        max_requests: int | None = None,
+        max_chunks: int | None = None,
+        unavailable_delay: int | None = None,
+        retry_delay: int | None = None,
+        timeout: int | None = None,
+        client=None,
+        pool_size: int = 10,
+    ) -> None:
+        super().__init__(
+            controler="taxo_groups",
+            user_email=user_email,
+            user_pw=user_pw,
+            base_url=base_url,
+            client_key=client_key,
+            client_secret=client_secret,
+            max_retry=max_retry,
+            max_requests=max_requests,
+            max_chunks=max_chunks,
+            unavailable_delay=unavailable_delay,
+            retry_delay=retry_delay,
+            timeout=timeout,
+            client=client,
+            pool_size=pool_size,
+        )
+        return None
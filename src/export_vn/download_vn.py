@@ -12,12 +12,14 @@ Properties
 """
 
 import logging
+import threading
 from collections import deque
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
 from datetime import datetime, time, timedelta
-from itertools import chain
-from sys import getsizeof
-from time import perf_counter_ns
+from queue import Full, Queue
+from time import monotonic, perf_counter_ns
 
 from biolovision.api import (
     EntitiesAPI,
@@ -41,43 +43,163 @@ from . import __version__
 logger = logging.getLogger(__name__)
 
 
-def total_size(o, handlers=None):
-    """Returns the approximate memory footprint an object and all of its contents.
+def timed_chunks(chunks):
+    """Yield each chunk of an iterable, with the time spent waiting for it, in µs."""
+    chunks = iter(chunks)
+    while True:
+        timing = perf_counter_ns()
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            return
+        yield chunk, (perf_counter_ns() - timing) / 1000
+
+
+# Reference lists shared by all downloads of the process: (site, controler, fields) -> (timestamp, items)
+_reference_lists = {}
+# Locks of each (site, controler, fields), so that a list is fetched only once
+_reference_locks = {}
+_reference_lock = threading.Lock()
+# Time to live of reference lists, in seconds
+_reference_ttl = 3600
+
 
-    Automatically finds the contents of the following builtin containers and
-    their subclasses:  tuple, list, deque, dict, set and frozenset.
-    To search other containers, add handlers to iterate over their contents:
+def set_reference_ttl(ttl: int = 3600) -> None:
+    """Set the time to live of cached reference lists.
+
+    Parameters
+    ----------
+    ttl : int
+        Time to live, in seconds. If 0, reference lists are fetched each time.
+    """
+    global _reference_ttl
+    _reference_ttl = ttl
+
+
+def reference_list(site: str, controler: str, fetch: Callable[[], list], fields: list[str] | None = None) -> list:
+    """Return a reference list of a site, cached for all downloads of the process.
+
+    Territorial_units, local_admin_units and taxo_groups are needed by
+    several controlers and jobs, but seldom change. They are fetched once,
+    then kept until their time to live expires or they are invalidated.
+
+    Parameters
+    ----------
+    site : str
+        Site name.
+    controler : str
+        Name of API controler of the list.
+    fetch : Callable
+        Called without arguments to get the list, if not cached.
+    fields : list of str or None
+        Keys of each item returned by fetch, or None for complete items.
+        Lists of complete and projected items are cached separately.
+
+    Returns
+    -------
+    list
+        Items of the list, which must not be modified.
+    """
+    key = (site, controler, None if fields is None else tuple(fields))
+    with _reference_lock:
+        lock = _reference_locks.setdefault(key, threading.Lock())
+    with lock:
+        cached = _reference_lists.get(key)
+        if cached is not None and monotonic() - cached[0] < _reference_ttl:
+            return cached[1]
+        items = fetch()
+        _reference_lists[key] = (monotonic(), items)
+        return items
+
+
+def invalidate_reference_lists(site: str | None = None, controler: str | None = None) -> None:
+    """Remove reference lists from the cache.
+
+    Parameters
+    ----------
+    site : str or None
+        Site name, or None for all sites.
+    controler : str or None
+        Name of API controler, or None for all controlers.
+    """
+    with _reference_lock:
+        for key in list(_reference_lists):
+            if (site is None or key[0] == site) and (controler is None or key[1] == controler):
+                del _reference_lists[key]
 
-        handlers = {SomeContainerClass: iter,
-                    OtherContainerClass: OtherContainerClass.get_elements}
 
+# Keys of territorial_units used by observations downloads
+_T_UNITS_FIELDS = ["id", "id_country", "short_name", "name"]
+# Keys of local_admin_units used by places downloads
+_L_A_UNITS_FIELDS = ["id", "id_canton"]
+
+_END_OF_CHUNKS = object()
+
+
+def _produce(chunks, pipe, stopped):
+    """Put each item of an iterable in a queue, then _END_OF_CHUNKS or the exception raised.
+
+    Gives up when stopped is set by the consumer, instead of blocking forever on a full queue.
+    """
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                pipe.put(item, timeout=0.1)
+            except Full:
+                continue
+            return True
+        return False
+
+    try:
+        for chunk in chunks:
+            if not put((chunk, None)):
+                return
+        put((_END_OF_CHUNKS, None))
+    except BaseException as exc:
+        put((None, exc))
+
+
+def _consume(pipe, stopped):
+    """Yield each item put in a queue by _produce, raising again its exceptions."""
+    try:
+        while True:
+            chunk, exc = pipe.get()
+            if exc is not None:
+                raise exc
+            if chunk is _END_OF_CHUNKS:
+                return
+            yield chunk
+    finally:
+        stopped.set()
+
+
+def prefetched(chunks, queue_size=2):
+    """Yield each item of an iterable, fetched ahead by a producer thread.
+
+    The producer blocks when queue_size items are waiting, so that memory use
+    is bounded when the consumer is slower. Exceptions raised by the producer
+    are raised again in the consumer.
+
+    Parameters
+    ----------
+    chunks : iterable
+        Items to fetch, for example chunks downloaded from the API.
+    queue_size : int
+        Maximum number of items fetched ahead. If 0, items are fetched by the consumer.
     """
-    all_handlers = {
-        tuple: iter,
-        list: iter,
-        deque: iter,
-        dict: lambda d: chain.from_iterable(d.items()),
-        set: iter,
-        frozenset: iter,
-    }
-    if handlers is not None:
-        all_handlers.update(handlers)  # user handlers take precedence
-    seen = set()  # track which object id's have already been seen
-    default_size = getsizeof(0)  # estimate sizeof object without __sizeof__
-
-    def sizeof(o):
-        if id(o) in seen:  # do not double count the same object
-            return 0
-        seen.add(id(o))
-        s = getsizeof(o, default_size)
-
-        for typ, handler in all_handlers.items():
-            if isinstance(o, typ):
-                s += sum(map(sizeof, handler(o)))
-                break
-        return s
-
-    return sizeof(o)
+    if queue_size <= 0:
+        yield from chunks
+        return
+    pipe = Queue(maxsize=queue_size)
+    stopped = threading.Event()
+    producer = threading.Thread(target=_produce, args=(chunks, pipe, stopped), name="prefetch", daemon=True)
+    producer.start()
+    try:
+        yield from _consume(pipe, stopped)
+    finally:
+        stopped.set()
+        producer.join()
 
 
 class DownloadVnException(Exception):
@@ -97,10 +219,12 @@ class DownloadVn:
         site: str,
         api_instance: Callable[..., None],
         backend: Callable[..., None],
+        prefetch_chunks: int = 2,
     ) -> None:
         self._site = site
         self._api_instance = api_instance
         self._backend = backend
+        self._prefetch_chunks = prefetch_chunks
 
     @property
     def version(self):
@@ -120,6 +244,67 @@ class DownloadVn:
     # ----------------
     # Internal methods
     # ----------------
+    def _reference_list(self, controler, api_class, read_db=False, fields=None):
+        """Iterate on a reference list of the site.
+
+        Only for subclasses keeping API parameters, and database parameters if read_db.
+        Items read from the local database are streamed, without being kept in memory,
+        and the database connection is held until the iteration ends.
+        Otherwise, the list is downloaded once and shared by all downloads of the process.
+
+        Parameters
+        ----------
+        controler : str
+            Name of API controler of the list.
+        api_class : type
+            API class used to download the list.
+        read_db : bool
+            If True, try to read the list from the local database first.
+        fields : list of str or None
+            If not None, keys of each item needed, when read from the local database.
+
+        Yields
+        ------
+        dict
+            Item of the list, which must not be modified.
+        """
+        if read_db:
+            found = False
+            with ReadPostgresql(
+                self._site,
+                self._db_enabled,
+                self._db_user,
+                self._db_pw,
+                self._db_host,
+                self._db_port,
+                self._db_name,
+                self._db_schema_import,
+                self._db_schema_vn,
+                self._db_group,
+                self._db_out_proj,
+            ) as store_pg:
+                for item in store_pg.read_iter(controler, fields):
+                    found = True
+                    yield item
+            if found:
+                return
+
+        def fetch():
+            # No list available in database, read from API
+            return api_class(
+                user_email=self._user_email,
+                user_pw=self._user_pw,
+                base_url=self._base_url,
+                client_key=self._client_key,
+                client_secret=self._client_secret,
+                max_retry=self._max_retry,
+                max_requests=self._max_requests,
+                max_chunks=self._max_chunks,
+                unavailable_delay=self._unavailable_delay,
+                retry_delay=self._retry_delay,
+            ).api_list()["data"]
+
+        yield from reference_list(self._site, controler, fetch)
 
     # ---------------
     # Generic methods
@@ -147,9 +332,18 @@ class DownloadVn:
                 i += 1
                 log_msg = _("Iteration {}, opt_params = {}").format(i, opt_params)
                 logger.debug(log_msg)
-                timing = perf_counter_ns()
-                items_dict = self._api_instance.api_list(opt_params=opt_params)
-                timing = (perf_counter_ns() - timing) / 1000
+                timing = 0
+                # Store each chunk as soon as it is received, while the next one is downloaded
+                for nb_chunk, (items_dict, chunk_timing) in enumerate(
+                    prefetched(
+                        timed_chunks(self._api_instance.api_list_iter(opt_params=opt_params)),
+                        self._prefetch_chunks,
+                    )
+                ):
+                    timing += chunk_timing
+                    # Call backend to store results
+                    seq = file_id + str(i) if nb_chunk == 0 else file_id + str(i) + "_" + str(nb_chunk)
+                    self._backend.store(self._api_instance.controler, seq, items_dict)
                 # Call backend to store generic log
                 self._backend.log(
                     self._site,
@@ -157,11 +351,9 @@ class DownloadVn:
                     self._api_instance.transfer_errors,
                     self._api_instance.http_status,
                     log_msg,
-                    total_size(items_dict),
+                    self._api_instance.last_response_bytes,
                     timing,
                 )
-                # Call backend to store results
-                self._backend.store(self._api_instance.controler, file_id + str(i), items_dict)
         except HTTPError:
             self._backend.log(
                 self._site,
@@ -170,6 +362,8 @@ class DownloadVn:
                 self._api_instance.http_status,
                 _("HTTP error during download"),
             )
+        # Cached copy of the list is outdated
+        invalidate_reference_lists(self._site, self._api_instance.controler)
 
         return None
 
@@ -343,7 +537,7 @@ class Fields(DownloadVn):
                     self._api_instance.transfer_errors,
                     self._api_instance.http_status,
                     log_msg,
-                    total_size(items_dict),
+                    self._api_instance.last_response_bytes,
                     timing,
                 )
                 # Call backend to store groups of fields
@@ -480,6 +674,8 @@ class Observations(DownloadVn):
         pid_limit_min: int = 5,
         pid_limit_max: int = 2000,
         pid_delta_days: int = 15,
+        search_workers: int = 1,
+        prefetch_chunks: int = 2,
     ) -> None:
         self._site = site
         self._user_email = user_email
@@ -514,6 +710,7 @@ class Observations(DownloadVn):
         self._pid_limit_min = pid_limit_min
         self._pid_limit_max = pid_limit_max
         self._pid_delta_days = pid_delta_days
+        self._search_workers = search_workers
 
         self._t_units = None
 
@@ -532,6 +729,7 @@ class Observations(DownloadVn):
                 retry_delay=retry_delay,
             ),
             backend,
+            prefetch_chunks,
         )
 
     def _store_list(self, id_taxo_group, by_specie, short_version="1"):
@@ -552,39 +750,14 @@ class Observations(DownloadVn):
         short_version : str
             '0' for long JSON and '1' for short_version.
         """
-        # Download territorial_units if needed
+        # Get territorial_units if needed
         if self._t_units is None:
-            if self._db_enabled:
-                # Try to read from local database
-                self._t_units = ReadPostgresql(
-                    self._site,
-                    self._db_enabled,
-                    self._db_user,
-                    self._db_pw,
-                    self._db_host,
-                    self._db_port,
-                    self._db_name,
-                    self._db_schema_import,
-                    self._db_schema_vn,
-                    self._db_group,
-                    self._db_out_proj,
-                ).read("territorial_units")
-            if (self._t_units is None) or (len(self._t_units) == 0):
-                # No territorial_units available, read from API
-                self._t_units = [
-                    TerritorialUnitsAPI(
-                        user_email=self._user_email,
-                        user_pw=self._user_pw,
-                        base_url=self._base_url,
-                        client_key=self._client_key,
-                        client_secret=self._client_secret,
-                        max_retry=self._max_retry,
-                        max_requests=self._max_requests,
-                        max_chunks=self._max_chunks,
-                        unavailable_delay=self._unavailable_delay,
-                        retry_delay=self._retry_delay,
-                    ).api_list()["data"]
-                ]
+            self._t_units = [
+                [t_u]
+                for t_u in self._reference_list(
+                    "territorial_units", TerritorialUnitsAPI, read_db=self._db_enabled, fields=_T_UNITS_FIELDS
+                )
+            ]
 
         # GET from API
         logger.debug(
@@ -592,18 +765,7 @@ class Observations(DownloadVn):
             self._api_instance.controler,
         )
         if id_taxo_group is None:
-            taxo_groups = TaxoGroupsAPI(
-                user_email=self._user_email,
-                user_pw=self._user_pw,
-                base_url=self._base_url,
-                client_key=self._client_key,
-                client_secret=self._client_secret,
-                max_retry=self._max_retry,
-                max_requests=self._max_requests,
-                max_chunks=self._max_chunks,
-                unavailable_delay=self._unavailable_delay,
-                retry_delay=self._retry_delay,
-            ).api_list()["data"]
+            taxo_groups = self._reference_list("taxo_groups", TaxoGroupsAPI)
         else:
             taxo_groups = [{"id": id_taxo_group, "access_mode": "full"}]
         try:
@@ -653,7 +815,7 @@ class Observations(DownloadVn):
                                         id_taxo_group,
                                         specie["id"],
                                     ),
-                                    total_size(items_dict),
+                                    self._api_instance.last_response_bytes,
                                     timing,
                                 )
                                 # Call backend to store results
@@ -673,7 +835,7 @@ class Observations(DownloadVn):
                             self._api_instance.transfer_errors,
                             self._api_instance.http_status,
                             (_("observations from taxo_group %s"), id_taxo_group),
-                            total_size(items_dict),
+                            self._api_instance.last_response_bytes,
                             timing,
                         )
                         # Call backend to store results
@@ -693,6 +855,140 @@ class Observations(DownloadVn):
 
         return None
 
+    @staticmethod
+    def _t_u_param(q_param, t_u):
+        """Return a copy of search parameters, restricted to a territorial_unit."""
+        t_u_param = dict(q_param)
+        t_u_param["location_choice"] = "territorial_unit"
+        t_u_param["territorial_unit_ids"] = [t_u[0]["id_country"] + t_u[0]["short_name"]]
+        return t_u_param
+
+    def _store_t_u(self, api, chunks, id_taxo_group, t_u, seq, start_date, delta_days):
+        """Store chunks downloaded for a territorial_unit and log the transfer.
+
+        Parameters
+        ----------
+        api : ObservationsAPI
+            API instance used for the download, to get its error status.
+        chunks : iterable
+            (items_dict, timing) for each chunk received.
+        id_taxo_group : str
+            Taxo_group downloaded.
+        t_u : list
+            Territorial_unit downloaded.
+        seq : int
+            Sequence number of the date interval.
+        start_date : datetime
+            Start of the date interval.
+        delta_days : int
+            Length of the date interval.
+
+        Returns
+        -------
+        int
+            Number of observations stored.
+        """
+        nb_o = 0
+        timing = 0
+        file_seq = str(id_taxo_group) + "_" + t_u[0]["id_country"] + t_u[0]["short_name"] + "_" + str(seq)
+        for nb_chunk, (items_dict, chunk_timing) in enumerate(chunks):
+            timing += chunk_timing
+            # Call backend to store results
+            nb_o += self._backend.store(
+                self._api_instance.controler,
+                file_seq if nb_chunk == 0 else file_seq + "_" + str(nb_chunk),
+                items_dict,
+            )
+        log_msg = _("{} => Iter: {}, {} obs, taxo_group: {}, territorial_unit: {}, date: {}, interval: {}").format(
+            self._site,
+            seq,
+            nb_o,
+            id_taxo_group,
+            t_u[0]["id_country"] + t_u[0]["short_name"],
+            start_date.strftime("%d/%m/%Y"),
+            str(delta_days),
+        )
+        # Call backend to store log
+        self._backend.log(
+            self._site,
+            self._api_instance.controler,
+            api.transfer_errors,
+            api.http_status,
+            log_msg,
+            api.last_response_bytes,
+            timing,
+        )
+        logger.info(log_msg)
+        return nb_o
+
+    def _search_t_u(self, api, q_param, short_version, pipe, stopped):
+        """Download the chunks of a territorial_unit search, in a worker thread.
+
+        Each download uses its own copy of the API instance, sharing the HTTP session
+        and the count of requests, so that error counters are not mixed between territorial_units.
+        (items_dict, timing) of each chunk is handed over to the calling thread through
+        a bounded queue, so that memory use does not depend on the size of the territorial_unit.
+        """
+        _produce(timed_chunks(api.api_search_iter(q_param, short_version=short_version)), pipe, stopped)
+
+    def _search_concurrent(self, id_taxo_group, t_us, q_param, seq, start_date, delta_days, short_version):
+        """Download territorial_units of a date interval concurrently.
+
+        At most search_workers territorial_units are downloaded in parallel,
+        each keeping at most prefetch_chunks chunks (at least one) waiting to be stored.
+        Results are stored in territorial_units order, by the calling thread.
+
+        Returns
+        -------
+        int
+            Max number of observations stored for one territorial_unit.
+        """
+        nb_obs = 0
+        in_flight = deque()
+
+        def store_oldest():
+            t_u, api, stopped, chunks = in_flight.popleft()
+            try:
+                return self._store_t_u(api, chunks, id_taxo_group, t_u, seq, start_date, delta_days)
+            except HTTPError:
+                # Logged with the error status of the API instance that failed
+                self._backend.log(
+                    self._site,
+                    self._api_instance.controler,
+                    api.transfer_errors,
+                    api.http_status,
+                    _("HTTP error during download"),
+                )
+                raise
+            finally:
+                # Stop the download if the territorial_unit was not entirely stored
+                stopped.set()
+
+        with ThreadPoolExecutor(max_workers=self._search_workers) as executor:
+            try:
+                for t_u in t_us:
+                    logger.debug(
+                        _("Getting observations from territorial_unit %s, using API search"),
+                        t_u[0]["name"],
+                    )
+                    api = copy(self._api_instance)
+                    pipe = Queue(maxsize=max(1, self._prefetch_chunks))
+                    stopped = threading.Event()
+                    executor.submit(self._search_t_u, api, self._t_u_param(q_param, t_u), short_version, pipe, stopped)
+                    in_flight.append((t_u, api, stopped, _consume(pipe, stopped)))
+                    if len(in_flight) >= self._search_workers:
+                        # Throttle on max size downloaded during each interval
+                        nb_obs = max(store_oldest(), nb_obs)
+                while len(in_flight) > 0:
+                    nb_obs = max(store_oldest(), nb_obs)
+            except BaseException:
+                # Do not wait for the remaining territorial_units
+                executor.shutdown(wait=False, cancel_futures=True)
+                for _t_u, _api, stopped, _chunks in in_flight:
+                    stopped.set()
+                raise
+        return nb_obs
+
     def _store_search(self, id_taxo_group, territorial_unit_ids=None, short_version="1"):
         """Download from VN by API search and store json to file.
 
@@ -711,40 +1007,14 @@ class Observations(DownloadVn):
         short_version : str
             '0' for long JSON and '1' for short_version.
         """
-        # Download territorial_units if needed
+        # Get territorial_units if needed
         if self._t_units is None:
-            if self._db_enabled:
-                # Try to read from local database
-                self._t_units = ReadPostgresql(
-                    self._site,
-                    self._db_enabled,
-                    self._db_user,
-                    self._db_pw,
-                    self._db_host,
-                    self._db_port,
-                    self._db_name,
-                    self._db_schema_import,
-                    self._db_schema_vn,
-                    self._db_group,
-                    self._db_out_proj,
-                ).read("territorial_units")
-            if (self._t_units is None) or (len(self._t_units) == 0):
-                # No territorial_units available, read from API
-                self._t_units = [
-                    [tu]
-                    for tu in TerritorialUnitsAPI(
-                        user_email=self._user_email,
-                        user_pw=self._user_pw,
-                        base_url=self._base_url,
-                        client_key=self._client_key,
-                        client_secret=self._client_secret,
-                        max_retry=self._max_retry,
-                        max_requests=self._max_requests,
-                        max_chunks=self._max_chunks,
-                        unavailable_delay=self._unavailable_delay,
-                        retry_delay=self._retry_delay,
-                    ).api_list()["data"]
-                ]
+            self._t_units = [
+                [t_u]
+                for t_u in self._reference_list(
+                    "territorial_units", TerritorialUnitsAPI, read_db=self._db_enabled, fields=_T_UNITS_FIELDS
+                )
+            ]
 
         # GET from API
         logger.debug(
@@ -752,18 +1022,7 @@ class Observations(DownloadVn):
             self._api_instance.controler,
         )
         if id_taxo_group is None:
-            taxo_groups = TaxoGroupsAPI(
-                user_email=self._user_email,
-                user_pw=self._user_pw,
-                base_url=self._base_url,
-                client_key=self._client_key,
-                client_secret=self._client_secret,
-                max_retry=self._max_retry,
-                max_requests=self._max_requests,
-                max_chunks=self._max_chunks,
-                unavailable_delay=self._unavailable_delay,
-                retry_delay=self._retry_delay,
-            ).api_list()["data"]
+            taxo_groups = self._reference_list("taxo_groups", TaxoGroupsAPI)
         else:
             taxo_groups = [{"id": id_taxo_group, "access_mode": "full"}]
         try:
@@ -825,64 +1084,48 @@ class Observations(DownloadVn):
                                 map(lambda t_u: "0" + t_u if len(t_u) == 1 else t_u, territorial_unit_ids)
                             )
                             t_us = [u for u in self._t_units if u[0]["short_name"] in territorial_unit_ids]
-                        for t_u in t_us:
-                            logger.debug(
-                                _("Getting observations from territorial_unit %s, using API search"),
-                                t_u[0]["name"],
-                            )
-                            q_param["location_choice"] = "territorial_unit"
-                            q_param["territorial_unit_ids"] = [t_u[0]["id_country"] + t_u[0]["short_name"]]
-
-                            timing = perf_counter_ns()
-                            items_dict = self._api_instance.api_search(q_param, short_version=short_version)
-                            timing = (perf_counter_ns() - timing) / 1000
-
-                            # Call backend to store results
-                            nb_o = self._backend.store(
-                                self._api_instance.controler,
-                                str(id_taxo_group)
-                                + "_"
-                                + t_u[0]["id_country"]
-                                + t_u[0]["short_name"]
-                                + "_"
-                                + str(seq),
-                                items_dict,
+                        if self._search_workers > 1:
+                            nb_obs = self._search_concurrent(
+                                id_taxo_group, t_us, q_param, seq, start_date, delta_days, short_version
                             )
-                            # Throttle on max size downloaded during each interval
-                            nb_obs = max(nb_o, nb_obs)
-                            log_msg = _(
-                                "{} => Iter: {}, {} obs, taxo_group: {}, territorial_unit: {}, date: {}, interval: {}"
-                            ).format(
-                                self._site,
-                                seq,
-                                nb_o,
-                                id_taxo_group,
-                                t_u[0]["id_country"] + t_u[0]["short_name"],
-                                start_date.strftime("%d/%m/%Y"),
-                                str(delta_days),
-                            )
-                            # Call backend to store log
-                            self._backend.log(
-                                self._site,
-                                self._api_instance.controler,
-                                self._api_instance.transfer_errors,
-                                self._api_instance.http_status,
-                                log_msg,
-                                total_size(items_dict),
-                                timing,
-                            )
-                            logger.info(log_msg)
+                        else:
+                            for t_u in t_us:
+                                logger.debug(
+                                    _("Getting observations from territorial_unit %s, using API search"),
+                                    t_u[0]["name"],
+                                )
+                                # Store each chunk as soon as it is received, while the next one is downloaded
+                                nb_o = self._store_t_u(
+                                    self._api_instance,
+                                    prefetched(
+                                        timed_chunks(
+                                            self._api_instance.api_search_iter(
+                                                self._t_u_param(q_param, t_u), short_version=short_version
+                                            )
+                                        ),
+                                        self._prefetch_chunks,
+                                    ),
+                                    id_taxo_group,
+                                    t_u,
+                                    seq,
+                                    start_date,
+                                    delta_days,
+                                )
+                                # Throttle on max size downloaded during each interval
+                                nb_obs = max(nb_o, nb_obs)
                         seq += 1
                         end_date = start_date
                         delta_days = int(pid(nb_obs))
         except HTTPError:
-            self._backend.log(
-                self._site,
-                self._api_instance.controler,
-                self._api_instance.transfer_errors,
-                self._api_instance.http_status,
-                _("HTTP error during download"),
-            )
+            # Errors of concurrent downloads are logged by _search_concurrent
+            if self._search_workers == 1:
+                self._backend.log(
+                    self._site,
+                    self._api_instance.controler,
+                    self._api_instance.transfer_errors,
+                    self._api_instance.http_status,
+                    _("HTTP error during download"),
+                )
 
         return None
 
@@ -890,20 +1133,8 @@ class Observations(DownloadVn):
         """Return the list of enabled taxo_groups."""
         if id_taxo_group is None:
             # Get all active taxo_groups
-            taxo_groups = TaxoGroupsAPI(
-                user_email=self._user_email,
-                user_pw=self._user_pw,
-                base_url=self._base_url,
-                client_key=self._client_key,
-                client_secret=self._client_secret,
-                max_retry=self._max_retry,
-                max_requests=self._max_requests,
-                max_chunks=self._max_chunks,
-                unavailable_delay=self._unavailable_delay,
-                retry_delay=self._retry_delay,
-            ).api_list()
             taxo_list = []
-            for taxo in taxo_groups["data"]:
+            for taxo in self._reference_list("taxo_groups", TaxoGroupsAPI):
                 if (taxo["name_constant"] not in taxo_groups_ex) and (taxo["access_mode"] != "none"):
                     logger.debug(
                         _("Starting to download observations from taxo_group %s: %s"),
@@ -970,6 +1201,107 @@ class Observations(DownloadVn):
 
         return None
 
+    def _diff_taxo(self, taxo, since):
+        """Download the list of observations modified since a date, in a worker thread.
+
+        Uses its own copy of the API instance, sharing the HTTP session and the count of requests.
+
+        Returns
+        -------
+        tuple
+            Lists of updated and deleted observations ids.
+        """
+        api = copy(self._api_instance)
+        updated = []
+        deleted = []
+        for item in api.api_diff(taxo, since, modification_type="all"):
+            logger.debug(
+                _("Observation %s was %s"),
+                item["id_sighting"],
+                item["modification_type"],
+            )
+            if item["modification_type"] == "updated":
+                updated.append(item["id_sighting"])
+            elif item["modification_type"] == "deleted":
+                deleted.append(item["id_sighting"])
+            else:
+                logger.error(
+                    _("Observation %s has unknown processing %s"),
+                    item["id_universal"],
+                    item["modification_type"],
+                )
+                raise NotImplementedException
+        return updated, deleted
+
+    def _list_slice(self, api, taxo, s_list, short_version):
+        """Download a slice of updated observations, in a worker thread.
+
+        Returns
+        -------
+        tuple
+            items_dict received and timing in µs.
+        """
+        timing = perf_counter_ns()
+        items_dict = api.api_list(taxo, id_sightings_list=s_list, short_version=short_version)
+        return items_dict, (perf_counter_ns() - timing) / 1000
+
+    def _update_concurrent(self, executor, taxo, updated, file_id, short_version):
+        """Download slices of updated observations concurrently.
+
+        At most search_workers slices are downloaded in parallel, each with its own
+        copy of the API instance. Results are stored in slices order, by the calling thread.
+        """
+        in_flight = deque()
+
+        def store_oldest():
+            i, s_list, api, future = in_flight.popleft()
+            try:
+                items_dict, timing = future.result()
+            except HTTPError:
+                # Logged with the error status of the API instance that failed
+                self._backend.log(
+                    self._site,
+                    self._api_instance.controler,
+                    api.transfer_errors,
+                    api.http_status,
+                    _("HTTP error during download"),
+                )
+                raise
+
+            # Call backend to store results
+            self._backend.store(
+                self._api_instance.controler,
+                file_id + "_upd_" + str(i),
+                items_dict,
+            )
+
+            # Call backend to store log
+            self._backend.log(
+                self._site,
+                self._api_instance.controler,
+                api.transfer_errors,
+                api.http_status,
+                _("Creating or updating %d observations") % (s_list.count(",") + 1),
+                api.last_response_bytes,
+                timing,
+            )
+
+        try:
+            for i in range((len(updated) + self._max_list_length - 1) // self._max_list_length):
+                s_list = ",".join(updated[i * self._max_list_length : (i + 1) * self._max_list_length])
+                logger.debug(_("Updating slice %s"), s_list)
+                api = copy(self._api_instance)
+                in_flight.append((i, s_list, api, executor.submit(self._list_slice, api, taxo, s_list, short_version)))
+                if len(in_flight) >= self._search_workers:
+                    store_oldest()
+            while len(in_flight) > 0:
+                store_oldest()
+        except BaseException:
+            # Do not wait for the remaining slices
+            for _i, _s_list, _api, future in in_flight:
+                future.cancel()
+            raise
+
     def update(self, id_taxo_group=None, since=None, taxo_groups_ex=None, short_version="1"):
         """Download increment from VN by API and store json to file.
 
@@ -978,12 +1310,16 @@ class Observations(DownloadVn):
         If update, get full observation and store to db.
         If delete, delete from db.
 
+        Modifications of all taxo_groups, then slices of updated observations,
+        are downloaded by search_workers threads. They are stored in order,
+        by the calling thread.
+
         Parameters
         ----------
         id_taxo_group : str or None
             If not None, taxo_group to be downloaded.
         since : str or None
-            If None, updates since last download
+            If None, updates each taxo_group since its last download
             Or if provided, updates since that given date.
         taxo_groups_ex : list
             List of taxo_groups to exclude from storage.
@@ -1000,88 +1336,52 @@ class Observations(DownloadVn):
         taxo_list = self._list_taxo_groups(id_taxo_group, taxo_groups_ex)
         logger.info(_("Downloaded taxo_groups: %s"), taxo_list)
 
-        for taxo in taxo_list:
-            updated = []
-            deleted = []
-            if since is None:
-                since = self._backend.increment_get(self._site, taxo)
-            if since is not None:
-                # Valid since date provided or found in database
-                self._backend.increment_log(self._site, taxo, datetime.now())
-                logger.info(_("Getting updates for taxo_group %s since %s"), taxo, since)
-                items_dict = self._api_instance.api_diff(taxo, since, modification_type="all")
-
-                # List by processing type
-                for item in items_dict:
-                    logger.debug(
-                        _("Observation %s was %s"),
-                        item["id_sighting"],
-                        item["modification_type"],
-                    )
-                    if item["modification_type"] == "updated":
-                        updated.append(item["id_sighting"])
-                    elif item["modification_type"] == "deleted":
-                        deleted.append(item["id_sighting"])
+        with ThreadPoolExecutor(max_workers=self._search_workers) as executor:
+            try:
+                # Get modifications of each taxo_group, since its own last download
+                diffs = []
+                for taxo in taxo_list:
+                    taxo_since = self._backend.increment_get(self._site, taxo) if since is None else since
+                    if taxo_since is not None:
+                        # Valid since date provided or found in database
+                        logger.info(_("Getting updates for taxo_group %s since %s"), taxo, taxo_since)
+                        diffs.append((taxo, datetime.now(), executor.submit(self._diff_taxo, taxo, taxo_since)))
                     else:
-                        logger.error(
-                            _("Observation %s has unknown processing %s"),
-                            item["id_universal"],
-                            item["modification_type"],
-                        )
-                        raise NotImplementedException
-                logger.info(
-                    _("Received %d updated and %d deleted items"),
-                    len(updated),
-                    len(deleted),
-                )
-            else:
-                logger.error(_("No date found for last download, increment not performed"))
+                        logger.error(_("No date found for last download, increment not performed"))
 
-            # Process updates
-            try:
-                if len(updated) > 0:
-                    logger.debug(_("Creating or updating %d observations"), len(updated))
-                    # Update backend store, in chunks
-                    for i in range((len(updated) + self._max_list_length - 1) // self._max_list_length):
-                        s_list = ",".join(updated[i * self._max_list_length : (i + 1) * self._max_list_length])
-                        logger.debug(_("Updating slice %s"), s_list)
-                        timing = perf_counter_ns()
-                        items_dict = self._api_instance.api_list(
-                            taxo,
-                            id_sightings_list=s_list,
-                            short_version=short_version,
-                        )
-                        timing = (perf_counter_ns() - timing) / 1000
+                for taxo, taxo_ts, diff in diffs:
+                    updated, deleted = diff.result()
+                    logger.info(
+                        _("Received %d updated and %d deleted items"),
+                        len(updated),
+                        len(deleted),
+                    )
 
-                        # Call backend to store results
-                        self._backend.store(
-                            self._api_instance.controler,
-                            str(id_taxo_group) + "_upd_" + str(i),
-                            items_dict,
-                        )
+                    # Process updates
+                    try:
+                        if len(updated) > 0:
+                            logger.debug(_("Creating or updating %d observations"), len(updated))
+                            # Update backend store, in chunks
+                            self._update_concurrent(executor, taxo, updated, str(id_taxo_group), short_version)
+                    except HTTPError:
+                        # Logged by _update_concurrent
+                        updates_stored = False
+                    else:
+                        updates_stored = True
 
-                        # Call backend to store log
-                        self._backend.log(
-                            self._site,
-                            self._api_instance.controler,
-                            self._api_instance.transfer_errors,
-                            self._api_instance.http_status,
-                            _("Creating or updating %d observations") % (s_list.count(",") + 1),
-                            total_size(items_dict),
-                            timing,
-                        )
-            except HTTPError:
-                self._backend.log(
-                    self._site,
-                    self._api_instance.controler,
-                    self._api_instance.transfer_errors,
-                    self._api_instance.http_status,
-                    _("HTTP error during download"),
-                )
+                    # Process deletes
+                    if len(deleted) > 0:
+                        self._backend.delete_obs(deleted)
 
-            # Process deletes
-            if len(deleted) > 0:
-                self._backend.delete_obs(deleted)
+                    # Advance the watermark only when all modifications of the taxo_group are stored
+                    if updates_stored:
+                        self._backend.increment_log(self._site, taxo, taxo_ts)
+                    else:
+                        logger.error(_("Updates of taxo_group %s not stored, increment not performed"), taxo)
+            except BaseException:
+                # Do not wait for the remaining downloads
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
 
         return None
 
@@ -1146,11 +1446,22 @@ class Places(DownloadVn):
         client_secret: str,
         backend: Callable[..., None],
         db_enabled: bool = False,
+        db_user: str = "",
+        db_pw: str = "",
+        db_host: str = "",
+        db_port: str = "",
+        db_name: str = "",
+        db_schema_import: str = "",
+        db_schema_vn: str = "",
+        db_group: str = "",
+        db_out_proj: str = "",
+        max_list_length: int = 100,
         max_retry: int = 5,
         max_requests: int = 0,
         max_chunks: int = 100,
         unavailable_delay: int = 600,
         retry_delay: int = 5,
+        search_workers: int = 1,
     ) -> None:
         self._user_email = user_email
         self._user_pw = user_pw
@@ -1163,8 +1474,18 @@ class Places(DownloadVn):
         self._unavailable_delay = unavailable_delay
         self._retry_delay = retry_delay
         self._db_enabled = db_enabled
+        self._db_user = db_user
+        self._db_pw = db_pw
+        self._db_host = db_host
+        self._db_port = db_port
+        self._db_name = db_name
+        self._db_schema_import = db_schema_import
+        self._db_schema_vn = db_schema_vn
+        self._db_group = db_group
+        self._db_out_proj = db_out_proj
+        self._max_list_length = max_list_length
+        self._search_workers = search_workers
         self._place_id = -1  # Integer index, to comply with taxo_groups, for increment log
-        self._l_a_units = None
         super().__init__(
             site,
             PlacesAPI(
@@ -1196,63 +1517,45 @@ class Places(DownloadVn):
             List of territorial_units to include in storage.
         """
         logger.info(_("Getting local_admin_units, before getting places"))
-        # Get local_admin_units if needed
-        if self._l_a_units is None:
-            if self._db_enabled:
-                # Try to read from local database
-                self._l_a_units = ReadPostgresql(
-                    self._site,
-                    self._db_enabled,
-                    self._db_user,
-                    self._db_pw,
-                    self._db_host,
-                    self._db_port,
-                    self._db_name,
-                    self._db_schema_import,
-                    self._db_schema_vn,
-                    self._db_group,
-                    self._db_out_proj,
-                ).read("local_admin_units")
-            if (self._l_a_units is None) or (len(self._l_a_units) == 0):
-                # No local_admin_units available, read from API
-                self._l_a_units = [
-                    LocalAdminUnitsAPI(
-                        user_email=self._user_email,
-                        user_pw=self._user_pw,
-                        base_url=self._base_url,
-                        client_key=self._client_key,
-                        client_secret=self._client_secret,
-                        max_retry=self._max_retry,
-                        max_requests=self._max_requests,
-                        max_chunks=self._max_chunks,
-                        unavailable_delay=self._unavailable_delay,
-                        retry_delay=self._retry_delay,
-                    ).api_list()["data"]
-                ]
+        l_a_units = self._reference_list(
+            "local_admin_units", LocalAdminUnitsAPI, read_db=self._db_enabled, fields=_L_A_UNITS_FIELDS
+        )
 
         self._backend.increment_log(self._site, self._place_id, datetime.now())
         if territorial_unit_ids is not None and len(territorial_unit_ids) > 0:
-            # Get local_admin_units
-            for id_canton in territorial_unit_ids:
-                # Loop on local_admin_units of the territorial_unit
-                for l_a_u in self._l_a_units[0]:
-                    if l_a_u["id_canton"] == id_canton:
-                        logger.info(
-                            _("Getting places from id_canton %s, id_commune %s, using API list"),
-                            id_canton,
-                            l_a_u["id"],
-                        )
-                        q_param = {"id_commune": l_a_u["id"], "get_hidden": "1"}
-                        super().store(opt_params_iter=[q_param], file_id=(id_canton + "_" + l_a_u["id"] + "_"))
+            # Loop on local_admin_units of the territorial_units
+            for l_a_u in l_a_units:
+                if l_a_u["id_canton"] in territorial_unit_ids:
+                    logger.info(
+                        _("Getting places from id_canton %s, id_commune %s, using API list"),
+                        l_a_u["id_canton"],
+                        l_a_u["id"],
+                    )
+                    q_param = {"id_commune": l_a_u["id"], "get_hidden": "1"}
+                    super().store(opt_params_iter=[q_param], file_id=(l_a_u["id_canton"] + "_" + l_a_u["id"] + "_"))
         else:
-            for l_a_u in self._l_a_units:
+            for l_a_u in l_a_units:
                 logger.info(
                     _("Getting places from id_commune %s, using API list"),
-                    l_a_u[0]["id"],
+                    l_a_u["id"],
                 )
-                q_param = {"id_commune": l_a_u[0]["id"], "get_hidden": "1"}
+                q_param = {"id_commune": l_a_u["id"], "get_hidden": "1"}
                 super().store([q_param])
 
+    def _get_place(self, id_place):
+        """Download a place, in a worker thread.
+
+        Each download uses its own copy of the API instance, sharing the HTTP session
+        and the count of requests, so that error counters are not mixed between places.
+
+        Returns
+        -------
+        tuple
+            API instance used and items_dict received.
+        """
+        api = copy(self._api_instance)
+        return api, api.api_get(id_place)
+
     def update(self, territorial_unit_ids=None, since=None):
         """Download increment from VN by API and store json to file.
 
@@ -1309,30 +1612,32 @@ class Places(DownloadVn):
         # Process updates
         if len(updated) > 0:
             logger.debug(_("Creating or updating %d places"), len(updated))
-            # Update backend store, in chunks
-            for i in range(len(updated)):
-                logger.debug(_("Updating place %s"), updated[i])
-                timing = perf_counter_ns()
-                items_dict = self._api_instance.api_get(updated[i])
-                timing = (perf_counter_ns() - timing) / 1000
-
-                # Call backend to store results
-                self._backend.store(
-                    self._api_instance.controler,
-                    "upd_" + str(i),
-                    items_dict,
-                )
+            # Update backend store, in slices of places downloaded concurrently
+            with ThreadPoolExecutor(max_workers=self._search_workers) as executor:
+                for i in range((len(updated) + self._max_list_length - 1) // self._max_list_length):
+                    s_list = updated[i * self._max_list_length : (i + 1) * self._max_list_length]
+                    logger.debug(_("Updating places %s"), s_list)
+                    timing = perf_counter_ns()
+                    responses = list(executor.map(self._get_place, s_list))
+                    timing = (perf_counter_ns() - timing) / 1000
+
+                    # Call backend to store results, as a single page
+                    self._backend.store(
+                        self._api_instance.controler,
+                        "upd_" + str(i),
+                        {"data": [place for _api, items_dict in responses for place in items_dict.get("data", [])]},
+                    )
 
-                # Call backend to store log
-                self._backend.log(
-                    self._site,
-                    self._api_instance.controler,
-                    self._api_instance.transfer_errors,
-                    self._api_instance.http_status,
-                    _("Creating or updating 1 place"),
-                    total_size(items_dict),
-                    timing,
-                )
+                    # Call backend to store log
+                    self._backend.log(
+                        self._site,
+                        self._api_instance.controler,
+                        sum(api.transfer_errors for api, _items_dict in responses),
+                        responses[-1][0].http_status,
+                        _("Creating or updating %d places") % len(s_list),
+                        sum(api.last_response_bytes for api, _items_dict in responses),
+                        timing,
+                    )
 
         # Process deletes
         if len(deleted) > 0:
@@ -1392,20 +1697,8 @@ class Species(DownloadVn):
 
     def store(self):
         """Store species, iterating over taxo_groups"""
-        taxo_groups = TaxoGroupsAPI(
-            user_email=self._user_email,
-            user_pw=self._user_pw,
-            base_url=self._base_url,
-            client_key=self._client_key,
-            client_secret=self._client_secret,
-            max_retry=self._max_retry,
-            max_requests=self._max_requests,
-            max_chunks=self._max_chunks,
-            unavailable_delay=self._unavailable_delay,
-            retry_delay=self._retry_delay,
-        ).api_list()
         taxo_list = []
-        for taxo in taxo_groups["data"]:
+        for taxo in self._reference_list("taxo_groups", TaxoGroupsAPI):
             if taxo["access_mode"] != "none":
                 logger.debug(_("Storing species from taxo_group %s"), taxo["id"])
                 taxo_list.append({"id_taxo_group": taxo["id"]})
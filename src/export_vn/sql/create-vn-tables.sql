@@ -11,8 +11,14 @@
 --        ii) INSERT if row does nopt exist, usually after table re-creation
 --     c) INSERT row if JSON row is created
 --     NOTICE: adding a new column must be done in 1), 4bi), 4bii) and 4c)!
---  5) Add trigger
+--     For observations, also in refresh_observations, that extracts the
+--     same columns after bulk loads. Both lists are compared by tests.
+--     For forms, observations and places, the function is a statement level
+--     trigger, with a single DELETE or INSERT ... ON CONFLICT DO UPDATE
+--     joined to the transition tables old_rows or new_rows.
+--  5) Add trigger, or INSERT, UPDATE and DELETE triggers for statement level
 --  6) Execute trigger by performing dummy update (site=site) on JSON table
+--     or, for observations, by calling the set-based refresh function
 
 -- Cleanup and create
 DROP SCHEMA IF EXISTS {{ db_schema_vn }} CASCADE;
@@ -389,98 +395,74 @@ CREATE TRIGGER trg_geom BEFORE INSERT or UPDATE
     EXECUTE PROCEDURE update_geom_triggerfn();
 
 CREATE OR REPLACE FUNCTION update_forms() RETURNS TRIGGER AS $$
+    -- Statement level trigger: all rows of the statement are in transition tables
     BEGIN
     IF (TG_OP = 'DELETE') THEN
         -- Deleting data when JSON data is deleted
-        DELETE FROM {{ db_schema_vn }}.forms
-            WHERE id = OLD.id AND site = OLD.site;
-        IF NOT FOUND THEN
-            RETURN NULL;
-        END IF;
-        RETURN OLD;
+        DELETE FROM {{ db_schema_vn }}.forms AS t
+            USING old_rows AS o
+            WHERE t.id = o.id AND t.site = o.site;
 
-    ELSIF (TG_OP = 'UPDATE') THEN
-        -- Updating or inserting data when JSON data is updated
-        UPDATE {{ db_schema_vn }}.forms SET
-            id_form_universal = NEW.item->>'id_form_universal',
-            observer_uid      = CAST(NEW.item->>'@uid' as INT),
-            date_start        = CAST(NEW.item->>'date_start' AS DATE),
-            date_stop         = CAST(NEW.item->>'date_stop' AS DATE),
-            time_start        = NEW.item->>'time_start',
-            time_stop         = NEW.item->>'time_stop',
-            full_form         = NEW.item->>'full_form',
-            version           = NEW.item->>'version',
-            coord_lat         = CAST(NEW.item->>'lat' AS FLOAT),
-            coord_lon         = CAST(NEW.item->>'lon' AS FLOAT),
-            coord_x_local     = CAST(NEW.item->>'coord_x_local' AS FLOAT),
-            coord_y_local     = CAST(NEW.item->>'coord_y_local' AS FLOAT),
-            comments          = NEW.item->>'comment',
-            protocol_name     = NEW.item #>>'{protocol,protocol_name}',
-            protocol          = CAST(NEW.item->>'protocol' AS JSONB)
-        WHERE id = OLD.id AND site = OLD.site ;
-        IF NOT FOUND THEN
-            -- Inserting data in new row, usually after table re-creation
-            INSERT INTO {{ db_schema_vn }}.forms(site, id, id_form_universal, observer_uid, date_start,
-                                              date_stop, time_start, time_stop, full_form, version,
-                                              coord_lat, coord_lon, coord_x_local, coord_y_local,
-                                              comments, protocol_name, protocol)
-            VALUES (
-                NEW.site,
-                NEW.id,
-                NEW.item->>'id_form_universal',
-                CAST(NEW.item->>'@uid' as INT),
-                CAST(NEW.item->>'date_start' AS DATE),
-                CAST(NEW.item->>'date_stop' AS DATE),
-                NEW.item->>'time_start',
-                NEW.item->>'time_stop',
-                NEW.item->>'full_form',
-                NEW.item->>'version',
-                CAST(NEW.item->>'lat' AS FLOAT),
-                CAST(NEW.item->>'lon' AS FLOAT),
-                CAST(NEW.item->>'coord_x_local' AS FLOAT),
-                CAST(NEW.item->>'coord_y_local' AS FLOAT),
-                NEW.item->>'comment',
-                NEW.item #>>'{protocol,protocol_name}',
-                CAST(NEW.item->>'protocol' AS JSONB)
-            );
-            END IF;
-        RETURN NEW;
-
-    ELSIF (TG_OP = 'INSERT') THEN
-        -- Inserting row when raw data is inserted
+    ELSE
+        -- Inserting or updating data when JSON data is inserted or updated
         INSERT INTO {{ db_schema_vn }}.forms(site, id, id_form_universal, observer_uid, date_start,
-                                          date_stop, time_start, time_stop, full_form, version,
-                                          coord_lat, coord_lon, coord_x_local, coord_y_local,
-                                          comments, protocol_name, protocol)
-        VALUES (
-            NEW.site,
-            NEW.id,
-            NEW.item->>'id_form_universal',
-            CAST(NEW.item->>'@uid' as INT),
-            CAST(NEW.item->>'date_start' AS DATE),
-            CAST(NEW.item->>'date_stop' AS DATE),
-            NEW.item->>'time_start',
-            NEW.item->>'time_stop',
-            NEW.item->>'full_form',
-            NEW.item->>'version',
-            CAST(NEW.item->>'lat' AS FLOAT),
-            CAST(NEW.item->>'lon' AS FLOAT),
-            CAST(NEW.item->>'coord_x_local' AS FLOAT),
-            CAST(NEW.item->>'coord_y_local' AS FLOAT),
-            NEW.item->>'comment',
-            NEW.item #>>'{protocol,protocol_name}',
-            CAST(NEW.item->>'protocol' AS JSONB)
-        );
-        RETURN NEW;
+                                             date_stop, time_start, time_stop, full_form, version,
+                                             coord_lat, coord_lon, coord_x_local, coord_y_local,
+                                             comments, protocol_name, protocol)
+        SELECT
+            n.site,
+            n.id,
+            n.item->>'id_form_universal',
+            CAST(n.item->>'@uid' as INT),
+            CAST(n.item->>'date_start' AS DATE),
+            CAST(n.item->>'date_stop' AS DATE),
+            n.item->>'time_start',
+            n.item->>'time_stop',
+            n.item->>'full_form',
+            n.item->>'version',
+            CAST(n.item->>'lat' AS FLOAT),
+            CAST(n.item->>'lon' AS FLOAT),
+            CAST(n.item->>'coord_x_local' AS FLOAT),
+            CAST(n.item->>'coord_y_local' AS FLOAT),
+            n.item->>'comment',
+            n.item #>>'{protocol,protocol_name}',
+            CAST(n.item->>'protocol' AS JSONB)
+        FROM new_rows AS n
+        ON CONFLICT (site, id) DO UPDATE SET
+            id_form_universal = EXCLUDED.id_form_universal,
+            observer_uid      = EXCLUDED.observer_uid,
+            date_start        = EXCLUDED.date_start,
+            date_stop         = EXCLUDED.date_stop,
+            time_start        = EXCLUDED.time_start,
+            time_stop         = EXCLUDED.time_stop,
+            full_form         = EXCLUDED.full_form,
+            version           = EXCLUDED.version,
+            coord_lat         = EXCLUDED.coord_lat,
+            coord_lon         = EXCLUDED.coord_lon,
+            coord_x_local     = EXCLUDED.coord_x_local,
+            coord_y_local     = EXCLUDED.coord_y_local,
+            comments          = EXCLUDED.comments,
+            protocol_name     = EXCLUDED.protocol_name,
+            protocol          = EXCLUDED.protocol;
     END IF;
+    RETURN NULL;
 END;
 $$
 LANGUAGE plpgsql;
 
 DROP TRIGGER IF EXISTS forms_trigger ON {{ db_schema_import }}.forms_json;
-CREATE TRIGGER forms_trigger
-AFTER INSERT OR UPDATE OR DELETE ON {{ db_schema_import }}.forms_json
-    FOR EACH ROW EXECUTE PROCEDURE {{ db_schema_vn }}.update_forms();
+CREATE TRIGGER forms_insert_trigger
+AFTER INSERT ON {{ db_schema_import }}.forms_json
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE {{ db_schema_vn }}.update_forms();
+CREATE TRIGGER forms_update_trigger
+AFTER UPDATE ON {{ db_schema_import }}.forms_json
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE {{ db_schema_vn }}.update_forms();
+CREATE TRIGGER forms_delete_trigger
+AFTER DELETE ON {{ db_schema_import }}.forms_json
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE {{ db_schema_vn }}.update_forms();
 
 
 --------------------
@@ -680,157 +662,214 @@ BEGIN
 END;
 $v_output$ LANGUAGE plpgsql IMMUTABLE;
 
+-- Columns must be extracted as in refresh_observations
 CREATE OR REPLACE FUNCTION update_observations() RETURNS TRIGGER AS $$
+    -- Statement level trigger: all rows of the statement are in transition tables
     BEGIN
     IF (TG_OP = 'DELETE') THEN
-        -- Deleting data on src_vn.observations when raw data is deleted
-        DELETE FROM {{ db_schema_vn }}.observations
-            WHERE id_sighting = OLD.id AND site = OLD.site;
-        IF NOT FOUND THEN
-            RETURN NULL;
-        END IF;
-        RETURN OLD;
-
-    ELSIF (TG_OP = 'UPDATE') THEN
-        -- Updating data on src_vn.observations when raw data is updated
-        UPDATE {{ db_schema_vn }}.observations SET
-            id_universal      = ((NEW.item -> 'observers') -> 0) ->> 'id_universal',
-            uuid              = ((NEW.item -> 'observers') -> 0) ->> 'uuid',
-            id_form_universal = NEW.id_form_universal,
-            id_species        = CAST(NEW.item #>> '{species,@id}' AS INTEGER),
-            taxonomy          = CAST(NEW.item #>> '{species,taxonomy}' AS INTEGER),
-            "date"            = to_timestamp(CAST(NEW.item #>> '{date,@timestamp}' AS DOUBLE PRECISION)),
-            date_year         = CAST(extract(year from to_timestamp(CAST(NEW.item #>> '{date,@timestamp}' AS DOUBLE PRECISION))) AS INTEGER),
-            timing            = to_timestamp(CAST(((NEW.item -> 'observers') -> 0) #>> '{timing,@timestamp}' AS DOUBLE PRECISION)),
-            id_place          = CAST(NEW.item #>> '{place,@id}' AS INTEGER),
-            place             = NEW.item #>> '{place,name}',
-            coord_lat         = CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_lat' AS FLOAT),
-            coord_lon         = CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_lon' AS FLOAT),
-            coord_x_local     = CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_x_local' AS FLOAT),
-            coord_y_local     = CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_y_local' AS FLOAT),
-            precision         = ((NEW.item -> 'observers') -> 0) ->> 'precision',
-            source            = ((NEW.item -> 'observers') -> 0) ->> 'source',
-            estimation_code   = ((NEW.item -> 'observers') -> 0) ->> 'estimation_code',
-            count             = CAST(((NEW.item -> 'observers') -> 0) ->> 'count' AS INTEGER),
-            atlas_code        = CAST(((NEW.item -> 'observers') -> 0) ->> 'atlas_code' AS INTEGER),
-            altitude          = CAST(((NEW.item -> 'observers') -> 0) ->> 'altitude' AS INTEGER),
-            project_code      = ((NEW.item -> 'observers') -> 0) ->> 'project_code',
-            hidden            = CAST(((NEW.item -> 'observers') -> 0) ->> 'hidden' AS BOOLEAN),
-            admin_hidden      = CAST(((NEW.item -> 'observers') -> 0) ->> 'admin_hidden' AS BOOLEAN),
-            observer_uid      = CAST(((NEW.item -> 'observers') -> 0) ->> '@uid' AS INTEGER),
-            details           = ((NEW.item -> 'observers') -> 0) ->> 'details',
-            behaviours        = {{ db_schema_vn }}.behaviour_array(((NEW.item -> 'observers') -> 0) -> 'behaviours'),
-            comment           = ((NEW.item -> 'observers') -> 0) ->> 'comment',
-            hidden_comment    = ((NEW.item -> 'observers') -> 0) ->> 'hidden_comment',
-            confirmed_by      = ((NEW.item -> 'observers') -> 0) ->> 'confirmed_by',
-            mortality         = CAST(((((NEW.item -> 'observers') -> 0) #>> '{extended_info,mortality}'::text []) is not null) as BOOLEAN),
-            death_cause2      = ((NEW.item -> 'observers') -> 0) #>> '{extended_info, mortality, death_cause2}',
-            insert_date       = to_timestamp(CAST(((NEW.item -> 'observers') -> 0) ->> 'insert_date' AS DOUBLE PRECISION)),
-            update_date       = to_timestamp(NEW.update_ts)
-        WHERE id_sighting = OLD.id AND site = OLD.site;
-
-        IF NOT FOUND THEN
-            -- Inserting data on src_vn.observations when raw data is inserted
-            INSERT INTO {{ db_schema_vn }}.observations (site, id_sighting, id_universal, uuid, id_form_universal,
-                                             id_species, taxonomy, date, date_year, timing, id_place, place,
-                                             coord_lat, coord_lon, coord_x_local, coord_y_local, precision, source, estimation_code,
-                                             count, atlas_code, altitude, project_code, hidden, admin_hidden, observer_uid, details,
-                                             behaviours, comment, hidden_comment, confirmed_by, mortality, death_cause2, insert_date, update_date)
-            VALUES (
-                NEW.site,
-                NEW.id,
-                ((NEW.item -> 'observers') -> 0) ->> 'id_universal',
-                ((NEW.item -> 'observers') -> 0) ->> 'uuid',
-                NEW.id_form_universal,
-                CAST(NEW.item #>> '{species,@id}' AS INTEGER),
-                CAST(NEW.item #>> '{species,taxonomy}' AS INTEGER),
-                to_timestamp(CAST(NEW.item #>> '{date,@timestamp}' AS DOUBLE PRECISION)),
-                CAST(extract(year from to_timestamp(CAST(NEW.item #>> '{date,@timestamp}' AS DOUBLE PRECISION))) AS INTEGER),
-                -- Missing time_start & time_stop
-                to_timestamp(CAST(((NEW.item -> 'observers') -> 0) #>> '{timing,@timestamp}' AS DOUBLE PRECISION)),
-                CAST(NEW.item #>> '{place,@id}' AS INTEGER),
-                NEW.item #>> '{place,name}',
-                CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_lat' AS FLOAT),
-                CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_lon' AS FLOAT),
-                CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_x_local' AS FLOAT),
-                CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_y_local' AS FLOAT),
-                ((NEW.item -> 'observers') -> 0) ->> 'precision',
-                ((NEW.item -> 'observers') -> 0) ->> 'source',
-                ((NEW.item -> 'observers') -> 0) ->> 'estimation_code',
-                CAST(((NEW.item -> 'observers') -> 0) ->> 'count' AS INTEGER),
-                CAST(((NEW.item -> 'observers') -> 0) ->> 'atlas_code' AS INTEGER),
-                CAST(((NEW.item -> 'observers') -> 0) ->> 'altitude' AS INTEGER),
-                ((NEW.item -> 'observers') -> 0) ->> 'project_code',
-                CAST(((NEW.item -> 'observers') -> 0) ->> 'hidden' AS BOOLEAN),
-                CAST(((NEW.item -> 'observers') -> 0) ->> 'admin_hidden' AS BOOLEAN),
-                CAST(((NEW.item -> 'observers') -> 0) ->> '@uid' AS INTEGER),
-                ((NEW.item -> 'observers') -> 0) ->> 'details',
-                {{ db_schema_vn }}.behaviour_array(((NEW.item -> 'observers') -> 0) -> 'behaviours'),
-                ((NEW.item -> 'observers') -> 0) ->> 'comment',
-                ((NEW.item -> 'observers') -> 0) ->> 'hidden_comment',
-                ((NEW.item -> 'observers') -> 0) ->> 'confirmed_by',
-                CAST(((((NEW.item -> 'observers') -> 0) #>> '{extended_info,mortality}'::text []) is not null) as BOOLEAN),
-                ((NEW.item -> 'observers') -> 0) #>> '{extended_info, mortality, death_cause2}',
-                to_timestamp(CAST(((NEW.item -> 'observers') -> 0) ->> 'insert_date' AS DOUBLE PRECISION)),
-                to_timestamp(NEW.update_ts));
-            END IF;
-        RETURN NEW;
+        -- Deleting data when JSON data is deleted
+        DELETE FROM {{ db_schema_vn }}.observations AS t
+            USING old_rows AS o
+            WHERE t.id_sighting = o.id AND t.site = o.site;
 
-    ELSIF (TG_OP = 'INSERT') THEN
-        -- Inserting data on src_vn.observations when raw data is inserted
+    ELSE
+        -- Inserting or updating data when JSON data is inserted or updated
         INSERT INTO {{ db_schema_vn }}.observations (site, id_sighting, id_universal, uuid, id_form_universal,
-                                         id_species, taxonomy, date, date_year, timing, id_place, place,
-                                         coord_lat, coord_lon, coord_x_local, coord_y_local, source, precision, estimation_code,
-                                         count, atlas_code, altitude, project_code, hidden, admin_hidden, observer_uid, details,
-                                         behaviours, comment, hidden_comment, confirmed_by, mortality, death_cause2, insert_date, update_date)
-        VALUES (
-            NEW.site,
-            NEW.id,
-            ((NEW.item -> 'observers') -> 0) ->> 'id_universal',
-            ((NEW.item -> 'observers') -> 0) ->> 'uuid',
-            NEW.id_form_universal,
-            CAST(NEW.item #>> '{species,@id}' AS INTEGER),
-            CAST(NEW.item #>> '{species,taxonomy}' AS INTEGER),
-            to_timestamp(CAST(NEW.item #>> '{date,@timestamp}' AS DOUBLE PRECISION)),
-            CAST(extract(year from to_timestamp(CAST(NEW.item #>> '{date,@timestamp}' AS DOUBLE PRECISION))) AS INTEGER),
-            -- Missing time_start & time_stop
-            to_timestamp(CAST(((NEW.item -> 'observers') -> 0) #>> '{timing,@timestamp}' AS DOUBLE PRECISION)),
-            CAST(NEW.item #>> '{place,@id}' AS INTEGER),
-            NEW.item #>> '{place,name}',
-            CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_lat' AS FLOAT),
-            CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_lon' AS FLOAT),
-            CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_x_local' AS FLOAT),
-            CAST(((NEW.item -> 'observers') -> 0) ->> 'coord_y_local' AS FLOAT),
-            ((NEW.item -> 'observers') -> 0) ->> 'source',
-            ((NEW.item -> 'observers') -> 0) ->> 'precision',
-            ((NEW.item -> 'observers') -> 0) ->> 'estimation_code',
-            CAST(((NEW.item -> 'observers') -> 0) ->> 'count' AS INTEGER),
-            CAST(((NEW.item -> 'observers') -> 0) ->> 'atlas_code' AS INTEGER),
-            CAST(((NEW.item -> 'observers') -> 0) ->> 'altitude' AS INTEGER),
-            ((NEW.item -> 'observers') -> 0) ->> 'project_code',
-            CAST(((NEW.item -> 'observers') -> 0) ->> 'hidden' AS BOOLEAN),
-            CAST(((NEW.item -> 'observers') -> 0) ->> 'admin_hidden' AS BOOLEAN),
-            CAST(((NEW.item -> 'observers') -> 0) ->> '@uid' AS INTEGER),
-            ((NEW.item -> 'observers') -> 0) ->> 'details',
-            {{ db_schema_vn }}.behaviour_array(((NEW.item -> 'observers') -> 0) -> 'behaviours'),
-            ((NEW.item -> 'observers') -> 0) ->> 'comment',
-            ((NEW.item -> 'observers') -> 0) ->> 'hidden_comment',
-            ((NEW.item -> 'observers') -> 0) ->> 'confirmed_by',
-            CAST(((((NEW.item -> 'observers') -> 0) #>> '{extended_info,mortality}'::text []) is not null) as BOOLEAN),
-            ((NEW.item -> 'observers') -> 0) #>> '{extended_info, mortality, death_cause2}',
-            to_timestamp(CAST(((NEW.item -> 'observers') -> 0) ->> 'insert_date' AS DOUBLE PRECISION)),
-            to_timestamp(NEW.update_ts));
-        RETURN NEW;
+                                                     id_species, taxonomy, date, date_year, timing, id_place, place,
+                                                     coord_lat, coord_lon, coord_x_local, coord_y_local, source, precision, estimation_code,
+                                                     count, atlas_code, altitude, project_code, hidden, admin_hidden, observer_uid, details,
+                                                     behaviours, comment, hidden_comment, confirmed_by, mortality, death_cause2, insert_date, update_date)
+        SELECT
+            n.site,
+            n.id,
+            ((n.item -> 'observers') -> 0) ->> 'id_universal',
+            ((n.item -> 'observers') -> 0) ->> 'uuid',
+            n.id_form_universal,
+            CAST(n.item #>> '{species,@id}' AS INTEGER),
+            CAST(n.item #>> '{species,taxonomy}' AS INTEGER),
+            to_timestamp(CAST(n.item #>> '{date,@timestamp}' AS DOUBLE PRECISION)),
+            CAST(extract(year from to_timestamp(CAST(n.item #>> '{date,@timestamp}' AS DOUBLE PRECISION))) AS INTEGER),
+            to_timestamp(CAST(((n.item -> 'observers') -> 0) #>> '{timing,@timestamp}' AS DOUBLE PRECISION)),
+            CAST(n.item #>> '{place,@id}' AS INTEGER),
+            n.item #>> '{place,name}',
+            CAST(((n.item -> 'observers') -> 0) ->> 'coord_lat' AS FLOAT),
+            CAST(((n.item -> 'observers') -> 0) ->> 'coord_lon' AS FLOAT),
+            CAST(((n.item -> 'observers') -> 0) ->> 'coord_x_local' AS FLOAT),
+            CAST(((n.item -> 'observers') -> 0) ->> 'coord_y_local' AS FLOAT),
+            ((n.item -> 'observers') -> 0) ->> 'source',
+            ((n.item -> 'observers') -> 0) ->> 'precision',
+            ((n.item -> 'observers') -> 0) ->> 'estimation_code',
+            CAST(((n.item -> 'observers') -> 0) ->> 'count' AS INTEGER),
+            CAST(((n.item -> 'observers') -> 0) ->> 'atlas_code' AS INTEGER),
+            CAST(((n.item -> 'observers') -> 0) ->> 'altitude' AS INTEGER),
+            ((n.item -> 'observers') -> 0) ->> 'project_code',
+            CAST(((n.item -> 'observers') -> 0) ->> 'hidden' AS BOOLEAN),
+            CAST(((n.item -> 'observers') -> 0) ->> 'admin_hidden' AS BOOLEAN),
+            CAST(((n.item -> 'observers') -> 0) ->> '@uid' AS INTEGER),
+            ((n.item -> 'observers') -> 0) ->> 'details',
+            {{ db_schema_vn }}.behaviour_array(((n.item -> 'observers') -> 0) -> 'behaviours'),
+            ((n.item -> 'observers') -> 0) ->> 'comment',
+            ((n.item -> 'observers') -> 0) ->> 'hidden_comment',
+            ((n.item -> 'observers') -> 0) ->> 'confirmed_by',
+            CAST(((((n.item -> 'observers') -> 0) #>> '{extended_info,mortality}'::text []) is not null) as BOOLEAN),
+            ((n.item -> 'observers') -> 0) #>> '{extended_info, mortality, death_cause2}',
+            to_timestamp(CAST(((n.item -> 'observers') -> 0) ->> 'insert_date' AS DOUBLE PRECISION)),
+            to_timestamp(n.update_ts)
+        FROM new_rows AS n
+        ON CONFLICT (site, id_sighting) DO UPDATE SET
+            id_universal      = EXCLUDED.id_universal,
+            uuid              = EXCLUDED.uuid,
+            id_form_universal = EXCLUDED.id_form_universal,
+            id_species        = EXCLUDED.id_species,
+            taxonomy          = EXCLUDED.taxonomy,
+            date              = EXCLUDED.date,
+            date_year         = EXCLUDED.date_year,
+            timing            = EXCLUDED.timing,
+            id_place          = EXCLUDED.id_place,
+            place             = EXCLUDED.place,
+            coord_lat         = EXCLUDED.coord_lat,
+            coord_lon         = EXCLUDED.coord_lon,
+            coord_x_local     = EXCLUDED.coord_x_local,
+            coord_y_local     = EXCLUDED.coord_y_local,
+            source            = EXCLUDED.source,
+            precision         = EXCLUDED.precision,
+            estimation_code   = EXCLUDED.estimation_code,
+            count             = EXCLUDED.count,
+            atlas_code        = EXCLUDED.atlas_code,
+            altitude          = EXCLUDED.altitude,
+            project_code      = EXCLUDED.project_code,
+            hidden            = EXCLUDED.hidden,
+            admin_hidden      = EXCLUDED.admin_hidden,
+            observer_uid      = EXCLUDED.observer_uid,
+            details           = EXCLUDED.details,
+            behaviours        = EXCLUDED.behaviours,
+            comment           = EXCLUDED.comment,
+            hidden_comment    = EXCLUDED.hidden_comment,
+            confirmed_by      = EXCLUDED.confirmed_by,
+            mortality         = EXCLUDED.mortality,
+            death_cause2      = EXCLUDED.death_cause2,
+            insert_date       = EXCLUDED.insert_date,
+            update_date       = EXCLUDED.update_date;
     END IF;
+    RETURN NULL;
 END;
 $$
 LANGUAGE plpgsql;
 
 DROP TRIGGER IF EXISTS observations_trigger ON {{ db_schema_import }}.observations_json;
-CREATE TRIGGER observations_trigger
-AFTER INSERT OR UPDATE OR DELETE ON {{ db_schema_import }}.observations_json
-    FOR EACH ROW EXECUTE PROCEDURE update_observations();
-
+CREATE TRIGGER observations_insert_trigger
+AFTER INSERT ON {{ db_schema_import }}.observations_json
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE update_observations();
+CREATE TRIGGER observations_update_trigger
+AFTER UPDATE ON {{ db_schema_import }}.observations_json
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE update_observations();
+CREATE TRIGGER observations_delete_trigger
+AFTER DELETE ON {{ db_schema_import }}.observations_json
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE update_observations();
+
+
+-- Set-based refresh of observations from observations_json, used instead of
+-- observations triggers after bulk loads, with the triggers disabled:
+--   - delete observations no longer in observations_json
+--   - insert or update observations with update_ts >= p_since
+-- p_site NULL refreshes all sites. Returns the count of rows inserted or updated.
+-- Columns must be extracted as in update_observations.
+CREATE OR REPLACE FUNCTION refresh_observations(
+    p_site TEXT,
+    p_since BIGINT DEFAULT 0
+    ) RETURNS BIGINT AS $$
+    DECLARE nb_rows BIGINT;
+    BEGIN
+    DELETE FROM {{ db_schema_vn }}.observations AS o
+        WHERE (p_site IS NULL OR o.site = p_site)
+            AND NOT EXISTS (SELECT 1 FROM {{ db_schema_import }}.observations_json AS j
+                            WHERE j.id = o.id_sighting AND j.site = o.site);
+
+    INSERT INTO {{ db_schema_vn }}.observations (site, id_sighting, id_universal, uuid, id_form_universal,
+                                     id_species, taxonomy, date, date_year, timing, id_place, place,
+                                     coord_lat, coord_lon, coord_x_local, coord_y_local, precision, source, estimation_code,
+                                     count, atlas_code, altitude, project_code, hidden, admin_hidden, observer_uid, details,
+                                     behaviours, comment, hidden_comment, confirmed_by, mortality, death_cause2, insert_date, update_date)
+        SELECT
+            j.site,
+            j.id,
+            ((j.item -> 'observers') -> 0) ->> 'id_universal',
+            ((j.item -> 'observers') -> 0) ->> 'uuid',
+            j.id_form_universal,
+            CAST(j.item #>> '{species,@id}' AS INTEGER),
+            CAST(j.item #>> '{species,taxonomy}' AS INTEGER),
+            to_timestamp(CAST(j.item #>> '{date,@timestamp}' AS DOUBLE PRECISION)),
+            CAST(extract(year from to_timestamp(CAST(j.item #>> '{date,@timestamp}' AS DOUBLE PRECISION))) AS INTEGER),
+            to_timestamp(CAST(((j.item -> 'observers') -> 0) #>> '{timing,@timestamp}' AS DOUBLE PRECISION)),
+            CAST(j.item #>> '{place,@id}' AS INTEGER),
+            j.item #>> '{place,name}',
+            CAST(((j.item -> 'observers') -> 0) ->> 'coord_lat' AS FLOAT),
+            CAST(((j.item -> 'observers') -> 0) ->> 'coord_lon' AS FLOAT),
+            CAST(((j.item -> 'observers') -> 0) ->> 'coord_x_local' AS FLOAT),
+            CAST(((j.item -> 'observers') -> 0) ->> 'coord_y_local' AS FLOAT),
+            ((j.item -> 'observers') -> 0) ->> 'precision',
+            ((j.item -> 'observers') -> 0) ->> 'source',
+            ((j.item -> 'observers') -> 0) ->> 'estimation_code',
+            CAST(((j.item -> 'observers') -> 0) ->> 'count' AS INTEGER),
+            CAST(((j.item -> 'observers') -> 0) ->> 'atlas_code' AS INTEGER),
+            CAST(((j.item -> 'observers') -> 0) ->> 'altitude' AS INTEGER),
+            ((j.item -> 'observers') -> 0) ->> 'project_code',
+            CAST(((j.item -> 'observers') -> 0) ->> 'hidden' AS BOOLEAN),
+            CAST(((j.item -> 'observers') -> 0) ->> 'admin_hidden' AS BOOLEAN),
+            CAST(((j.item -> 'observers') -> 0) ->> '@uid' AS INTEGER),
+            ((j.item -> 'observers') -> 0) ->> 'details',
+            {{ db_schema_vn }}.behaviour_array(((j.item -> 'observers') -> 0) -> 'behaviours'),
+            ((j.item -> 'observers') -> 0) ->> 'comment',
+            ((j.item -> 'observers') -> 0) ->> 'hidden_comment',
+            ((j.item -> 'observers') -> 0) ->> 'confirmed_by',
+            CAST(((((j.item -> 'observers') -> 0) #>> '{extended_info,mortality}'::text []) is not null) as BOOLEAN),
+            ((j.item -> 'observers') -> 0) #>> '{extended_info, mortality, death_cause2}',
+            to_timestamp(CAST(((j.item -> 'observers') -> 0) ->> 'insert_date' AS DOUBLE PRECISION)),
+            to_timestamp(j.update_ts)
+        FROM {{ db_schema_import }}.observations_json AS j
+        WHERE (p_site IS NULL OR j.site = p_site) AND j.update_ts >= p_since
+    ON CONFLICT (site, id_sighting) DO UPDATE SET
+        id_universal      = EXCLUDED.id_universal,
+        uuid              = EXCLUDED.uuid,
+        id_form_universal = EXCLUDED.id_form_universal,
+        id_species        = EXCLUDED.id_species,
+        taxonomy          = EXCLUDED.taxonomy,
+        "date"            = EXCLUDED."date",
+        date_year         = EXCLUDED.date_year,
+        timing            = EXCLUDED.timing,
+        id_place          = EXCLUDED.id_place,
+        place             = EXCLUDED.place,
+        coord_lat         = EXCLUDED.coord_lat,
+        coord_lon         = EXCLUDED.coord_lon,
+        coord_x_local     = EXCLUDED.coord_x_local,
+        coord_y_local     = EXCLUDED.coord_y_local,
+        precision         = EXCLUDED.precision,
+        source            = EXCLUDED.source,
+        estimation_code   = EXCLUDED.estimation_code,
+        count             = EXCLUDED.count,
+        atlas_code        = EXCLUDED.atlas_code,
+        altitude          = EXCLUDED.altitude,
+        project_code      = EXCLUDED.project_code,
+        hidden            = EXCLUDED.hidden,
+        admin_hidden      = EXCLUDED.admin_hidden,
+        observer_uid      = EXCLUDED.observer_uid,
+        details           = EXCLUDED.details,
+        behaviours        = EXCLUDED.behaviours,
+        comment           = EXCLUDED.comment,
+        hidden_comment    = EXCLUDED.hidden_comment,
+        confirmed_by      = EXCLUDED.confirmed_by,
+        mortality         = EXCLUDED.mortality,
+        death_cause2      = EXCLUDED.death_cause2,
+        insert_date       = EXCLUDED.insert_date,
+        update_date       = EXCLUDED.update_date;
+    GET DIAGNOSTICS nb_rows = ROW_COUNT;
+    RETURN nb_rows;
+END;
+$$
+LANGUAGE plpgsql;
 
 ------------
 -- Observers
@@ -969,90 +1008,69 @@ CREATE TRIGGER trg_geom BEFORE INSERT or UPDATE
     EXECUTE PROCEDURE update_geom_triggerfn();
 
 CREATE OR REPLACE FUNCTION update_places() RETURNS TRIGGER AS $$
+    -- Statement level trigger: all rows of the statement are in transition tables
     BEGIN
     IF (TG_OP = 'DELETE') THEN
         -- Deleting data when JSON data is deleted
-        DELETE FROM {{ db_schema_vn }}.places
-            WHERE id = OLD.id AND site = OLD.site;
-        IF NOT FOUND THEN
-            RETURN NULL;
-        END IF;
-        RETURN OLD;
+        DELETE FROM {{ db_schema_vn }}.places AS t
+            USING old_rows AS o
+            WHERE t.id = o.id AND t.site = o.site;
 
-    ELSIF (TG_OP = 'UPDATE') THEN
-        -- Updating or inserting data when JSON data is updated
-        UPDATE {{ db_schema_vn }}.places SET
-            id_commune    = CAST(NEW.item->>'id_commune' AS INTEGER),
-            id_region     = CAST(NEW.item->>'id_region' AS INTEGER),
-            name          = NEW.item->>'name',
-            is_private    = CAST(NEW.item->>'is_private' AS BOOLEAN),
-            loc_precision = CAST(NEW.item->>'loc_precision' AS INTEGER),
-            altitude      = CAST(NEW.item->>'altitude' AS INTEGER),
-            place_type    = NEW.item->>'place_type',
-            wkt           = NEW.item->>'wkt',
-            visible       = CAST(NEW.item->>'visible' AS BOOLEAN),
-            coord_lat     = CAST(NEW.item->>'coord_lat' AS FLOAT),
-            coord_lon     = CAST(NEW.item->>'coord_lon' AS FLOAT),
-            coord_x_local = CAST(NEW.item->>'coord_x_local' AS FLOAT),
-            coord_y_local = CAST(NEW.item->>'coord_y_local' AS FLOAT)
-        WHERE id = OLD.id AND site = OLD.site ;
-        IF NOT FOUND THEN
-            -- Inserting data in new row, usually after table re-creation
-            INSERT INTO {{ db_schema_vn }}.places(site, id, id_commune, id_region, name, is_private,
-                                               loc_precision, altitude, place_type, wkt, visible,
-                                               coord_lat, coord_lon, coord_x_local, coord_y_local)
-            VALUES (
-                NEW.site,
-                NEW.id,
-                CAST(NEW.item->>'id_commune' AS INTEGER),
-                CAST(NEW.item->>'id_region' AS INTEGER),
-                NEW.item->>'name',
-                CAST(NEW.item->>'is_private' AS BOOLEAN),
-                CAST(NEW.item->>'loc_precision' AS INTEGER),
-                CAST(NEW.item->>'altitude' AS INTEGER),
-                NEW.item->>'place_type',
-                NEW.item->>'wkt',
-                CAST(NEW.item->>'visible' AS BOOLEAN),
-                CAST(NEW.item->>'coord_lat' AS FLOAT),
-                CAST(NEW.item->>'coord_lon' AS FLOAT),
-                CAST(NEW.item->>'coord_x_local' AS FLOAT),
-                CAST(NEW.item->>'coord_y_local' AS FLOAT)
-            );
-            END IF;
-        RETURN NEW;
-
-    ELSIF (TG_OP = 'INSERT') THEN
-        -- Inserting data on src_vn.observations when raw data is inserted
+    ELSE
+        -- Inserting or updating data when JSON data is inserted or updated
         INSERT INTO {{ db_schema_vn }}.places(site, id, id_commune, id_region, name, is_private,
-                                           loc_precision, altitude, place_type, wkt, visible,
-                                           coord_lat, coord_lon, coord_x_local, coord_y_local)
-        VALUES (
-            NEW.site,
-            NEW.id,
-            CAST(NEW.item->>'id_commune' AS INTEGER),
-            CAST(NEW.item->>'id_region' AS INTEGER),
-            NEW.item->>'name',
-            CAST(NEW.item->>'is_private' AS BOOLEAN),
-            CAST(NEW.item->>'loc_precision' AS INTEGER),
-            CAST(NEW.item->>'altitude' AS INTEGER),
-            NEW.item->>'place_type',
-            NEW.item->>'wkt',
-            CAST(NEW.item->>'visible' AS BOOLEAN),
-            CAST(NEW.item->>'coord_lat' AS FLOAT),
-            CAST(NEW.item->>'coord_lon' AS FLOAT),
-            CAST(NEW.item->>'coord_x_local' AS FLOAT),
-            CAST(NEW.item->>'coord_y_local' AS FLOAT)
-        );
-        RETURN NEW;
+                                              loc_precision, altitude, place_type, wkt, visible,
+                                              coord_lat, coord_lon, coord_x_local, coord_y_local)
+        SELECT
+            n.site,
+            n.id,
+            CAST(n.item->>'id_commune' AS INTEGER),
+            CAST(n.item->>'id_region' AS INTEGER),
+            n.item->>'name',
+            CAST(n.item->>'is_private' AS BOOLEAN),
+            CAST(n.item->>'loc_precision' AS INTEGER),
+            CAST(n.item->>'altitude' AS INTEGER),
+            n.item->>'place_type',
+            n.item->>'wkt',
+            CAST(n.item->>'visible' AS BOOLEAN),
+            CAST(n.item->>'coord_lat' AS FLOAT),
+            CAST(n.item->>'coord_lon' AS FLOAT),
+            CAST(n.item->>'coord_x_local' AS FLOAT),
+            CAST(n.item->>'coord_y_local' AS FLOAT)
+        FROM new_rows AS n
+        ON CONFLICT (site, id) DO UPDATE SET
+            id_commune    = EXCLUDED.id_commune,
+            id_region     = EXCLUDED.id_region,
+            name          = EXCLUDED.name,
+            is_private    = EXCLUDED.is_private,
+            loc_precision = EXCLUDED.loc_precision,
+            altitude      = EXCLUDED.altitude,
+            place_type    = EXCLUDED.place_type,
+            wkt           = EXCLUDED.wkt,
+            visible       = EXCLUDED.visible,
+            coord_lat     = EXCLUDED.coord_lat,
+            coord_lon     = EXCLUDED.coord_lon,
+            coord_x_local = EXCLUDED.coord_x_local,
+            coord_y_local = EXCLUDED.coord_y_local;
     END IF;
+    RETURN NULL;
 END;
 $$
 LANGUAGE plpgsql;
 
 DROP TRIGGER IF EXISTS places_trigger ON {{ db_schema_import }}.places_json;
-CREATE TRIGGER places_trigger
-AFTER INSERT OR UPDATE OR DELETE ON {{ db_schema_import }}.places_json
-    FOR EACH ROW EXECUTE PROCEDURE {{ db_schema_vn }}.update_places();
+CREATE TRIGGER places_insert_trigger
+AFTER INSERT ON {{ db_schema_import }}.places_json
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE {{ db_schema_vn }}.update_places();
+CREATE TRIGGER places_update_trigger
+AFTER UPDATE ON {{ db_schema_import }}.places_json
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE {{ db_schema_vn }}.update_places();
+CREATE TRIGGER places_delete_trigger
+AFTER DELETE ON {{ db_schema_import }}.places_json
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE {{ db_schema_vn }}.update_places();
 
 
 ----------
@@ -1394,7 +1412,7 @@ UPDATE {{ db_schema_import }}.forms_json SET site=site;
 UPDATE {{ db_schema_import }}.local_admin_units_json SET site=site;
 UPDATE {{ db_schema_import }}.places_json SET site=site;
 UPDATE {{ db_schema_import }}.observers_json SET site=site;
-UPDATE {{ db_schema_import }}.observations_json SET site=site;
+SELECT {{ db_schema_vn }}.refresh_observations(NULL);
 UPDATE {{ db_schema_import }}.species_json SET site=site;
 UPDATE {{ db_schema_import }}.taxo_groups_json SET site=site;
 UPDATE {{ db_schema_import }}.territorial_units_json SET site=site;
@@ -4,6 +4,11 @@
 Methods
 
 - store_data      - Store generic data structure to file
+- database_url    - Return the URL of a database
+- get_engine      - Return the SQLAlchemy engine shared by all stores of a database
+- get_metadata    - Return the tables of a schema, reflected once by process
+- get_log_writer  - Return the download_log writer shared by all stores of a database
+- dispose_engines - Close all shared engines
 
 Properties
 
@@ -11,9 +16,14 @@ Properties
 
 """
 
+import csv
+import io
+import json
 import logging
-from datetime import date
+import threading
+from datetime import date, datetime
 
+import numpy as np
 from pyproj import Transformer
 from sqlalchemy import (
     BigInteger,
@@ -24,13 +34,15 @@ from sqlalchemy import (
     PrimaryKeyConstraint,
     String,
     Table,
+    any_,
+    bindparam,
     create_engine,
     exc,
     func,
     select,
     text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
 from sqlalchemy.engine.url import URL
 from sqlalchemy.sql import and_
 
@@ -38,11 +50,241 @@ from . import __version__
 
 logger = logging.getLogger(__name__)
 
+# Statement level triggers updating observations column table, from create-vn-tables.sql
+_OBSERVATIONS_TRIGGERS = ("observations_insert_trigger", "observations_update_trigger", "observations_delete_trigger")
+
+
+# Engines shared by all Postgresql instances of the process, by database URL
+_engines = {}
+# Tables reflected by the process, by database URL and schema
+_metadatas = {}
+# download_log writers shared by all stores of the process, by database URL and schema
+_log_writers = {}
+_engines_lock = threading.Lock()
+
+
+def database_url(db_user: str, db_pw: str, db_host: str, db_port: str, db_name: str) -> URL:
+    """Return the URL of a database.
+
+    Parameters
+    ----------
+    db_user : str
+        Database user.
+    db_pw : str
+        Database password.
+    db_host : str
+        Database host.
+    db_port : str
+        Database port.
+    db_name : str
+        Database name.
+
+    Returns
+    -------
+    URL
+        Database URL, using psycopg2 driver.
+    """
+    return URL.create(
+        drivername="postgresql+psycopg2",
+        username=db_user,
+        password=db_pw,
+        host=db_host,
+        port=db_port,
+        database=db_name,
+    )
+
+
+def get_engine(url: URL, pool_size: int = 5):
+    """Return the SQLAlchemy engine shared by all stores of a database.
+
+    The engine is created on first call and reused afterwards, so that
+    all controlers, of all sites, share the same connection pool.
+    Parameters are only used when the engine is created.
+
+    Parameters
+    ----------
+    url : URL
+        Database URL, used as engine key.
+    pool_size : int
+        Number of connections kept open in the pool.
+
+    Returns
+    -------
+    Engine
+        Engine shared by all stores of this database.
+    """
+    with _engines_lock:
+        if url not in _engines:
+            logger.debug(_("Creating database engine for %s, pool size %d"), url.database, pool_size)
+            _engines[url] = create_engine(url, echo=False, future=True, pool_size=pool_size)
+        return _engines[url]
+
+
+def get_metadata(url: URL, schema: str) -> MetaData:
+    """Return the tables of a database schema, shared by all stores of the process.
+
+    Tables are reflected on first call only, as reflection queries the
+    database catalog for each table.
+
+    Parameters
+    ----------
+    url : URL
+        Database URL.
+    schema : str
+        Schema to reflect.
+
+    Returns
+    -------
+    MetaData
+        Tables of the schema, which must not be modified.
+    """
+    engine = get_engine(url)
+    with _engines_lock:
+        if (url, schema) not in _metadatas:
+            logger.debug(_("Reflecting tables of schema %s"), schema)
+            metadata = MetaData(schema=schema)
+            metadata.reflect(bind=engine, schema=schema)
+            _metadatas[(url, schema)] = metadata
+        return _metadatas[(url, schema)]
+
+
+def get_log_writer(url: URL, schema: str, flush_interval: float = 10, flush_size: int = 1000):
+    """Return the download_log writer shared by all stores of a database.
+
+    The writer is created on first call and reused afterwards.
+    Parameters are only used when the writer is created.
+
+    Parameters
+    ----------
+    url : URL
+        Database URL.
+    schema : str
+        Schema of download_log table.
+    flush_interval : float
+        Maximum delay before entries are written, in seconds.
+    flush_size : int
+        Number of entries written as soon as they are buffered.
+
+    Returns
+    -------
+    DownloadLogWriter
+        Writer shared by all stores of this database.
+    """
+    table = get_metadata(url, schema).tables[schema + ".download_log"]
+    engine = get_engine(url)
+    with _engines_lock:
+        if (url, schema) not in _log_writers:
+            _log_writers[(url, schema)] = DownloadLogWriter(engine, table, flush_interval, flush_size)
+        return _log_writers[(url, schema)]
+
+
+def _clear_metadata():
+    """Forget reflected tables, after tables are created or dropped."""
+    with _engines_lock:
+        _metadatas.clear()
+
+
+def dispose_engines():
+    """Close all shared engines and their connection pools."""
+    with _engines_lock:
+        # Write remaining log entries before closing connections
+        for writer in _log_writers.values():
+            writer.close()
+        _log_writers.clear()
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _metadatas.clear()
+
 
 class StorePostgresqlException(Exception):
     """An exception occurred while handling download or store."""
 
 
+class DownloadLogWriter:
+    """Write download_log entries in the background, in multi-row inserts.
+
+    Entries are buffered and written by a background thread, every
+    flush_interval seconds or as soon as flush_size entries are buffered,
+    so that logging does not add a commit to each API request.
+    """
+
+    def __init__(self, engine, table, flush_interval: float = 10, flush_size: int = 1000):
+        """Start the background thread.
+
+        Parameters
+        ----------
+        engine : Engine
+            Engine used to write entries, with its own connections.
+        table : Table
+            download_log table.
+        flush_interval : float
+            Maximum delay before entries are written, in seconds.
+        flush_size : int
+            Number of entries written as soon as they are buffered.
+        """
+        self._engine = engine
+        self._table = table
+        self._flush_interval = flush_interval
+        self._flush_size = flush_size
+        self._rows = []
+        self._closed = False
+        self._cond = threading.Condition()
+        # Only one flush at a time, so that flush returns when all entries are written
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="download_log", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Write entries when flush_interval expires or flush_size is reached, until closed."""
+        closed = False
+        while not closed:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._rows) >= self._flush_size,
+                    timeout=self._flush_interval,
+                )
+                closed = self._closed
+            self.flush()
+
+    def write(self, row: dict) -> None:
+        """Buffer a log entry.
+
+        Parameters
+        ----------
+        row : dict
+            Values of download_log columns.
+        """
+        with self._cond:
+            self._rows.append(row)
+            if len(self._rows) >= self._flush_size:
+                self._cond.notify()
+
+    def flush(self) -> None:
+        """Write all buffered entries, in a single transaction.
+
+        Errors are logged and the entries dropped, as download_log is only informative.
+        """
+        with self._flush_lock:
+            with self._cond:
+                rows, self._rows = self._rows, []
+            if len(rows) == 0:
+                return
+            logger.debug(_("Writing %d download_log entries"), len(rows))
+            try:
+                with self._engine.begin() as conn:
+                    conn.execute(self._table.insert(), rows)
+            except exc.SQLAlchemyError:
+                logger.exception(_("Error writing %d download_log entries, ignored"), len(rows))
+
+    def close(self) -> None:
+        """Write remaining entries and stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+
 class ObservationItem:
     """Properties of an observation, for writing to DB."""
 
@@ -58,7 +300,8 @@ class ObservationItem:
         conn :
             sqlalchemy connection to database
         transformer :
-            pyproj transformer used to create local coordinates
+            pyproj transformer used to create local coordinates,
+            or None if elem is already reprojected
         elem : dict
             Single observation to process and store.
         form : str
@@ -118,8 +361,39 @@ def store_1_observation(item):
     """
     # Insert simple sightings,
     # each row contains id, update timestamp and full json body
+    row = observation_row(item)
+    logger.debug(_("Storing observation %s to database"), row["id"])
+
+    # Store in Postgresql
+    metadata = item.metadata
+    insert_stmt = insert(metadata).values(**row)
+    do_update_stmt = insert_stmt.on_conflict_do_update(
+        constraint=metadata.primary_key,
+        set_=dict(update_ts=row["update_ts"], item=row["item"], id_form_universal=row["id_form_universal"]),  # noqa: C408
+        where=(metadata.c.update_ts < row["update_ts"]),
+    )
+
+    item.conn.execute(do_update_stmt)
+    return None
+
+
+def observation_row(item):
+    """Prepare the observations_json row of a single observation.
+
+    - find insert or update date
+    - add x, y transform to local coordinates, unless already reprojected
+
+    Parameters
+    ----------
+    item : ObservationItem
+        Observation item containing all parameters.
+
+    Returns
+    -------
+    dict
+        Column values: id, site, update_ts, id_form_universal and item.
+    """
     elem = item.elem
-    logger.debug(_("Storing observation %s to database"), elem["observers"][0]["id_sighting"])
     # Find last update timestamp
     if "update_date" in elem["observers"][0]:
         # update_date = elem['observers'][0]['update_date']['@timestamp']
@@ -129,29 +403,19 @@ def store_1_observation(item):
         update_date = elem["observers"][0]["insert_date"]
 
     # Add Lambert x, y transform to local coordinates
-    (
-        elem["observers"][0]["coord_x_local"],
-        elem["observers"][0]["coord_y_local"],
-    ) = item.transformer(elem["observers"][0]["coord_lon"], elem["observers"][0]["coord_lat"])
-
-    # Store in Postgresql
-    metadata = item.metadata
-    site = item.site
-    insert_stmt = insert(metadata).values(
-        id=elem["observers"][0]["id_sighting"],
-        site=site,
-        update_ts=update_date,
-        id_form_universal=item.form,
-        item=elem,
-    )
-    do_update_stmt = insert_stmt.on_conflict_do_update(
-        constraint=metadata.primary_key,
-        set_=dict(update_ts=update_date, item=elem, id_form_universal=item.form),  # noqa: C408
-        where=(metadata.c.update_ts < update_date),
-    )
+    if item.transformer is not None:
+        (
+            elem["observers"][0]["coord_x_local"],
+            elem["observers"][0]["coord_y_local"],
+        ) = item.transformer(elem["observers"][0]["coord_lon"], elem["observers"][0]["coord_lat"])
 
-    item.conn.execute(do_update_stmt)
-    return None
+    return {
+        "id": elem["observers"][0]["id_sighting"],
+        "site": item.site,
+        "update_ts": update_date,
+        "id_form_universal": item.form,
+        "item": elem,
+    }
 
 
 class PostgresqlUtils:
@@ -475,6 +739,7 @@ class PostgresqlUtils:
 
             conn.close()
             db.dispose()
+            _clear_metadata()
 
         return None
 
@@ -545,6 +810,7 @@ class PostgresqlUtils:
             self._create_validations_json()
 
             self._db.dispose()
+            _clear_metadata()
 
         return None
 
@@ -628,6 +894,110 @@ class PostgresqlUtils:
 
         return result
 
+    def _connect_engine(self):
+        """Create an engine to the database."""
+        logger.info(_("Connecting to database %s"), self._db_name)
+        return create_engine(
+            database_url(self._db_user, self._db_pw, self._db_host, self._db_port, self._db_name),
+            echo=False,
+            future=True,
+        )
+
+    def disable_col_triggers(self, sites):
+        """Disable the triggers updating observations column table.
+
+        Used before bulk loads of observations_json, that must be followed
+        by refresh_col_tables for each site.
+        Triggers are disabled for all sites stored in the database, while only
+        the sites loaded in bulk are refreshed. So they are kept if other sites
+        were downloaded in the database, as found in increment_log.
+        No other process must store observations of other sites until refreshed.
+
+        Parameters
+        ----------
+        sites : list of str
+            VisioNature sites loaded in bulk, then refreshed.
+
+        Returns
+        -------
+        bool
+            True if the triggers were disabled, False if the column based
+            tables do not exist or other sites are stored.
+        """
+        disabled = False
+        if self._db_enabled:
+            db = self._connect_engine()
+            with db.begin() as conn:
+                triggers = conn.execute(
+                    text("SELECT tgname FROM pg_trigger WHERE tgname = ANY(:names) AND tgrelid = to_regclass(:table)"),
+                    {"names": list(_OBSERVATIONS_TRIGGERS), "table": self._db_schema_import + ".observations_json"},
+                ).all()
+                if len(triggers) < len(_OBSERVATIONS_TRIGGERS):
+                    logger.warning(_("Column based tables not found, keeping triggers"))
+                else:
+                    other_sites = (
+                        conn
+                        .execute(
+                            text(
+                                f"SELECT DISTINCT site FROM {self._db_schema_import}.increment_log "  # noqa: S608
+                                "WHERE site <> ALL(:sites) ORDER BY site"
+                            ),
+                            {"sites": list(sites)},
+                        )
+                        .scalars()
+                        .all()
+                    )
+                    if len(other_sites) > 0:
+                        logger.warning(
+                            _("Observations of other sites %s are stored in database, keeping triggers"),
+                            ", ".join(other_sites),
+                        )
+                    else:
+                        logger.info(_("Disabling observations triggers"))
+                        for trigger in _OBSERVATIONS_TRIGGERS:
+                            conn.execute(
+                                text(
+                                    f"ALTER TABLE {self._db_schema_import}.observations_json DISABLE TRIGGER {trigger}"
+                                )
+                            )
+                        disabled = True
+            db.dispose()
+        return disabled
+
+    def refresh_col_tables(self, site, since=0):
+        """Enable the triggers and refresh observations column table, set-based.
+
+        Parameters
+        ----------
+        site : str
+            VisioNature site to refresh.
+        since : int
+            Only observations updated since this timestamp are refreshed.
+            Deleted observations are always removed.
+
+        Returns
+        -------
+        int
+            Count of observations inserted or updated.
+        """
+        nb_rows = 0
+        if self._db_enabled:
+            db = self._connect_engine()
+            with db.begin() as conn:
+                logger.info(_("Enabling observations triggers"))
+                for trigger in _OBSERVATIONS_TRIGGERS:
+                    conn.execute(
+                        text(f"ALTER TABLE {self._db_schema_import}.observations_json ENABLE TRIGGER {trigger}")
+                    )
+                logger.info(_("Refreshing observations of site %s, updated since %s"), site, since)
+                nb_rows = conn.execute(
+                    text(f"SELECT {self._db_schema_vn}.refresh_observations(:site, :since)"),
+                    {"site": site, "since": since},
+                ).scalar()
+            db.dispose()
+            logger.info(_("Refreshed %d observations"), nb_rows)
+        return nb_rows
+
 
 class Postgresql:
     """Provides common access Postgresql database."""
@@ -660,25 +1030,17 @@ class Postgresql:
 
         if self._db_enabled:
             # Initialize interface to Postgresql DB
-            db_url = {
-                "drivername": "postgresql+psycopg2",
-                "username": self._db_user,
-                "password": self._db_pw,
-                "host": self._db_host,
-                "port": self._db_port,
-                "database": self._db_name,
-            }
-
+            db_url = database_url(self._db_user, self._db_pw, self._db_host, self._db_port, self._db_name)
             dbschema = self._db_schema_import
-            self._metadata = MetaData(schema=dbschema)
             logger.info(_("Connecting to database %s"), self._db_name)
 
-            # Connect and set path to include VN import schema
-            self._db = create_engine(URL.create(**db_url), echo=False, future=True)
+            # Connect, using the engine shared by all stores of the process
+            self._db_url = db_url
+            self._db = get_engine(db_url)
             self._conn = self._db.connect()
 
-            # Get dbtable definition
-            self._metadata.reflect(bind=self._db, schema=dbschema)
+            # Get dbtable definition, reflected once by process
+            self._metadata = get_metadata(db_url, dbschema)
 
             # Map Biolovision tables in a single dict for easy reference
             self._table_defs = {
@@ -742,13 +1104,24 @@ class ReadPostgresql(Postgresql):
     # ----------------
     # External methods
     # ----------------
-    def read(self, controler):
+    def _select_items(self, controler, fields):
+        """Return the statement selecting items of the site, projected on fields if given."""
+        metadata = self._table_defs[controler]["metadata"]
+        item = metadata.c.item
+        if fields is not None:
+            # Only required keys are transferred from the database
+            item = func.jsonb_build_object(*[arg for key in fields for arg in (key, metadata.c.item[key])])
+        return select(item.label("item")).where(metadata.c.site == self._site)
+
+    def read(self, controler, fields=None):
         """Read items from database.
 
         Parameters
         ----------
         controler : str
             Name of API controler.
+        fields : list of str or None
+            If not None, keys of each item to read.
 
         Returns
         -------
@@ -761,20 +1134,190 @@ class ReadPostgresql(Postgresql):
             controler,
             self._site,
         )
-        metadata = self._table_defs[controler]["metadata"]
-        stmt = select(metadata.c.item).where(metadata.c.site == self._site)
-        result = self._conn.execute(stmt).fetchall()
+        result = self._conn.execute(self._select_items(controler, fields)).fetchall()
         # Release the transaction implicitly started by the SELECT
         self._conn.rollback()
         return result
 
+    def read_iter(self, controler, fields=None, yield_per=1000):
+        """Read items from database, one by one.
+
+        Items are streamed through a server-side cursor, yield_per rows at a
+        time, so that memory use does not depend on the number of items.
+
+        Parameters
+        ----------
+        controler : str
+            Name of API controler.
+        fields : list of str or None
+            If not None, keys of each item to read.
+        yield_per : int
+            Number of rows fetched from the server at a time.
+
+        Yields
+        ------
+        dict
+            Item read from table.
+        """
+        logger.info(
+            _("Streaming from %s of site %s"),
+            controler,
+            self._site,
+        )
+        try:
+            result = self._conn.execute(
+                self._select_items(controler, fields),
+                execution_options={"yield_per": yield_per},
+            )
+            yield from result.scalars()
+        finally:
+            # Close the cursor and release the transaction implicitly started by the SELECT
+            self._conn.rollback()
+
 
 class StorePostgresql(Postgresql):
     """Provides store to Postgresql database method."""
 
+    def __init__(
+        self,
+        site: str,
+        db_enabled: bool,
+        db_user: str,
+        db_pw: str,
+        db_host: str,
+        db_port: str,
+        db_name: str,
+        db_schema_import: str,
+        db_schema_vn: str,
+        db_group: str,
+        db_out_proj: str,
+        batch_size: int = 1000,
+        bulk_load: bool = False,
+        log_interval: float = 0,
+    ):
+        self._batch_size = batch_size
+        self._bulk_load = bulk_load
+        super().__init__(
+            site,
+            db_enabled,
+            db_user,
+            db_pw,
+            db_host,
+            db_port,
+            db_name,
+            db_schema_import,
+            db_schema_vn,
+            db_group,
+            db_out_proj,
+        )
+        # Write download_log entries in the background, if log_interval > 0
+        self._log_writer = None
+        if self._db_enabled and log_interval > 0:
+            self._log_writer = get_log_writer(self._db_url, self._db_schema_import, log_interval, batch_size)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Write buffered log entries and finalize connections."""
+        if self._log_writer is not None:
+            self._log_writer.flush()
+        super().__exit__(exc_type, exc_value, traceback)
+
     # ----------------
     # Internal methods
     # ----------------
+    def _upsert(self, metadata, rows, update_cols):
+        """Insert or update rows, in multi-row statements of batch_size rows.
+
+        Rows with the same id are merged, keeping the last one, as a single
+        statement cannot update the same row twice.
+
+        Parameters
+        ----------
+        metadata : Table
+            Table to insert into.
+        rows : list of dict
+            Column values of each row.
+        update_cols : list of str
+            Columns updated when the row already exists.
+        """
+        rows = list({str(row["id"]): row for row in rows}.values())
+        for i in range(0, len(rows), self._batch_size):
+            insert_stmt = insert(metadata).values(rows[i : i + self._batch_size])
+            do_update_stmt = insert_stmt.on_conflict_do_update(
+                constraint=metadata.primary_key,
+                set_={col: insert_stmt.excluded[col] for col in update_cols},
+            )
+            self._conn.execute(do_update_stmt)
+
+    def _copy_observations(self, metadata, rows):
+        """Bulk load observations, with COPY to a staging table and a single merge.
+
+        Rows are streamed as CSV to a temporary table, emptied at commit, then
+        merged into observations_json. As in store_1_observation, existing rows
+        are only updated by more recent observations.
+
+        Parameters
+        ----------
+        metadata : Table
+            observations_json table.
+        rows : list of dict
+            Column values of each observation, from observation_row.
+        """
+        stage = "observations_json_stage"
+        self._conn.execute(
+            text(
+                f"CREATE TEMPORARY TABLE IF NOT EXISTS {stage} "
+                f"(LIKE {metadata.fullname} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+        )
+        cols = ["id", "site", "update_ts", "id_form_universal", "item"]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                row["id"],
+                row["site"],
+                row["update_ts"],
+                row["id_form_universal"],
+                json.dumps(row["item"]),
+            ])
+        buffer.seek(0)
+        # COPY is run by the DBAPI connection, inside the current transaction
+        with self._conn.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {stage} ({', '.join(cols)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        # Keep the most recent version of observations received twice
+        self._conn.execute(
+            text(
+                f"INSERT INTO {metadata.fullname} ({', '.join(cols)}) "  # noqa: S608
+                f"SELECT DISTINCT ON (id) {', '.join(cols)} FROM {stage} ORDER BY id, update_ts DESC "
+                f"ON CONFLICT ON CONSTRAINT {metadata.primary_key.name} DO UPDATE "
+                "SET update_ts = EXCLUDED.update_ts, item = EXCLUDED.item, "
+                "id_form_universal = EXCLUDED.id_form_universal "
+                f"WHERE {metadata.name}.update_ts < EXCLUDED.update_ts"
+            )
+        )
+        self._conn.execute(text(f"TRUNCATE {stage}"))
+
+    def _reproject(self, elems, lon_key="coord_lon", lat_key="coord_lat"):
+        """Add local coordinates to elements, with a single transform call.
+
+        Parameters
+        ----------
+        elems : list of dict
+            Elements to reproject, updated with coord_x_local and coord_y_local.
+        lon_key : str
+            Key of the longitude in each element.
+        lat_key : str
+            Key of the latitude in each element.
+        """
+        if len(elems) == 0:
+            return
+        lon = np.array([elem[lon_key] for elem in elems], dtype=float)
+        lat = np.array([elem[lat_key] for elem in elems], dtype=float)
+        x_local, y_local = self._transformer.transform(lon, lat)
+        for elem, x, y in zip(elems, x_local.tolist(), y_local.tolist(), strict=True):
+            elem["coord_x_local"] = x
+            elem["coord_y_local"] = y
+
     def _store_simple(self, controler, items_dict):
         """Write items_dict to database.
 
@@ -794,7 +1337,7 @@ class StorePostgresql(Postgresql):
             Count of items stored (not exact for observations, due to forms).
         """
 
-        # Loop on data array to store each element to database
+        # Store data array to database, by batches
         logger.info(
             _("Storing %d items from %s of site %s"),
             len(items_dict["data"]),
@@ -802,15 +1345,11 @@ class StorePostgresql(Postgresql):
             self._site,
         )
         metadata = self._table_defs[controler]["metadata"]
-        for elem in items_dict["data"]:
-            # Convert to json
-            logger.debug(_("Storing element %s"), elem)
-            insert_stmt = insert(metadata).values(id=elem["id"], site=self._site, item=elem)
-            do_update_stmt = insert_stmt.on_conflict_do_update(
-                constraint=metadata.primary_key,
-                set_=dict(item=elem),  # noqa: C408
-            )
-            self._conn.execute(do_update_stmt)
+        self._upsert(
+            metadata,
+            [{"id": elem["id"], "site": self._site, "item": elem} for elem in items_dict["data"]],
+            ["item"],
+        )
 
         return len(items_dict["data"])
 
@@ -833,11 +1372,7 @@ class StorePostgresql(Postgresql):
             Count of items stored (not exact for observations, due to forms).
         """
 
-        # Loop on data array to reproject
-        for elem in items_dict["data"]:
-            elem["coord_x_local"], elem["coord_y_local"] = self._transformer.transform(
-                elem["coord_lon"], elem["coord_lat"]
-            )
+        self._reproject(items_dict["data"])
         return self._store_simple(controler, items_dict)
 
     def _store_fields(self, controler, items_dict):
@@ -859,31 +1394,27 @@ class StorePostgresql(Postgresql):
             Count of items stored (not exact for observations, due to forms).
         """
 
-        # Loop on data array to store each element to database
+        # Store data array to database, by batches
         logger.info(_("Storing %d items from %s"), len(items_dict["data"]), controler)
         metadata = self._table_defs[controler]["metadata"]
-        for elem in items_dict["data"]:
-            logger.debug(_("Storing element %s"), elem)
-            insert_stmt = insert(metadata).values(id=elem["id"], item=elem)
-            do_update_stmt = insert_stmt.on_conflict_do_update(
-                constraint=metadata.primary_key,
-                set_=dict(item=elem),  # noqa: C408
-            )
-            self._conn.execute(do_update_stmt)
+        self._upsert(
+            metadata,
+            [{"id": elem["id"], "item": elem} for elem in items_dict["data"]],
+            ["item"],
+        )
 
         return len(items_dict["data"])
 
-    def _store_form(self, items_dict, transformer):
+    def _store_form(self, items_dict):
         """Write forms to database.
 
         Check if forms is in database and either insert or update.
+        Local coordinates must already be added.
 
         Parameters
         ----------
         items_dict : dict
             Forms data to store.
-        transformer : Transformer.from_proj
-            Projection transformer for adding local coordinates
 
         Returns
         -------
@@ -899,12 +1430,6 @@ class StorePostgresql(Postgresql):
             self._site,
         )
 
-        # Add local coordinates
-        if ("lon" in items_dict) and ("lat" in items_dict):
-            items_dict["coord_x_local"], items_dict["coord_y_local"] = transformer(
-                items_dict["lon"], items_dict["lat"]
-            )
-
         # Convert to json
         logger.debug(_("Storing element %s"), items_dict)
         metadata = self._table_defs[controler]["metadata"]
@@ -917,6 +1442,21 @@ class StorePostgresql(Postgresql):
 
         return len(items_dict)
 
+    def _store_1_observation(self, item, staged):
+        """Store a single observation, or stage it for bulk load.
+
+        Parameters
+        ----------
+        item : ObservationItem
+            Observation item containing all parameters.
+        staged : list of dict or None
+            Rows to bulk load, or None to store immediately.
+        """
+        if staged is None:
+            store_1_observation(item)
+        else:
+            staged.append(observation_row(item))
+
     def _store_observation(self, controler, items_dict):
         """Iterate through observations or forms and store.
 
@@ -941,18 +1481,32 @@ class StorePostgresql(Postgresql):
         # Insert simple sightings, each row contains id, update timestamp and
         # full json body
         nb_obs = 0
+        staged = [] if self._bulk_load else None
+        # Add local coordinates to the whole page: sightings, in forms or not, and forms
+        forms = items_dict["data"].get("forms", [])
+        self._reproject(
+            [elem["observers"][0] for elem in items_dict["data"]["sightings"]]
+            + [elem["observers"][0] for form in forms if "@id" in form for elem in form.get("sightings", [])]
+            + [form["observers"][0] for form in forms if "@id" not in form]
+        )
+        self._reproject(
+            [form for form in forms if "@id" in form and "lon" in form and "lat" in form],
+            lon_key="lon",
+            lat_key="lat",
+        )
         logger.debug(_("Storing %d single observations"), len(items_dict["data"]["sightings"]))
         for i in range(0, len(items_dict["data"]["sightings"])):
             elem = items_dict["data"]["sightings"][i]
             # Write observation to database
-            store_1_observation(
+            self._store_1_observation(
                 ObservationItem(
                     self._site,
                     self._table_defs[controler]["metadata"],
                     self._conn,
-                    self._transformer.transform,
+                    None,
                     elem,
-                )
+                ),
+                staged,
             )
             nb_obs += 1
 
@@ -980,7 +1534,7 @@ class StorePostgresql(Postgresql):
                         else:
                             # Put everything except sightings in forms data
                             forms_data[k] = v
-                    self._store_form(forms_data, self._transformer.transform)
+                    self._store_form(forms_data)
 
                     # Second loop to store_sightings
                     for k, v in items_dict["data"]["forms"][f].items():
@@ -988,31 +1542,35 @@ class StorePostgresql(Postgresql):
                             nb_s = len(v)
                             logger.debug("Storing %d observations in form %d", nb_s, f)
                             for i in range(0, nb_s):
-                                store_1_observation(
+                                self._store_1_observation(
                                     ObservationItem(
                                         self._site,
                                         self._table_defs[controler]["metadata"],
                                         self._conn,
-                                        self._transformer.transform,
+                                        None,
                                         v[i],
                                         id_form_universal,
-                                    )
+                                    ),
+                                    staged,
                                 )
                                 nb_obs += 1
 
                 else:
                     # It's not a form, store it as a sighting
-                    store_1_observation(
+                    self._store_1_observation(
                         ObservationItem(
                             self._site,
                             self._table_defs[controler]["metadata"],
                             self._conn,
-                            self._transformer.transform,
+                            None,
                             items_dict["data"]["forms"][f],
                             None,
-                        )
+                        ),
+                        staged,
                     )
 
+        if staged:
+            self._copy_observations(self._table_defs[controler]["metadata"], staged)
         logger.debug(_("Stored %d observations or forms to database"), nb_obs)
         return nb_obs
 
@@ -1035,27 +1593,21 @@ class StorePostgresql(Postgresql):
             Count of items stored (not exact for observations, due to forms).
         """
 
-        # Loop on data array to store each element to database
+        # Store data array to database, by batches
         logger.info(
             _("Storing %d observers from site %s"),
             len(items_dict["data"]),
             self._site,
         )
         metadata = self._table_defs[controler]["metadata"]
-        for elem in items_dict["data"]:
-            # Convert to json
-            logger.debug(_("Storing element %s"), elem)
-            insert_stmt = insert(metadata).values(
-                id=elem["id"],
-                id_universal=elem["id_universal"],
-                site=self._site,
-                item=elem,
-            )
-            do_update_stmt = insert_stmt.on_conflict_do_update(
-                constraint=metadata.primary_key,
-                set_=dict(id_universal=elem["id_universal"], item=elem),  # noqa: C408
-            )
-            self._conn.execute(do_update_stmt)
+        self._upsert(
+            metadata,
+            [
+                {"id": elem["id"], "id_universal": elem["id_universal"], "site": self._site, "item": elem}
+                for elem in items_dict["data"]
+            ],
+            ["id_universal", "item"],
+        )
 
         return len(items_dict["data"])
 
@@ -1109,6 +1661,40 @@ class StorePostgresql(Postgresql):
 
         return nb_item
 
+    def _delete(self, table, id_list):
+        """Delete rows of this site, in statements of batch_size ids.
+
+        Parameters
+        ----------
+        table : Table
+            Table to delete from.
+        id_list : list
+            List of id to be deleted.
+
+        Returns
+        -------
+        int
+            Count of rows deleted.
+        """
+        nb_delete = 0
+        ids = [int(i) for i in id_list]
+        try:
+            for i in range(0, len(ids), self._batch_size):
+                nd = self._conn.execute(
+                    table.delete().where(
+                        and_(
+                            table.c.id == any_(bindparam("ids", ids[i : i + self._batch_size], type_=ARRAY(Integer))),
+                            table.c.site == self._site,
+                        )
+                    )
+                )
+                nb_delete += nd.rowcount
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        return nb_delete
+
     def delete_obs(self, obs_list):
         """Delete observations stored in database.
 
@@ -1126,23 +1712,7 @@ class StorePostgresql(Postgresql):
         # Store to database, if enabled
         if self._db_enabled:
             logger.info(_("Deleting %d observations from database"), len(obs_list))
-            nb_delete = 0
-            obs_table = self._table_defs["observations"]["metadata"]
-            try:
-                for obs in obs_list:
-                    nd = self._conn.execute(
-                        obs_table.delete().where(
-                            and_(
-                                obs_table.c.id == obs,
-                                obs_table.c.site == self._site,
-                            )
-                        )
-                    )
-                    nb_delete += nd.rowcount
-                self._conn.commit()
-            except Exception:
-                self._conn.rollback()
-                raise
+            nb_delete = self._delete(self._table_defs["observations"]["metadata"], obs_list)
 
         return nb_delete
 
@@ -1163,23 +1733,7 @@ class StorePostgresql(Postgresql):
         # Store to database, if enabled
         if self._db_enabled:
             logger.info(_("Deleting %d places from database"), len(place_list))
-            nb_delete = 0
-            place_table = self._table_defs["places"]["metadata"]
-            try:
-                for obs in place_list:
-                    nd = self._conn.execute(
-                        place_table.delete().where(
-                            and_(
-                                place_table.c.id == obs,
-                                place_table.c.site == self._site,
-                            )
-                        )
-                    )
-                    nb_delete += nd.rowcount
-                self._conn.commit()
-            except Exception:
-                self._conn.rollback()
-                raise
+            nb_delete = self._delete(self._table_defs["places"]["metadata"], place_list)
 
         return nb_delete
 
@@ -1195,6 +1749,9 @@ class StorePostgresql(Postgresql):
     ):
         """Write download log entries to database.
 
+        If log_interval was given, entries are written later by the shared
+        background writer, else immediately.
+
         Parameters
         ----------
         site : str
@@ -1213,7 +1770,19 @@ class StorePostgresql(Postgresql):
             Optional duration of data transfer, in ms
         """
         # Store to database, if enabled
-        if self._db_enabled:
+        if self._log_writer is not None:
+            # Written later, with other entries
+            self._log_writer.write({
+                "site": site,
+                "controler": controler,
+                "download_ts": datetime.now(),
+                "error_count": error_count,
+                "http_status": http_status,
+                "comment": comment,
+                "length": length,
+                "duration": duration,
+            })
+        elif self._db_enabled:
             metadata = self._metadata.tables[self._db_schema_import + "." + "download_log"]
             stmt = metadata.insert().values(
                 site=site,
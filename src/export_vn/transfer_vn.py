@@ -24,7 +24,7 @@ import psutil
 import requests
 import yappi
 from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_SUBMITTED
-from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.executors.pool import ProcessPoolExecutor, ThreadPoolExecutor
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers import SchedulerNotRunningError
@@ -35,6 +35,12 @@ from jinja2 import Environment, PackageLoader
 from pytz import utc
 from tabulate import tabulate
 
+from biolovision.api import (
+    close_sessions,
+    get_circuit_breaker,
+    get_rate_limiter,
+    get_session,
+)
 from export_vn.download_vn import (
     Entities,
     Families,
@@ -47,10 +53,11 @@ from export_vn.download_vn import (
     TaxoGroup,
     TerritorialUnits,
     Validations,
+    set_reference_ttl,
 )
 from export_vn.store_all import StoreAll
 from export_vn.store_file import StoreFile
-from export_vn.store_postgresql import PostgresqlUtils, StorePostgresql
+from export_vn.store_postgresql import PostgresqlUtils, StorePostgresql, database_url, dispose_engines, get_engine
 
 from . import __version__
 
@@ -92,7 +99,7 @@ class Jobs:
                 logger.debug(_("The job %s worked"), event.job_id)
         logger.debug(_("Job set: %s"), self._job_set)
 
-    def __init__(self, url="sqlite:///jobs.sqlite", nb_executors=1):
+    def __init__(self, url="sqlite:///jobs.sqlite", nb_executors=1, executor="thread"):
         """Initialize class.
 
         Parameters
@@ -101,16 +108,23 @@ class Jobs:
             SQLalchemy URL for persistent jobstore.
         nb_executors : int
             Number of concurrent executor processes.
+        executor : str
+            "thread" to run jobs in threads of this process, or "process"
+            to run each job in a separate process, for CPU bound work.
 
         """
         self._job_set = set()
         logger.info(
-            _("Creating scheduler, %s executors, storing in %s"),
+            _("Creating scheduler, %s %s executors, storing in %s"),
             nb_executors,
+            executor,
             str(url)[0 : str(url).find(":")],
         )
         jobstores = {"once": MemoryJobStore(), "default": SQLAlchemyJobStore(url=url)}
-        executors = {"default": ThreadPoolExecutor(nb_executors)}
+        if executor == "process":
+            executors = {"default": ProcessPoolExecutor(nb_executors)}
+        else:
+            executors = {"default": ThreadPoolExecutor(nb_executors)}
         job_defaults = {
             "coalesce": True,
             "max_instances": 1,
@@ -167,8 +181,8 @@ class Jobs:
         logger.debug(_("Removing all scheduled jobs"))
         self._scheduler.remove_all_jobs()
 
-    def add_job_once(self, job_fn, args=None, kwargs=None):
-        job_name = args[0]
+    def add_job_once(self, job_fn, args=None, kwargs=None, job_id=None):
+        job_name = args[0] if job_id is None else job_id
         logger.debug(_("Adding immediate job %s"), job_name)
         self._scheduler.add_job(
             job_fn,
@@ -196,8 +210,9 @@ class Jobs:
         hour=None,
         minute=None,
         second=None,
+        job_id=None,
     ):
-        job_name = args[0]
+        job_name = args[0] if job_id is None else job_id
         logger.debug(_("Adding scheduled job %s"), job_name)
         self._scheduler.add_job(
             job_fn,
@@ -217,6 +232,24 @@ class Jobs:
             replace_existing=True,
         )
 
+    def refresh_jobs(self, args_by_id):
+        """Replace the arguments stored with scheduled jobs.
+
+        Scheduled jobs keep the settings given when they were scheduled,
+        which can lack parameters added since.
+
+        Parameters
+        ----------
+        args_by_id: dict
+            New arguments, by job id.
+        """
+        for j in self._scheduler.get_jobs(jobstore="default"):
+            if j.id in args_by_id:
+                logger.debug(_("Refreshing arguments of scheduled job %s"), j.id)
+                j.modify(args=args_by_id[j.id])
+            else:
+                logger.warning(_("Scheduled job %s is not in configuration, keeping its stored settings"), j.id)
+
     def count_jobs(self):
         # self._scheduler.print_jobs()
         jobs = self._scheduler.get_jobs()
@@ -285,6 +318,11 @@ def arguments(args):
         help=_("Create or modify incremental download schedule"),
         action="store_true",
     )
+    parser.add_argument(
+        "--bulk",
+        help=_("With --full, load observations with COPY, disable column tables triggers and refresh them at the end"),
+        action="store_true",
+    )
     parser.add_argument(
         "--status",
         help=_("Print downloading status (schedule, errors...)"),
@@ -296,7 +334,11 @@ def arguments(args):
         action="store_true",
     )
     parser.add_argument("--profile", help=_("Gather and print profiling times"), action="store_true")
-    parser.add_argument("file", help=_("Configuration file name"))
+    parser.add_argument(
+        "file",
+        nargs="+",
+        help=_("Configuration file name, or one file per site to download several sites in one process"),
+    )
 
     return parser.parse_args(args)
 
@@ -438,9 +480,55 @@ def migrate(cfg, sql_quiet, client_min_message):
     return None
 
 
-def full_download_1(ctrl: str, settings: dict) -> None:
-    """Downloads from a single controler."""
+def _site_pools(settings: dict) -> None:
+    """Create the HTTP session, rate limiter, circuit breaker and database engine shared by all controlers of a site.
+
+    Called by each job, as jobs run in executor processes do not share
+    the pools of the main process. The time to live of reference lists,
+    cached by each process, is also set.
+    """
+    set_reference_ttl(settings["TUNING"]["reference_ttl"])
+    if settings["DATABASE"]["enabled"]:
+        # A connection for each job running concurrently, and one to read reference lists
+        get_engine(
+            database_url(
+                settings["DATABASE"]["db_user"],
+                settings["DATABASE"]["db_pw"],
+                settings["DATABASE"]["db_host"],
+                settings["DATABASE"]["db_port"],
+                settings["DATABASE"]["db_name"],
+            ),
+            pool_size=settings["TUNING"]["sched_executors"] + 1,
+        )
+    get_session(
+        settings["SITE"]["site_url"],
+        pool_size=settings["TUNING"]["pool_size"],
+        max_retry=settings["TUNING"]["max_retry"],
+    )
+    get_rate_limiter(
+        settings["SITE"]["site_url"],
+        requests_per_second=settings["TUNING"]["requests_per_second"],
+        max_concurrent=settings["TUNING"]["max_concurrent_requests"],
+    )
+    get_circuit_breaker(
+        settings["SITE"]["site_url"],
+        failure_threshold=settings["TUNING"]["circuit_failures"],
+        reset_timeout=settings["TUNING"]["circuit_reset"],
+    )
+
+
+def _job_id(ctrl: str, settings: Dynaconf, settings_list: list[Dynaconf]) -> str:
+    """Return job id, prefixed by site name when several sites are downloaded."""
+    return ctrl if len(settings_list) == 1 else settings.site.name + "_" + ctrl
+
+
+def full_download_1(ctrl: str, settings: dict, bulk: bool = False) -> None:
+    """Downloads from a single controler.
+
+    Observations are loaded with COPY if bulk is True or db_bulk_load is set.
+    """
     logger.debug(_("Enter full_download_1: %s"), ctrl)
+    _site_pools(settings)
     with (
         StorePostgresql(
             settings["SITE"]["name"],
@@ -454,6 +542,9 @@ def full_download_1(ctrl: str, settings: dict) -> None:
             settings["DATABASE"]["db_schema_vn"],
             settings["DATABASE"]["db_group"],
             settings["DATABASE"]["db_out_proj"],
+            batch_size=settings["TUNING"]["db_batch_size"],
+            bulk_load=bulk or settings["TUNING"]["db_bulk_load"],
+            log_interval=settings["TUNING"]["db_log_interval"],
         ) as store_pg,
         StoreFile(settings["FILE"]["enabled"], settings["FILE"]["file_store"]) as store_f,
     ):
@@ -502,11 +593,39 @@ def full_download_1(ctrl: str, settings: dict) -> None:
                 pid_limit_min=settings["TUNING"]["pid_limit_min"],
                 pid_limit_max=settings["TUNING"]["pid_limit_max"],
                 pid_delta_days=settings["TUNING"]["pid_delta_days"],
+                search_workers=settings["TUNING"]["search_workers"],
+                prefetch_chunks=settings["TUNING"]["prefetch_chunks"],
             ).store(
                 taxo_groups_ex=taxo_exclude,
                 territorial_unit_ids=settings["FILTER"]["territorial_unit_ids"],
             )
-        elif (ctrl == "local_admin_units") or (ctrl == "places"):
+        elif ctrl == "places":
+            logger.info(
+                _("Included territorial_unit_ids: %s"),
+                settings["FILTER"]["territorial_unit_ids"],
+            )
+            CTRL_DEFS[ctrl](
+                site=settings["SITE"]["name"],
+                user_email=settings["SITE"]["user_email"],
+                user_pw=settings["SITE"]["user_pw"],
+                base_url=settings["SITE"]["site_url"],
+                client_key=settings["SITE"]["client_key"],
+                client_secret=settings["SITE"]["client_secret"],
+                backend=store_all,
+                db_enabled=settings["DATABASE"]["enabled"],
+                db_user=settings["DATABASE"]["db_user"],
+                db_pw=settings["DATABASE"]["db_pw"],
+                db_host=settings["DATABASE"]["db_host"],
+                db_port=settings["DATABASE"]["db_port"],
+                db_name=settings["DATABASE"]["db_name"],
+                db_schema_import=settings["DATABASE"]["db_schema_import"],
+                db_schema_vn=settings["DATABASE"]["db_schema_vn"],
+                db_group=settings["DATABASE"]["db_group"],
+                db_out_proj=settings["DATABASE"]["db_out_proj"],
+            ).store(
+                territorial_unit_ids=settings["FILTER"]["territorial_unit_ids"],
+            )
+        elif ctrl == "local_admin_units":
             logger.info(
                 _("Included territorial_unit_ids: %s"),
                 settings["FILTER"]["territorial_unit_ids"],
@@ -537,50 +656,75 @@ def full_download_1(ctrl: str, settings: dict) -> None:
     return None
 
 
-def full_download(settings: Dynaconf) -> None:
+def full_download(settings_list: list[Dynaconf], bulk: bool = False) -> None:
     """Performs a full download of all sites and controlers,
-    based on configuration file.
+    based on configuration files.
+
+    All sites are downloaded by the same scheduler, configured by the first
+    file. Jobs are interleaved by controler, so that sites share fairly
+    the executors.
 
     Parameters
     ----------
-    settings: Dynaconf
+    settings_list: list[Dynaconf]
+        Configuration of each site.
+    bulk: bool
+        If True, observations are loaded with COPY, column table trigger is disabled
+        during download, and the table is refreshed set-based at the end.
+        Trigger is kept if the database also stores sites not downloaded.
     """
 
     logger.info(_("Defining full download jobs"))
-    jobs_o = Jobs(url="sqlite:///" + settings.tuning.sched_sqllite_file, nb_executors=settings.tuning.sched_executors)
-    with jobs_o as jobs:
-        # Cleanup any existing job
-        jobs.start(paused=True)
-        jobs.remove_all_jobs()
-        jobs.resume()
-        # Schedule enabled jobs for immediate execution
-        if settings.controler.entities.enabled:
-            jobs.add_job_once(job_fn=full_download_1, args=["entities", settings.as_dict()])
-        if settings.controler.families.enabled:
-            jobs.add_job_once(job_fn=full_download_1, args=["families", settings.as_dict()])
-        if settings.controler.fields.enabled:
-            jobs.add_job_once(job_fn=full_download_1, args=["fields", settings.as_dict()])
-        if settings.controler.local_admin_units.enabled:
-            jobs.add_job_once(job_fn=full_download_1, args=["local_admin_units", settings.as_dict()])
-        if settings.controler.observations.enabled:
-            jobs.add_job_once(job_fn=full_download_1, args=["observations", settings.as_dict()])
-        if settings.controler.observers.enabled:
-            jobs.add_job_once(job_fn=full_download_1, args=["observers", settings.as_dict()])
-        if settings.controler.places.enabled:
-            jobs.add_job_once(job_fn=full_download_1, args=["places", settings.as_dict()])
-        if settings.controler.species.enabled:
-            jobs.add_job_once(job_fn=full_download_1, args=["species", settings.as_dict()])
-        if settings.controler.taxo_groups.enabled:
-            jobs.add_job_once(job_fn=full_download_1, args=["taxo_groups", settings.as_dict()])
-        if settings.controler.territorial_units.enabled:
-            jobs.add_job_once(job_fn=full_download_1, args=["territorial_units", settings.as_dict()])
-        if settings.controler.validations.enabled:
-            jobs.add_job_once(job_fn=full_download_1, args=["validations", settings.as_dict()])
-
-        # Wait for jobs to finish
-        while jobs.count_jobs() > 0:
-            time.sleep(1)
-        jobs.shutdown()
+    for settings in settings_list:
+        _site_pools(settings)
+    tuning = settings_list[0].tuning
+    manage_pgs = [
+        PostgresqlUtils(
+            settings.database.enabled,
+            settings.database.db_user,
+            settings.database.db_pw,
+            settings.database.db_host,
+            settings.database.db_port,
+            settings.database.db_name,
+            settings.database.db_schema_import,
+            settings.database.db_schema_vn,
+            settings.database.db_group,
+        )
+        for settings in settings_list
+    ]
+    sites = [settings.site.name for settings in settings_list]
+    bulk_sites = [bulk and manage_pg.disable_col_triggers(sites) for manage_pg in manage_pgs]
+    try:
+        jobs_o = Jobs(
+            url="sqlite:///" + tuning.sched_sqllite_file,
+            nb_executors=tuning.sched_executors,
+            executor=tuning.sched_executor_type,
+        )
+        with jobs_o as jobs:
+            # Cleanup any existing job
+            jobs.start(paused=True)
+            jobs.remove_all_jobs()
+            jobs.resume()
+            # Schedule enabled jobs for immediate execution
+            for ctrl in CTRL_DEFS:
+                for settings in settings_list:
+                    if settings.controler[ctrl].enabled:
+                        jobs.add_job_once(
+                            job_fn=full_download_1,
+                            args=[ctrl, settings.as_dict(), bulk],
+                            job_id=_job_id(ctrl, settings, settings_list),
+                        )
+
+            # Wait for jobs to finish
+            while jobs.count_jobs() > 0:
+                time.sleep(1)
+            jobs.shutdown()
+    finally:
+        for settings, manage_pg, bulk_site in zip(settings_list, manage_pgs, bulk_sites, strict=True):
+            if bulk_site:
+                manage_pg.refresh_col_tables(settings.site.name)
+    close_sessions()
+    dispose_engines()
 
     return None
 
@@ -588,6 +732,7 @@ def full_download(settings: Dynaconf) -> None:
 def increment_download_1(ctrl: str, settings: dict) -> None:
     """Download incremental updates from one site."""
     logger.debug(_("Enter increment_download_1: %s"), ctrl)
+    _site_pools(settings)
     with (
         StorePostgresql(
             settings["SITE"]["name"],
@@ -601,6 +746,8 @@ def increment_download_1(ctrl: str, settings: dict) -> None:
             settings["DATABASE"]["db_schema_vn"],
             settings["DATABASE"]["db_group"],
             settings["DATABASE"]["db_out_proj"],
+            batch_size=settings["TUNING"]["db_batch_size"],
+            log_interval=settings["TUNING"]["db_log_interval"],
         ) as store_pg,
         StoreFile(settings["FILE"]["enabled"], settings["FILE"]["file_store"]) as store_f,
     ):
@@ -651,6 +798,7 @@ def increment_download_1(ctrl: str, settings: dict) -> None:
                 pid_limit_min=settings["TUNING"]["pid_limit_min"],
                 pid_limit_max=settings["TUNING"]["pid_limit_max"],
                 pid_delta_days=settings["TUNING"]["pid_delta_days"],
+                search_workers=settings["TUNING"]["search_workers"],
             ).update(
                 taxo_groups_ex=taxo_exclude,
             )
@@ -663,6 +811,18 @@ def increment_download_1(ctrl: str, settings: dict) -> None:
                 client_key=settings["SITE"]["client_key"],
                 client_secret=settings["SITE"]["client_secret"],
                 backend=store_all,
+                db_enabled=settings["DATABASE"]["enabled"],
+                db_user=settings["DATABASE"]["db_user"],
+                db_pw=settings["DATABASE"]["db_pw"],
+                db_host=settings["DATABASE"]["db_host"],
+                db_port=settings["DATABASE"]["db_port"],
+                db_name=settings["DATABASE"]["db_name"],
+                db_schema_import=settings["DATABASE"]["db_schema_import"],
+                db_schema_vn=settings["DATABASE"]["db_schema_vn"],
+                db_group=settings["DATABASE"]["db_group"],
+                db_out_proj=settings["DATABASE"]["db_out_proj"],
+                max_list_length=settings["TUNING"]["max_list_length"],
+                search_workers=settings["TUNING"]["search_workers"],
             ).update(
                 territorial_unit_ids=settings["FILTER"]["territorial_unit_ids"],
             )
@@ -692,49 +852,73 @@ def increment_download_1(ctrl: str, settings: dict) -> None:
     return None
 
 
-def increment_download(settings: Dynaconf) -> None:
+def increment_download(settings_list: list[Dynaconf]) -> None:
     """Performs an incremental download of observations from all sites
-    and controlers, based on configuration file."""
+    and controlers, based on configuration files."""
 
     logger.info(_("Starting incremental download jobs"))
-
-    jobs_o = Jobs(url="sqlite:///" + settings.tuning.sched_sqllite_file, nb_executors=settings.tuning.sched_executors)
+    for settings in settings_list:
+        _site_pools(settings)
+    tuning = settings_list[0].tuning
+
+    jobs_o = Jobs(
+        url="sqlite:///" + tuning.sched_sqllite_file,
+        nb_executors=tuning.sched_executors,
+        executor=tuning.sched_executor_type,
+    )
     with jobs_o as jobs:
-        # Start scheduler and wait for jobs to finish
-        jobs.start()
+        # Start scheduler paused, to replace the settings stored by --schedule with the current ones
+        jobs.start(paused=True)
+        jobs.refresh_jobs({
+            _job_id(ctrl_name, settings, settings_list): [ctrl_name, settings.as_dict()]
+            for settings in settings_list
+            for ctrl_name, ctrl_props in settings.controler.items()
+            if ctrl_props.enabled
+        })
+        # Wait for jobs to finish
+        jobs.resume()
         time.sleep(1)
         while jobs.count_jobs() > 0:
             time.sleep(1)
         jobs.shutdown()
+    close_sessions()
+    dispose_engines()
 
     return None
 
 
-def increment_schedule(settings: Dynaconf) -> None:
+def increment_schedule(settings_list: list[Dynaconf]) -> None:
     """Creates or modify the incremental download schedule,
     based on controler configuration."""
 
-    logger.info(_("Defining incremental download jobs in %s"), settings.tuning.sched_sqllite_file)
+    tuning = settings_list[0].tuning
+    logger.info(_("Defining incremental download jobs in %s"), tuning.sched_sqllite_file)
 
-    jobs = Jobs(url="sqlite:///" + settings.tuning.sched_sqllite_file, nb_executors=settings.tuning.sched_executors)
+    jobs = Jobs(
+        url="sqlite:///" + tuning.sched_sqllite_file,
+        nb_executors=tuning.sched_executors,
+        executor=tuning.sched_executor_type,
+    )
     # Looping on sites
-    logger.info(_("Scheduling increments on site %s"), settings.site.name)
-    for ctrl_name, ctrl_props in settings.controler.items():
-        if ctrl_props.enabled:
-            logger.debug(_("Adding schedule for controler %s"), ctrl_name)
-            logger.debug(ctrl_props.schedule)
-            jobs.add_job_schedule(
-                job_fn=increment_download_1,
-                args=[ctrl_name, settings.as_dict()],
-                year=ctrl_props.schedule.year if "year" in ctrl_props.schedule else "*",
-                month=ctrl_props.schedule.month if "month" in ctrl_props.schedule else "*",
-                day=ctrl_props.schedule.day if "day" in ctrl_props.schedule else "*",
-                week=ctrl_props.schedule.week if "week" in ctrl_props.schedule else "*",
-                day_of_week=ctrl_props.schedule.day_of_week if "day_of_week" in ctrl_props.schedule else "*",
-                hour=ctrl_props.schedule.hour if "hour" in ctrl_props.schedule else "*",
-                minute=ctrl_props.schedule.minute if "minute" in ctrl_props.schedule else "*",
-                second=ctrl_props.schedule.second if "second" in ctrl_props.schedule else "0",
-            )
+    for settings in settings_list:
+        logger.info(_("Scheduling increments on site %s"), settings.site.name)
+        for ctrl_name, ctrl_props in settings.controler.items():
+            if ctrl_props.enabled:
+                logger.debug(_("Adding schedule for controler %s"), ctrl_name)
+                logger.debug(ctrl_props.schedule)
+                jobs.add_job_schedule(
+                    job_fn=increment_download_1,
+                    args=[ctrl_name, settings.as_dict()],
+                    year=ctrl_props.schedule.year if "year" in ctrl_props.schedule else "*",
+                    month=ctrl_props.schedule.month if "month" in ctrl_props.schedule else "*",
+                    day=ctrl_props.schedule.day if "day" in ctrl_props.schedule else "*",
+                    week=ctrl_props.schedule.week if "week" in ctrl_props.schedule else "*",
+                    day_of_week=ctrl_props.schedule.day_of_week if "day_of_week" in ctrl_props.schedule else "*",
+                    hour=ctrl_props.schedule.hour if "hour" in ctrl_props.schedule else "*",
+                    minute=ctrl_props.schedule.minute if "minute" in ctrl_props.schedule else "*",
+                    second=ctrl_props.schedule.second if "second" in ctrl_props.schedule else "0",
+                    job_id=_job_id(ctrl_name, settings, settings_list),
+                )
 
     # Print status
     jobs.start(paused=True)
@@ -814,63 +998,27 @@ def count_observations(cfg_ctrl):
     return None
 
 
-def main(args) -> None:
-    """Main entry point calling commands.
+def load_settings(file: str) -> Dynaconf:
+    """Load and validate the configuration of a site.
 
-    Args:
-      args ([str]): command line parameter list
+    Parameters
+    ----------
+    file: str
+        Configuration file name.
+
+    Returns
+    -------
+    Dynaconf
+        Validated settings.
+
+    Raises
+    ------
+    ValueError
+        If the configuration file is incorrect.
     """
-    # Get command line arguments
-    args = arguments(args)
-
-    # Start profiling if required
-    if args.profile:
-        yappi.start()
-        logger.info(_("Started yappi"))
-
-    # Create $HOME/tmp directory if it does not exist
-    (Path.home() / "tmp").mkdir(exist_ok=True)
-
-    # create file handler which logs even debug messages
-    fh = TimedRotatingFileHandler(
-        Path.home() / "tmp/transfer_vn.log",
-        when="midnight",
-        interval=1,
-        backupCount=100,
-    )
-    # create console handler with a higher log level
-    ch = logging.StreamHandler()
-    # create formatter and add it to the handlers
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
-    fh.setFormatter(formatter)
-    ch.setFormatter(formatter)
-    # add the handlers to the root logger
-    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, handlers=[fh, ch], force=True)
-
-    # Define SQL verbosity
-    if args.verbose:
-        sql_quiet = ""
-        client_min_message = "debug1"
-    else:
-        sql_quiet = "--quiet"
-        client_min_message = "warning"
-
-    logger.info(_("%s, version %s"), sys.argv[0], __version__)
-    logger.debug(_("Arguments: %s"), sys.argv[1:])
-
-    # If required, first create TOML file
-    if args.init:
-        logger.info(_("Creating TOML configuration file"))
-        init(args.file)
-        return None
-
-    # Get configuration from file
-    if not (Path.home() / args.file).is_file():
-        logger.critical(_("File %s does not exist"), str(Path.home() / args.file))
-        return None
-    logger.info(_("Getting configuration data from %s"), args.file)
+    logger.info(_("Getting configuration data from %s"), file)
     settings = Dynaconf(
-        settings_files=[args.file],
+        settings_files=[file],
     )
 
     # Validation de tous les paramètres
@@ -908,14 +1056,26 @@ def main(args) -> None:
         Validator("TUNING.RETRY_DELAY", gte=1, default=5, cast=int),
         Validator("TUNING.UNAVAILABLE_DELAY", gte=1, default=600, cast=int),
         Validator("TUNING.LRU_MAXSIZE", gte=1, default=32, cast=int),
+        Validator("TUNING.POOL_SIZE", gte=1, default=10, cast=int),
+        Validator("TUNING.DB_BATCH_SIZE", gte=1, default=1000, cast=int),
+        Validator("TUNING.DB_BULK_LOAD", default=False, cast=bool),
+        Validator("TUNING.DB_LOG_INTERVAL", gte=0, default=0, cast=float),
+        Validator("TUNING.REQUESTS_PER_SECOND", gte=0, default=0.0, cast=float),
+        Validator("TUNING.MAX_CONCURRENT_REQUESTS", gte=0, default=0, cast=int),
+        Validator("TUNING.CIRCUIT_FAILURES", gte=0, default=20, cast=int),
+        Validator("TUNING.CIRCUIT_RESET", gte=1, default=600, cast=int),
         Validator("TUNING.PID_KP", gte=0, default=0.0, cast=float),
         Validator("TUNING.PID_KI", gte=0, default=0.003, cast=float),
         Validator("TUNING.PID_KD", gte=0, default=0.0, cast=float),
-        Validator("TUNING.SETPOINT", gte=0, default=10000, cast=int),
+        Validator("TUNING.PID_SETPOINT", gte=0, default=10000, cast=int),
         Validator("TUNING.PID_LIMIT_MIN", gte=0, default=5, cast=int),
         Validator("TUNING.PID_LIMIT_MAX", gte=0, default=2000, cast=int),
         Validator("TUNING.PID_DELTA_DAYS", gte=0, default=10, cast=int),
+        Validator("TUNING.SEARCH_WORKERS", gte=1, default=1, cast=int),
+        Validator("TUNING.PREFETCH_CHUNKS", gte=0, default=2, cast=int),
         Validator("TUNING.SCHED_EXECUTORS", gte=1, default=1, cast=int),
+        Validator("TUNING.SCHED_EXECUTOR_TYPE", default="thread", is_in=["thread", "process"], cast=str),
+        Validator("TUNING.REFERENCE_TTL", gte=0, default=3600, cast=int),
         Validator("TUNING.SCHED_SQLLITE_FILE", default="jobstore.sqllite", cast=str),
     )
     try:
@@ -925,13 +1085,83 @@ def main(args) -> None:
         logger.exception(accumulative_errors)
         raise ValueError(_("Incorrect configuration file")) from e
 
+    # Defaults set by validators are stored with uppercase keys, while keys read from the file keep their case.
+    # Keys are lowercased, as jobs read the settings, given by as_dict(), with lowercase keys.
+    for section, params in settings.as_dict().items():
+        if isinstance(params, dict):
+            settings.set(section, {key.lower(): value for key, value in params.items()})
+
+    return settings
+
+
+def main(args) -> None:
+    """Main entry point calling commands.
+
+    Args:
+      args ([str]): command line parameter list
+    """
+    # Get command line arguments
+    args = arguments(args)
+
+    # Start profiling if required
+    if args.profile:
+        yappi.start()
+        logger.info(_("Started yappi"))
+
+    # Create $HOME/tmp directory if it does not exist
+    (Path.home() / "tmp").mkdir(exist_ok=True)
+
+    # create file handler which logs even debug messages
+    fh = TimedRotatingFileHandler(
+        Path.home() / "tmp/transfer_vn.log",
+        when="midnight",
+        interval=1,
+        backupCount=100,
+    )
+    # create console handler with a higher log level
+    ch = logging.StreamHandler()
+    # create formatter and add it to the handlers
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+    fh.setFormatter(formatter)
+    ch.setFormatter(formatter)
+    # add the handlers to the root logger
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, handlers=[fh, ch], force=True)
+
+    # Define SQL verbosity
+    if args.verbose:
+        sql_quiet = ""
+        client_min_message = "debug1"
+    else:
+        sql_quiet = "--quiet"
+        client_min_message = "warning"
+
+    logger.info(_("%s, version %s"), sys.argv[0], __version__)
+    logger.debug(_("Arguments: %s"), sys.argv[1:])
+
+    # If required, first create TOML file
+    if args.init:
+        logger.info(_("Creating TOML configuration file"))
+        init(args.file[0])
+        return None
+
+    # Get configuration from files, one per site
+    settings_list = []
+    for file in args.file:
+        if not (Path.home() / file).is_file():
+            logger.critical(_("File %s does not exist"), str(Path.home() / file))
+            return None
+        settings_list.append(load_settings(file))
+    # Database management and status use the first configuration
+    settings = settings_list[0]
+
     cfg_site_list = settings.site
     cfg = next(iter(cfg_site_list.values()))
     # Check configuration consistency
-    if settings.database.enabled and settings.filter.json_format != "short":
-        logger.critical(_("Storing to Postgresql cannot use long json_format."))
-        logger.critical(_("Please modify TOML configuration and restart."))
-        sys.exit(0)
+    for site_settings in settings_list:
+        if site_settings.database.enabled and site_settings.filter.json_format != "short":
+            logger.critical(_("Storing to Postgresql cannot use long json_format."))
+            logger.critical(_("Please modify TOML configuration and restart."))
+            sys.exit(0)
 
     manage_pg = PostgresqlUtils(
         settings.database.enabled,
@@ -979,16 +1209,16 @@ def main(args) -> None:
 
     if args.full:
         logger.info(_("Performing a full download"))
-        full_download(settings)
+        full_download(settings_list, bulk=args.bulk)
         logger.info(_("Finished full download"))
 
     if args.schedule:
         logger.info(_("Creating or modifying incremental download schedule"))
-        increment_schedule(settings)
+        increment_schedule(settings_list)
 
     if args.update:
         logger.info(_("Performing an incremental download"))
-        increment_download(settings)
+        increment_download(settings_list)
 
     if args.status:
         logger.info(_("Printing download status"))
@@ -7,23 +7,40 @@ Generate property reports from schema.
 
 # import argparse
 import gzip
+import hashlib
 import importlib.resources
+import importlib.util
 import json
 import logging
+import os
 import random
 import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
 
 import click
 from dynaconf import Dynaconf, ValidationError, Validator
+from jsonschema.exceptions import best_match
 from jsonschema.validators import validator_for
 
 from . import __version__
 
+try:
+    import fastjsonschema
+    from fastjsonschema.ref_resolver import RefResolver
+except ImportError:
+    fastjsonschema = None
+
 logger = logging.getLogger(__name__)
 
+# Validators compiled by the process, by schema name
+_validators = {}
+# Validators compiled to python code, by schema name, and their cache directory
+_compiled = {}
+_cache_dir = None
+
 
 @click.version_option(package_name="Client_API_VN")
 @click.group()
@@ -66,6 +83,87 @@ def main(
     return None
 
 
+def _validator(schema: str):
+    """Return the validator of a schema, compiled once by process."""
+    if schema not in _validators:
+        schema_js = json.loads((importlib.resources.files("schemas") / f"{schema}.json").read_text())
+        cls = validator_for(schema_js)
+        cls.check_schema(schema_js)
+        _validators[schema] = cls(schema_js)
+    return _validators[schema]
+
+
+def set_compiled_cache(cache_dir: Path | None) -> None:
+    """Select validation by schemas compiled to python code.
+
+    Parameters
+    ----------
+    cache_dir : Path or None
+        Directory where compiled schemas are stored and reused across runs.
+        If None, schemas are only interpreted by jsonschema.
+    """
+    global _cache_dir
+    _cache_dir = cache_dir
+    _compiled.clear()
+
+
+def _compiled_validator(schema: str):
+    """Return the validation function of a schema, compiled by fastjsonschema.
+
+    The generated code is cached in _cache_dir, keyed by a hash of the schema
+    and of fastjsonschema version, and only generated again when one changes.
+    """
+    if schema not in _compiled:
+        schema_txt = (importlib.resources.files("schemas") / f"{schema}.json").read_text()
+        schema_js = json.loads(schema_txt)
+        digest = hashlib.sha256((fastjsonschema.VERSION + schema_txt).encode()).hexdigest()[:16]
+        code_file = _cache_dir / f"{schema}_{digest}.py"
+        if not code_file.is_file():
+            logger.info(_("Compiling schema %s to %s"), schema, code_file)
+            # Same semantics as jsonschema: data is not modified and formats are not checked
+            code = fastjsonschema.compile_to_code(schema_js, use_default=False, use_formats=False)
+            _cache_dir.mkdir(parents=True, exist_ok=True)
+            # Written atomically, as several processes may compile the same schema
+            tmp_file = code_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(code)
+            tmp_file.replace(code_file)
+        spec = importlib.util.spec_from_file_location(f"schemas.compiled.{schema}", code_file)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        # Validation function is named after the schema $id
+        _compiled[schema] = getattr(module, RefResolver.from_schema(schema_js).get_scope_name())
+    return _compiled[schema]
+
+
+def _validate_file(schema: str, file: Path) -> str | None:
+    """Validate a downloaded file against a schema.
+
+    Parameters
+    ----------
+    schema : str
+        Schema name.
+    file : Path
+        Gzipped JSON file.
+
+    Returns
+    -------
+    str or None
+        Error message if the file does not match the schema, else None.
+    """
+    with gzip.open(file) as f:
+        js = json.load(f)
+    if _cache_dir is not None:
+        try:
+            _compiled_validator(schema)(js)
+        except fastjsonschema.JsonSchemaException:
+            # Errors are reported by jsonschema, as when not compiled
+            pass
+        else:
+            return None
+    error = best_match(_validator(schema).iter_errors(js))
+    return None if error is None else str(error)
+
+
 def _get_int_or_float(v):
     """Convert str to int or float."""
     number_as_float = float(v)
@@ -81,10 +179,33 @@ def _get_int_or_float(v):
         "If float in range [0.0, 1.0], the parameter represents a proportion of files, else integer absolute counts."
     ),
 )
+@click.option(
+    "--jobs",
+    default=1,
+    type=click.IntRange(min=1),
+    help=_("Number of processes validating files in parallel."),
+)
+@click.option(
+    "--seed",
+    default=None,
+    type=int,
+    help=_("Seed of the random sampling of files, to validate the same files again."),
+)
+@click.option(
+    "--compiled/--interpreted",
+    default=True,
+    help=_("Validate with schemas compiled by fastjsonschema, if installed, or interpreted by jsonschema."),
+)
+@click.option(
+    "--cache",
+    default=str(Path.home() / ".cache" / "validate_vn"),
+    type=click.Path(file_okay=False, path_type=Path),
+    help=_("Directory of compiled schemas, reused across runs."),
+)
 @click.argument(
     "config",
 )
-def validate(config: str, samples: float) -> None:
+def validate(config: str, samples: float, jobs: int, seed: int | None, compiled: bool, cache: Path) -> None:
     """Validate schemas against downloaded files.
     Files are renamed *.done after successful processing."""
     # Get configuration from file
@@ -123,33 +244,56 @@ def validate(config: str, samples: float) -> None:
         )
         samples = 0.1
 
-    for js_f in importlib.resources.files("schemas").iterdir():
-        with importlib.resources.as_file(js_f) as file:
-            if js_f.suffix == ".json":
-                schema = js_f.stem
-                logger.info(_("Validating schema %s, in file %s"), schema, file)
-                with open(file) as f:
-                    schema_js = json.load(f)
-                cls = validator_for(schema_js)
-                cls.check_schema(schema_js)
-                instance = cls(schema_js)
-                # Gathering files to validate
-                f_list = []
-                p = Path.home() / settings.file.file_store
-                for tst_f in p.glob(f"{schema}*.gz"):
-                    f_list.append(tst_f)
-                sample_schema = samples
-                if isinstance(sample_schema, float):
-                    sample_schema = round(sample_schema * len(f_list))
-                sample_schema = min(sample_schema, len(f_list))
-                logger.debug(_("Sampling %s out of %i files"), sample_schema, len(f_list))
-                f_list = random.sample(f_list, sample_schema)
-                for fj in f_list:
-                    logger.debug(_("Validating %s schema with %s"), schema, fj)
-                    with gzip.open(fj) as f:
-                        js = json.load(f)
-                    instance.validate(js)
-                    shutil.move(fj, str(fj) + ".done")
+    if compiled and fastjsonschema is None:
+        logger.warning(_("fastjsonschema is not installed, schemas are interpreted by jsonschema"))
+        compiled = False
+    cache = cache if compiled else None
+    set_compiled_cache(cache)
+
+    # Gathering files to validate, sampled in a reproducible order
+    rng = random.Random(seed)  # noqa: S311
+    tasks = []
+    for js_f in sorted(importlib.resources.files("schemas").iterdir(), key=lambda js_f: js_f.name):
+        if js_f.suffix == ".json":
+            schema = js_f.stem
+            logger.info(_("Checking schema %s"), schema)
+            _validator(schema)
+            if compiled:
+                _compiled_validator(schema)
+            f_list = sorted(val_path.glob(f"{schema}*.gz"))
+            sample_schema = samples
+            if isinstance(sample_schema, float):
+                sample_schema = round(sample_schema * len(f_list))
+            sample_schema = min(sample_schema, len(f_list))
+            logger.debug(_("Sampling %s out of %i files"), sample_schema, len(f_list))
+            tasks += [(schema, fj) for fj in sorted(rng.sample(f_list, sample_schema))]
+
+    # Validating files, in worker processes if needed
+    logger.info(_("Validating %d files, with %d processes"), len(tasks), jobs)
+    schemas = [schema for schema, _fj in tasks]
+    files = [fj for _schema, fj in tasks]
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=set_compiled_cache, initargs=(cache,)) as executor:
+            errors = list(executor.map(_validate_file, schemas, files, chunksize=max(1, len(tasks) // (jobs * 4))))
+    else:
+        errors = list(map(_validate_file, schemas, files))
+
+    # Report, in files order
+    report = {}
+    for (schema, fj), error in zip(tasks, errors, strict=True):
+        validated, failed = report.get(schema, (0, 0))
+        if error is None:
+            logger.debug(_("File %s matches %s schema"), fj, schema)
+            shutil.move(fj, str(fj) + ".done")
+            report[schema] = (validated + 1, failed)
+        else:
+            logger.error(_("File %s does not match %s schema: %s"), fj, schema, error)
+            report[schema] = (validated, failed + 1)
+    for schema, (validated, failed) in report.items():
+        logger.info(_("Schema %s: %d files validated, %d files with errors"), schema, validated, failed)
+    nb_failed = sum(failed for _validated, failed in report.values())
+    if nb_failed > 0:
+        raise click.ClickException(_("%d files do not match their schema") % nb_failed)
 
     return None
 
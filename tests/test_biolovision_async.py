@@ -0,0 +1,213 @@
+"""
+Test async_api module, against a local stub HTTP server.
+
+No VisioNature account is needed. Tests are skipped if httpx is not installed.
+"""
+
+import asyncio
+import contextlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import parse
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from biolovision.api import BiolovisionAPI, HTTPError
+from biolovision.async_api import (
+    AsyncObservationsAPI,
+    AsyncPlacesAPI,
+    AsyncSpeciesAPI,
+    AsyncTaxoGroupsAPI,
+)
+
+DUMMY = "unused-in-stub-tests"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Reply to API requests with canned responses, from server.routes."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        url = parse.urlsplit(self.path)
+        query = parse.parse_qs(url.query)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length > 0 else b""
+        server.requests.append((self.command, url.path, query, self.headers.get("Authorization", ""), body))
+        time.sleep(server.delay)
+        route = server.routes[url.path]
+        status, chunk, pagination_key = route(query, body)
+        with server.lock:
+            server.in_flight -= 1
+        content = json.dumps(chunk).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if pagination_key is not None:
+            # Chunked response, as Biolovision does when more data is available
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("pagination_key", pagination_key)
+            self.end_headers()
+            self.wfile.write(f"{len(content):x}\r\n".encode() + content + b"\r\n0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+    do_GET = _reply
+    do_POST = _reply
+
+
+@pytest.fixture
+def stub():
+    """Local stub server, replying to routes defined by each test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.routes = {}
+    server.requests = []
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.delay = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _api(cls, stub, **kwargs):
+    return cls(
+        user_email="test@example.org",
+        user_pw=DUMMY,
+        base_url=stub.base_url,
+        client_key="key",
+        client_secret=DUMMY,
+        max_retry=2,
+        max_chunks=10,
+        unavailable_delay=0,
+        retry_delay=0,
+        **kwargs,
+    )
+
+
+def test_concurrent_requests(stub):
+    """Many requests are in flight at the same time, and signed with OAuth1."""
+    stub.delay = 0.2
+    for i in range(20):
+        stub.routes[f"/api/places/{i}"] = lambda q, b, i=i: (200, {"data": [{"id": str(i)}]}, None)
+
+    async def get_all():
+        async with _api(AsyncPlacesAPI, stub, pool_size=20) as places:
+            return await asyncio.gather(*[places.api_get(str(i)) for i in range(20)])
+
+    start = time.perf_counter()
+    results = asyncio.run(get_all())
+    assert time.perf_counter() - start < 20 * stub.delay / 2
+    assert [r["data"][0]["id"] for r in results] == [str(i) for i in range(20)]
+    assert stub.max_in_flight > 1
+    assert all(
+        auth.startswith('OAuth oauth_nonce="') and 'oauth_consumer_key="key"' in auth
+        for *_r, auth, _b in stub.requests
+    )
+    assert all(q["user_email"] == ["test@example.org"] for _m, _p, q, _a, _b in stub.requests)
+
+
+def test_list_chunks(stub):
+    """Chunks are requested with pagination_key and appended."""
+
+    def taxo_groups(query, body):
+        if "pagination_key" not in query:
+            return 200, {"data": [{"id": "1"}]}, "key1"
+        return 200, {"data": [{"id": "2"}]}, None
+
+    stub.routes["/api/taxo_groups"] = taxo_groups
+
+    async def list_all():
+        async with _api(AsyncTaxoGroupsAPI, stub) as taxo:
+            return await taxo.api_list()
+
+    assert asyncio.run(list_all()) == {"data": [{"id": "1"}, {"id": "2"}]}
+    assert stub.requests[1][2]["pagination_key"] == ["key1"]
+
+
+def test_search_iter(stub):
+    """Search posts the query and yields each chunk."""
+
+    def search(query, body):
+        assert json.loads(body) == {"period_choice": "range"}
+        if "pagination_key" not in query:
+            return 200, {"data": {"sightings": [{"id": "1"}]}}, "key1"
+        return 200, {"data": {"forms": [{"@id": "2"}]}}, None
+
+    stub.routes["/api/observations/search/"] = search
+
+    async def search_all():
+        async with _api(AsyncObservationsAPI, stub) as obs:
+            return [chunk async for chunk in obs.api_search_iter({"period_choice": "range"})]
+
+    chunks = asyncio.run(search_all())
+    assert chunks[0]["data"]["sightings"] == [{"id": "1"}]
+    assert chunks[1]["data"] == {"forms": [{"@id": "2"}], "sightings": []}
+    assert stub.requests[0][0] == "POST"
+
+
+def test_retry_then_error(stub):
+    """Server errors are retried up to max_retry, client errors are not."""
+    replies = iter([(500, {}, None), (200, {"data": [{"id": "1"}]}, None)])
+    stub.routes["/api/species/1"] = lambda q, b: next(replies)
+    stub.routes["/api/species/2"] = lambda q, b: (500, {}, None)
+    stub.routes["/api/species/3"] = lambda q, b: (404, {}, None)
+
+    async def get(id_entity):
+        async with _api(AsyncSpeciesAPI, stub) as species:
+            return await species.api_get(id_entity)
+
+    assert asyncio.run(get("1")) == {"data": [{"id": "1"}]}
+    with pytest.raises(HTTPError):
+        asyncio.run(get("2"))
+    # Initial request and max_retry retries
+    assert len([r for r in stub.requests if r[1] == "/api/species/2"]) == 3
+    with pytest.raises(HTTPError):
+        asyncio.run(get("3"))
+    assert len([r for r in stub.requests if r[1] == "/api/species/3"]) == 1
+
+
+def test_status_per_task(stub):
+    """Concurrent requests each get their own status and response size."""
+    stub.delay = 0.1
+    stub.routes["/api/species/1"] = lambda q, b: (200, {"data": [{"id": "1"}]}, None)
+    stub.routes["/api/species/2"] = lambda q, b: (200, {"data": [{"id": "2", "name": "x" * 100}]}, None)
+    stub.routes["/api/species/3"] = lambda q, b: (404, {}, None)
+
+    async def get(species, id_entity):
+        with contextlib.suppress(HTTPError):
+            await species.api_get(id_entity)
+        return species.http_status, species.last_response_bytes
+
+    async def get_all():
+        async with _api(AsyncSpeciesAPI, stub) as species:
+            return await asyncio.gather(*[get(species, str(i)) for i in range(1, 4)])
+
+    sizes = [len(json.dumps({"data": [{"id": "1"}]})), len(json.dumps({"data": [{"id": "2", "name": "x" * 100}]}))]
+    assert asyncio.run(get_all()) == [(200, sizes[0]), (200, sizes[1]), (404, 0)]
+
+
+def test_no_sync_methods(stub):
+    """Synchronous methods of BiolovisionAPI are not available."""
+    species = _api(AsyncSpeciesAPI, stub)
+    assert not isinstance(species, BiolovisionAPI)
+    assert not hasattr(species, "_api_list")
+    assert not hasattr(species, "session")
+    asyncio.run(species.aclose())
@@ -0,0 +1,402 @@
+"""
+Test the transport layer of biolovision_api module: HTTP session, chunks, JSON decoding...
+
+The API is mocked with requests_mock, so no VisioNature account is needed.
+"""
+
+import json
+import logging
+import pickle
+import re
+import threading
+import time
+from copy import copy
+
+import pytest
+import requests
+
+from biolovision.api import (
+    CircuitOpenError,
+    EntitiesAPI,
+    HTTPError,
+    MaxRequestsError,
+    ObservationsAPI,
+    RateLimiter,
+    RetryPolicy,
+    TaxoGroupsAPI,
+    close_sessions,
+    decode_json,
+    get_circuit_breaker,
+    get_rate_limiter,
+    get_session,
+    set_json_decoder,
+)
+
+SITE_URL = "https://example.org/"
+DUMMY = "unused-in-mocked-tests"
+
+
+def _api(cls=EntitiesAPI, **kwargs):
+    return cls(
+        user_email="test@example.org",
+        user_pw=DUMMY,
+        base_url=SITE_URL,
+        client_key=DUMMY,
+        client_secret=DUMMY,
+        max_retry=2,
+        max_chunks=10,
+        unavailable_delay=0,
+        retry_delay=0,
+        **kwargs,
+    )
+
+
+def test_session_shared_by_site():
+    """All controlers of a site share the same HTTP session."""
+    close_sessions()
+    entities = _api()
+    taxo_groups = _api(TaxoGroupsAPI)
+    assert entities.session is taxo_groups.session
+    assert entities.session is get_session(SITE_URL)
+    assert get_session("https://other.example.org/") is not entities.session
+    close_sessions()
+
+
+def test_session_pool_size():
+    """The pool size is set when the session is first created."""
+    close_sessions()
+    session = get_session(SITE_URL, pool_size=4, max_retry=3)
+    adapter = session.get_adapter(SITE_URL)
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.connect == 3
+    # Later calls return the existing session, unchanged
+    assert get_session(SITE_URL, pool_size=20) is session
+    close_sessions()
+
+
+def test_requests_use_session(requests_mock):
+    """Requests go through the shared session."""
+    close_sessions()
+    requests_mock.get(re.compile(SITE_URL), json={"data": [{"id": "1"}]})
+    api = _api()
+    assert api.api_list() == {"data": [{"id": "1"}]}
+    assert requests_mock.call_count == 1
+    close_sessions()
+
+
+def _paginated(requests_mock, method, chunks):
+    """Mock a chunked response, returning chunks one after the other."""
+    responses = []
+    for i, chunk in enumerate(chunks):
+        headers = {}
+        if i < len(chunks) - 1:
+            headers = {"transfer-encoding": "chunked", "pagination_key": f"key{i}"}
+        responses.append({"json": chunk, "headers": headers})
+    getattr(requests_mock, method)(re.compile(SITE_URL), responses)
+
+
+def test_list_iter_yields_each_chunk(requests_mock):
+    """api_list_iter yields chunks one by one, api_list appends them."""
+    chunks = [{"data": [{"id": "1"}]}, {"data": [{"id": "2"}, {"id": "3"}]}]
+    _paginated(requests_mock, "get", chunks)
+    api = _api()
+    assert list(api.api_list_iter()) == chunks
+    assert "pagination_key=key0" in requests_mock.request_history[1].url
+
+    _paginated(requests_mock, "get", chunks)
+    assert api.api_list() == {"data": [{"id": "1"}, {"id": "2"}, {"id": "3"}]}
+
+
+def test_requests_keep_log_level(requests_mock):
+    """Requests do not change the root logger level, even when they fail."""
+    root = logging.getLogger()
+    level = root.level
+    root.setLevel(logging.DEBUG)
+    try:
+        _paginated(requests_mock, "get", [{"data": [{"id": "1"}]}])
+        _api().api_list()
+        assert root.level == logging.DEBUG
+        requests_mock.get(re.compile(SITE_URL), exc=requests.ConnectionError)
+        with pytest.raises(requests.ConnectionError):
+            _api().api_list()
+        assert root.level == logging.DEBUG
+    finally:
+        root.setLevel(level)
+    assert logging.getLogger("urllib3").level == logging.INFO
+
+
+def test_last_response_bytes(requests_mock):
+    """Byte length of the response bodies is summed over the chunks of each call."""
+    chunks = [{"data": [{"id": "1"}]}, {"data": [{"id": "2"}, {"id": "3"}]}]
+    _paginated(requests_mock, "get", chunks)
+    api = _api()
+    assert api.last_response_bytes == 0
+    api.api_list()
+    assert api.last_response_bytes == sum(len(json.dumps(c).encode()) for c in chunks)
+
+    _paginated(requests_mock, "get", chunks[:1])
+    api.api_list()
+    assert api.last_response_bytes == len(json.dumps(chunks[0]).encode())
+
+
+def test_search_iter_yields_each_chunk(requests_mock):
+    """api_search_iter yields chunks, with sightings always defined."""
+    chunks = [
+        {"data": {"sightings": [{"id": "1"}]}},
+        {"data": {"forms": [{"@id": "2"}]}},
+    ]
+    _paginated(requests_mock, "post", chunks)
+    api = _api(ObservationsAPI)
+    received = list(api.api_search_iter({"period_choice": "range"}))
+    assert len(received) == 2
+    assert received[0]["data"]["sightings"] == [{"id": "1"}]
+    assert received[1]["data"] == {"forms": [{"@id": "2"}], "sightings": []}
+
+
+def test_decode_json():
+    """decode_json parses bytes and ignores extra text outside JSON."""
+    assert decode_json(b'{"data": [{"id": "1"}]}') == {"data": [{"id": "1"}]}
+    assert decode_json(b'  [{"id": "1"}]\n') == [{"id": "1"}]
+    assert decode_json(b'Warning: deprecated\n{"data": []}\n<br/>') == {"data": []}
+    assert decode_json(b"") == {}
+    assert decode_json(b"no json here") == {}
+
+
+def test_set_json_decoder():
+    """The JSON decoder can be replaced, then restored to the default."""
+    decoded = []
+
+    def loads(content):
+        decoded.append(content)
+        return json.loads(content)
+
+    set_json_decoder(loads)
+    try:
+        assert decode_json(b'{"data": []}') == {"data": []}
+        assert decoded == [b'{"data": []}']
+    finally:
+        set_json_decoder()
+    assert decode_json(b'{"data": []}') == {"data": []}
+    assert len(decoded) == 1
+
+
+def _observations_body(nb_sightings):
+    """Synthetic observations search response, similar to short JSON format."""
+    sightings = [
+        {
+            "place": {"@id": str(i % 5000), "name": "Lieu-dit " + str(i), "lat": "45.18", "lon": "5.72"},
+            "date": {"@timestamp": "1561932000", "#text": "lundi 1 juillet 2019"},
+            "species": {"@id": str(i % 1000), "taxonomy": "1"},
+            "observers": [
+                {
+                    "@id": str(i % 300),
+                    "id_sighting": str(i),
+                    "id_universal": "65_" + str(i),
+                    "estimation_code": "MINIMUM",
+                    "count": "3",
+                    "insert_date": "1561993250",
+                    "coord_lat": "45.188302",
+                    "coord_lon": "5.735984",
+                    "precision": "precise",
+                    "comment": "Observation n°" + str(i) + " - " + "é" * 20,
+                }
+            ],
+        }
+        for i in range(nb_sightings)
+    ]
+    return json.dumps({"data": {"sightings": sightings}}).encode()
+
+
+@pytest.mark.slow
+def test_decode_json_benchmark():
+    """Micro-benchmark: decode_json versus decoding text and regex search."""
+    content = _observations_body(10000)
+    assert len(content) > 5_000_000
+
+    def legacy(content):
+        text = content.decode("utf-8")
+        rsp = re.findall(r"([\[{].*[}\]])", text)
+        return json.loads(rsp[0])
+
+    def best_of(decode, repeat=5):
+        timings = []
+        for _i in range(repeat):
+            start = time.perf_counter()
+            decode(content)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    assert decode_json(content) == legacy(content)
+    legacy_time = best_of(legacy)
+    decode_time = best_of(decode_json)
+    print(
+        f"\n{len(content) / 1e6:.1f} MB: legacy {legacy_time * 1000:.1f} ms, decode_json {decode_time * 1000:.1f} ms"
+    )
+    assert decode_time < legacy_time
+
+
+def test_decode_transfer_benchmark():
+    """Micro-benchmark: returning a decoded page from a worker process costs about as much as decoding it.
+
+    The page is unpickled by the requesting thread, holding the GIL, so decoding
+    in worker processes would not let threads decode pages in parallel.
+    Jobs use several cores with process executors instead.
+    """
+    content = _observations_body(10000)
+    decoded = decode_json(content)
+    pickled = pickle.dumps(decoded, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def best_of(fn, repeat=5):
+        timings = []
+        for _i in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    decode_time = best_of(lambda: decode_json(content))
+    transfer_time = best_of(lambda: pickle.loads(pickled))  # noqa: S301
+    print(
+        f"\n{len(content) / 1e6:.1f} MB: decode_json {decode_time * 1000:.1f} ms, "
+        f"unpickle {transfer_time * 1000:.1f} ms"
+    )
+    assert transfer_time > decode_time / 2
+
+
+def test_rate_limiter_shared_by_site():
+    """All controlers of a site share the same rate limiter."""
+    close_sessions()
+    limiter = get_rate_limiter(SITE_URL, requests_per_second=5)
+    assert _api()._rate_limiter is limiter
+    assert _api(TaxoGroupsAPI)._rate_limiter is limiter
+    assert get_rate_limiter(SITE_URL, requests_per_second=50).requests_per_second == 5
+    close_sessions()
+
+
+def test_rate_limiter_rate():
+    """Requests are spaced by the token bucket, after the burst."""
+    limiter = RateLimiter(requests_per_second=50, burst=1)
+    start = time.monotonic()
+    for _i in range(6):
+        with limiter:
+            pass
+    # First request uses the burst token, 5 more at 50 requests/s
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+
+
+def test_rate_limiter_concurrency():
+    """No more than max_concurrent requests are in flight."""
+    limiter = RateLimiter(max_concurrent=2)
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def request():
+        with limiter:
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+
+    threads = [threading.Thread(target=request) for _i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert in_flight[1] == 2
+
+
+def test_max_requests(requests_mock):
+    """An API instance raises MaxRequestsError after max_requests requests."""
+    close_sessions()
+    _paginated(requests_mock, "get", [{"data": [{"id": "1"}]}, {"data": [{"id": "2"}]}])
+    api = _api(max_requests=1)
+    with pytest.raises(MaxRequestsError):
+        api.api_list()
+    assert api.nb_requests == 1
+    assert requests_mock.call_count == 1
+    close_sessions()
+
+
+def test_max_requests_shared_by_copies(requests_mock):
+    """Copies of an API instance, used by worker threads, share its max_requests limit."""
+    close_sessions()
+    _paginated(requests_mock, "get", [{"data": [{"id": "1"}]}])
+    api = _api(max_requests=2)
+    api.api_list()
+    copy(api).api_list()
+    with pytest.raises(MaxRequestsError):
+        copy(api).api_list()
+    assert api.nb_requests == 2
+    assert requests_mock.call_count == 2
+    close_sessions()
+
+
+def test_retry_policy_backoff():
+    """Delay grows exponentially, up to max_delay, with jitter."""
+    policy = RetryPolicy(retry_delay=1, max_delay=10, jitter=0)
+    assert [policy.delay(attempt) for attempt in range(1, 7)] == [1, 2, 4, 8, 10, 10]
+    policy = RetryPolicy(retry_delay=8, max_delay=100, jitter=0.5)
+    assert all(4 <= policy.delay(1) <= 8 for _i in range(20))
+
+
+def test_retry_policy_retry_after():
+    """Retry-After header, in seconds or HTTP date, takes precedence."""
+    policy = RetryPolicy(retry_delay=1, max_delay=60)
+    assert policy.delay(1, "30") == 30
+    assert policy.delay(1, "3600") == 60
+    assert policy.delay(1, "Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert 0 < policy.delay(1, "garbage") <= 1
+
+
+def test_retry_then_success(requests_mock):
+    """Server errors are retried, honoring Retry-After."""
+    close_sessions()
+    requests_mock.get(
+        re.compile(SITE_URL),
+        [
+            {"status_code": 503, "headers": {"Retry-After": "0"}},
+            {"status_code": 500},
+            {"json": {"data": [{"id": "1"}]}},
+        ],
+    )
+    api = _api()
+    assert api.api_list() == {"data": [{"id": "1"}]}
+    assert requests_mock.call_count == 3
+    assert api.transfer_errors == 0
+    close_sessions()
+
+
+def test_retry_budget_per_request(requests_mock):
+    """Each request has its own retry budget."""
+    close_sessions()
+    requests_mock.get(re.compile(SITE_URL), status_code=500)
+    api = _api()
+    for _i in range(2):
+        with pytest.raises(HTTPError):
+            api.api_list()
+    # Initial request and max_retry retries, for each call
+    assert requests_mock.call_count == 2 * 3
+    close_sessions()
+
+
+def test_circuit_breaker(requests_mock):
+    """Consecutive errors of the site suspend requests from all controlers."""
+    close_sessions()
+    breaker = get_circuit_breaker(SITE_URL, failure_threshold=2, reset_timeout=0.1)
+    requests_mock.get(re.compile(SITE_URL), status_code=500)
+    with pytest.raises(CircuitOpenError):
+        _api().api_list()
+    assert breaker.is_open
+    assert requests_mock.call_count == 2
+    # Other controlers fail immediately
+    with pytest.raises(CircuitOpenError):
+        _api(TaxoGroupsAPI).api_list()
+    assert requests_mock.call_count == 2
+    # After reset_timeout, a trial request closes the circuit
+    time.sleep(0.1)
+    requests_mock.get(re.compile(SITE_URL), json={"data": [{"id": "1"}]})
+    assert _api(TaxoGroupsAPI).api_list() == {"data": [{"id": "1"}]}
+    assert not breaker.is_open
+    close_sessions()
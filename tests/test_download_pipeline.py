@@ -0,0 +1,500 @@
+"""
+Test the download pipeline of download_vn module: chunks, concurrency...
+
+The API layer is mocked and the backend is kept in memory, so the tests
+run without VisioNature account nor database.
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from biolovision.api import HTTPError
+from export_vn import download_vn
+from export_vn.download_vn import (
+    DownloadVn,
+    Observations,
+    Places,
+    invalidate_reference_lists,
+    prefetched,
+    reference_list,
+    set_reference_ttl,
+)
+
+SITE = "tst"
+DUMMY = "unused-in-mocked-tests"
+
+
+class MemoryBackend:
+    """In-memory stand-in for StoreAll."""
+
+    def __init__(self):
+        self.stored = []
+        self.logged = []
+        self._ts = {}
+
+    def store(self, controler, seq, items_dict):
+        self.stored.append((controler, seq, items_dict))
+        data = items_dict["data"]
+        return len(data["sightings"]) if isinstance(data, dict) else len(data)
+
+    def log(self, *args, **kwargs):
+        self.logged.append(args)
+
+    def increment_get(self, site, taxo_group):
+        return self._ts.get((site, str(taxo_group)))
+
+    def increment_log(self, site, taxo_group, last_ts):
+        self._ts[(site, str(taxo_group))] = last_ts
+
+    def delete_obs(self, deleted):
+        pass
+
+
+def _mock_api(controler):
+    api = Mock()
+    api.controler = controler
+    api.transfer_errors = 0
+    api.http_status = 200
+    return api
+
+
+def _make_observations(backend, **kwargs):
+    return Observations(
+        site=SITE,
+        user_email="test@example.org",
+        user_pw=DUMMY,
+        base_url="https://example.org/",
+        client_key=DUMMY,
+        client_secret=DUMMY,
+        db_enabled=False,
+        db_user=DUMMY,
+        db_pw=DUMMY,
+        db_host=DUMMY,
+        db_port="5432",
+        db_name=DUMMY,
+        db_schema_import="import",
+        db_schema_vn="src_vn",
+        db_group=DUMMY,
+        db_out_proj="2154",
+        backend=backend,
+        **kwargs,
+    )
+
+
+def _t_unit(short_name):
+    return [{"id": short_name, "id_country": "1", "short_name": short_name, "name": "tu " + short_name}]
+
+
+def test_store_each_chunk():
+    """DownloadVn.store sends each chunk to the backend as it is received."""
+    backend = MemoryBackend()
+    api = _mock_api("species")
+    api.api_list_iter.return_value = iter([{"data": [{"id": "1"}]}, {"data": [{"id": "2"}]}])
+    api.last_response_bytes = 42
+    DownloadVn(SITE, api, backend).store()
+    assert [seq for _, seq, _ in backend.stored] == ["1", "1_1"]
+    assert len(backend.logged) == 1
+    # Logged length is the size of the responses received
+    assert backend.logged[0][5] == 42
+
+
+def test_store_search_each_chunk():
+    """Observations search stores each chunk, in sequence."""
+    backend = MemoryBackend()
+    # A single date interval, covering the whole history
+    obs = _make_observations(backend, pid_delta_days=100000)
+    obs._t_units = [_t_unit("38")]
+    api = _mock_api("observations")
+    api.api_search_iter.side_effect = lambda q, **kw: iter([
+        {"data": {"sightings": [{"id": "1"}, {"id": "2"}]}},
+        {"data": {"sightings": [{"id": "3"}]}},
+    ])
+    obs._api_instance = api
+    obs._store_search("1")
+    assert [seq for _, seq, _ in backend.stored] == ["1_138_1", "1_138_1_1"]
+
+
+def test_store_search_concurrent_ordered():
+    """Territorial_units are downloaded concurrently, but stored in order."""
+    backend = MemoryBackend()
+    obs = _make_observations(backend, pid_delta_days=100000, search_workers=3)
+    obs._t_units = [_t_unit(t) for t in ("01", "07", "26", "38", "73")]
+    started = []
+    release = threading.Event()
+
+    def search(q, **kw):
+        started.append(q["territorial_unit_ids"][0])
+        if len(started) == 3:
+            release.set()
+        # The first territorial_units wait for the others to start
+        release.wait(5)
+        t_u = q["territorial_unit_ids"][0]
+        return iter([{"data": {"sightings": [{"id": t_u}]}}])
+
+    api = _mock_api("observations")
+    api.api_search_iter.side_effect = search
+    obs._api_instance = api
+    obs._store_search("1")
+    assert release.is_set()
+    assert [seq for _, seq, _ in backend.stored] == ["1_101_1", "1_107_1", "1_126_1", "1_138_1", "1_173_1"]
+    assert len(backend.logged) == 5
+
+
+def test_store_search_concurrent_bounded():
+    """Chunks of concurrent territorial_units are stored as they arrive, without loading whole units."""
+    backend = MemoryBackend()
+    obs = _make_observations(backend, pid_delta_days=100000, search_workers=2, prefetch_chunks=1)
+    obs._t_units = [_t_unit(t) for t in ("01", "07", "26")]
+    fetched = []
+    waiting = []
+    store = backend.store
+
+    def counting_store(*args):
+        waiting.append(len(fetched) - len(backend.stored))
+        return store(*args)
+
+    backend.store = counting_store
+
+    def search(q, **kw):
+        t_u = q["territorial_unit_ids"][0]
+        for i in range(20):
+            fetched.append(t_u)
+            yield {"data": {"sightings": [{"id": t_u + str(i)}]}}
+
+    api = _mock_api("observations")
+    api.api_search_iter.side_effect = search
+    obs._api_instance = api
+    obs._store_search("1")
+    assert len(backend.stored) == 60
+    assert [items["data"]["sightings"][0]["id"] for _, _, items in backend.stored][::20] == ["1010", "1070", "1260"]
+    # Each worker fetches at most one chunk ahead, plus the one it is queueing
+    assert max(waiting) <= 2 * 2 + 1
+
+
+def test_prefetched():
+    """Items are fetched ahead, in order, and producer errors are raised again."""
+    assert list(prefetched(iter(range(10)), 2)) == list(range(10))
+    assert list(prefetched(iter(range(10)), 0)) == list(range(10))
+
+    def failing():
+        yield 1
+        raise HTTPError(500)
+
+    received = []
+    with pytest.raises(HTTPError):
+        for item in prefetched(failing(), 2):
+            received.append(item)
+    assert received == [1]
+
+
+def test_prefetched_bounded():
+    """The producer stops fetching when the queue is full, and when the consumer stops."""
+    fetched = []
+
+    def produce():
+        for i in range(100):
+            fetched.append(i)
+            yield i
+
+    items = prefetched(produce(), 2)
+    assert next(items) == 0
+    time.sleep(0.3)
+    # One item consumed, two waiting in the queue and one waiting to be queued
+    assert len(fetched) <= 4
+    items.close()
+    assert len(fetched) <= 4
+
+
+def test_store_pipelined():
+    """Next chunk is downloaded while the previous one is stored."""
+    delay = 0.2
+    backend = MemoryBackend()
+    store = backend.store
+
+    def slow_store(*args):
+        time.sleep(delay)
+        return store(*args)
+
+    backend.store = slow_store
+
+    def chunks():
+        for i in range(4):
+            time.sleep(delay)
+            yield {"data": [{"id": str(i)}]}
+
+    api = _mock_api("species")
+    api.api_list_iter.side_effect = lambda **kw: chunks()
+    start = time.perf_counter()
+    DownloadVn(SITE, api, backend).store()
+    assert time.perf_counter() - start < 8 * delay * 0.8
+    assert [seq for _, seq, _ in backend.stored] == ["1", "1_1", "1_2", "1_3"]
+
+
+def test_store_http_error_logged():
+    """HTTP errors raised while downloading ahead are logged by the consumer."""
+    backend = MemoryBackend()
+
+    def chunks():
+        yield {"data": [{"id": "1"}]}
+        raise HTTPError(500)
+
+    api = _mock_api("species")
+    api.api_list_iter.side_effect = lambda **kw: chunks()
+    DownloadVn(SITE, api, backend).store()
+    assert [seq for _, seq, _ in backend.stored] == ["1"]
+    assert backend.logged[-1][4] == "HTTP error during download"
+
+
+def test_update_concurrent_ordered():
+    """Slices of updated observations are downloaded concurrently, but stored in order."""
+    backend = MemoryBackend()
+    backend.increment_log(SITE, "1", "2024-01-01")
+    backend.increment_log(SITE, "2", "2024-02-01")
+    obs = _make_observations(backend, search_workers=3, max_list_length=2)
+    started = []
+    release = threading.Event()
+
+    def list_slice(taxo, id_sightings_list, **kw):
+        started.append(id_sightings_list)
+        if len(started) == 3:
+            release.set()
+        # The first slices wait for the others to start
+        release.wait(5)
+        return {"data": {"sightings": [{"id": i} for i in id_sightings_list.split(",")]}}
+
+    api = _mock_api("observations")
+    api.api_diff.side_effect = lambda taxo, since, **kw: (
+        [{"id_sighting": str(taxo) + str(i), "id_universal": "1", "modification_type": "updated"} for i in range(5)]
+        + [{"id_sighting": "99", "id_universal": "1", "modification_type": "deleted"}]
+    )
+    api.api_list.side_effect = list_slice
+    deleted = []
+    backend.delete_obs = deleted.append
+    obs._api_instance = api
+    obs.update(id_taxo_group=["1", "2"])
+    assert release.is_set()
+    # Each taxo_group is updated since its own last download
+    assert [c.args[:2] for c in api.api_diff.call_args_list] == [("1", "2024-01-01"), ("2", "2024-02-01")]
+    assert [items["data"]["sightings"] for _, _, items in backend.stored] == [
+        [{"id": "10"}, {"id": "11"}],
+        [{"id": "12"}, {"id": "13"}],
+        [{"id": "14"}],
+        [{"id": "20"}, {"id": "21"}],
+        [{"id": "22"}, {"id": "23"}],
+        [{"id": "24"}],
+    ]
+    assert deleted == [["99"], ["99"]]
+    assert len(backend.logged) == 6
+
+
+def test_places_update_batched():
+    """Updated places are downloaded concurrently and stored in pages of max_list_length."""
+    backend = MemoryBackend()
+    backend.increment_log(SITE, -1, "2024-01-01")
+    places = Places(
+        site=SITE,
+        user_email="test@example.org",
+        user_pw=DUMMY,
+        base_url="https://example.org/",
+        client_key=DUMMY,
+        client_secret=DUMMY,
+        backend=backend,
+        max_list_length=2,
+        search_workers=2,
+    )
+    api = _mock_api("places")
+    api.last_response_bytes = 10
+    api.api_diff.return_value = [{"id_place": str(i), "modification_type": "updated"} for i in range(5)]
+    api.api_get.side_effect = lambda id_place: {"data": [{"id": id_place}]}
+    places._api_instance = api
+    places.update()
+    assert api.api_get.call_count == 5
+    assert [(seq, items["data"]) for _, seq, items in backend.stored] == [
+        ("upd_0", [{"id": "0"}, {"id": "1"}]),
+        ("upd_1", [{"id": "2"}, {"id": "3"}]),
+        ("upd_2", [{"id": "4"}]),
+    ]
+    # One log entry for each page
+    assert [logged[5] for logged in backend.logged] == [20, 20, 10]
+
+
+def test_reference_list_cached():
+    """Reference lists are fetched once, until invalidated or expired."""
+    invalidate_reference_lists()
+    fetched = []
+
+    def fetch():
+        fetched.append(1)
+        return [{"id": str(len(fetched))}]
+
+    assert reference_list(SITE, "taxo_groups", fetch) == [{"id": "1"}]
+    assert reference_list(SITE, "taxo_groups", fetch) == [{"id": "1"}]
+    assert reference_list("other", "taxo_groups", fetch) == [{"id": "2"}]
+    invalidate_reference_lists(SITE, "taxo_groups")
+    assert reference_list(SITE, "taxo_groups", fetch) == [{"id": "3"}]
+    assert reference_list("other", "taxo_groups", fetch) == [{"id": "2"}]
+    set_reference_ttl(0)
+    try:
+        assert reference_list(SITE, "taxo_groups", fetch) == [{"id": "4"}]
+    finally:
+        set_reference_ttl()
+        invalidate_reference_lists()
+
+
+def test_reference_list_fields():
+    """Lists of projected and complete items are cached separately, and invalidated together."""
+    invalidate_reference_lists()
+    full = [{"id": "1", "id_country": "1", "short_name": "38", "name": "Isère", "coord_lat": 45.2}]
+    projected = [{"id": "1", "short_name": "38"}]
+    assert reference_list(SITE, "territorial_units", lambda: projected, ["id", "short_name"]) == projected
+    assert reference_list(SITE, "territorial_units", lambda: full) == full
+    assert reference_list(SITE, "territorial_units", lambda: [], ["id", "short_name"]) == projected
+    invalidate_reference_lists(SITE, "territorial_units")
+    assert reference_list(SITE, "territorial_units", lambda: [], ["id", "short_name"]) == []
+    assert reference_list(SITE, "territorial_units", lambda: []) == []
+    invalidate_reference_lists()
+
+
+def test_reference_list_shared(monkeypatch):
+    """Taxo_groups are downloaded once for all Observations instances, and again after being stored."""
+    invalidate_reference_lists()
+    taxo_api = Mock()
+    taxo_api.return_value.api_list.return_value = {
+        "data": [{"id": "1", "name": "Oiseaux", "name_constant": "TAXO_GROUP_BIRD", "access_mode": "full"}]
+    }
+    monkeypatch.setattr(download_vn, "TaxoGroupsAPI", taxo_api)
+    for _i in range(3):
+        assert _make_observations(MemoryBackend())._list_taxo_groups(None, []) == ["1"]
+    assert taxo_api.return_value.api_list.call_count == 1
+
+    api = _mock_api("taxo_groups")
+    api.api_list_iter.return_value = iter([{"data": []}])
+    DownloadVn(SITE, api, MemoryBackend()).store()
+    assert _make_observations(MemoryBackend())._list_taxo_groups(None, []) == ["1"]
+    assert taxo_api.return_value.api_list.call_count == 2
+    invalidate_reference_lists()
+
+
+class _StreamingRead:
+    """Stand-in for ReadPostgresql, recording the items streamed."""
+
+    def __init__(self, items):
+        self.items = items
+        self.streamed = []
+        self.fields = None
+
+    def __call__(self, *args):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def read_iter(self, controler, fields=None):
+        self.fields = fields
+        for item in self.items:
+            self.streamed.append(item["id"])
+            yield item
+
+
+def test_places_local_admin_units_streamed(monkeypatch):
+    """Places streams local_admin_units from the database, without the API."""
+    invalidate_reference_lists()
+    read = _StreamingRead([
+        {"id": "1", "id_canton": "10"},
+        {"id": "2", "id_canton": "20"},
+        {"id": "3", "id_canton": "10"},
+    ])
+    l_a_u_api = Mock()
+    monkeypatch.setattr(download_vn, "ReadPostgresql", read)
+    monkeypatch.setattr(download_vn, "LocalAdminUnitsAPI", l_a_u_api)
+    stored = []
+
+    def store(self, opt_params_iter=None, file_id=None):
+        # Items are consumed while places are downloaded
+        stored.append((opt_params_iter[0]["id_commune"], file_id, len(read.streamed)))
+
+    monkeypatch.setattr(DownloadVn, "store", store)
+    places = Places(
+        site=SITE,
+        user_email="test@example.org",
+        user_pw=DUMMY,
+        base_url="https://example.org/",
+        client_key=DUMMY,
+        client_secret=DUMMY,
+        backend=MemoryBackend(),
+        db_enabled=True,
+    )
+    places.store(territorial_unit_ids=["10"])
+    assert stored == [("1", "10_1_", 1), ("3", "10_3_", 3)]
+    assert read.fields == download_vn._L_A_UNITS_FIELDS
+    l_a_u_api.assert_not_called()
+
+    # Empty table: read from API
+    read.items = []
+    l_a_u_api.return_value.api_list.return_value = {"data": [{"id": "4", "id_canton": "30"}]}
+    stored.clear()
+    places.store()
+    assert stored == [("4", None, 3)]
+    invalidate_reference_lists()
+
+
+def test_update_watermark_after_store():
+    """Each taxo_group watermark is advanced only after its modifications are stored."""
+    backend = MemoryBackend()
+    backend.increment_log(SITE, "1", "2024-01-01")
+    backend.increment_log(SITE, "2", "2024-02-01")
+    obs = _make_observations(backend, search_workers=2)
+
+    def diff(taxo, since, **kw):
+        if taxo == "2":
+            raise HTTPError(504)
+        return [{"id_sighting": "10", "id_universal": "1", "modification_type": "updated"}]
+
+    api = _mock_api("observations")
+    api.api_diff.side_effect = diff
+    api.api_list.return_value = {"data": {"sightings": [{"id": "10"}]}}
+    obs._api_instance = api
+    with pytest.raises(HTTPError):
+        obs.update(id_taxo_group=["1", "2"])
+    assert len(backend.stored) == 1
+    assert backend.increment_get(SITE, "1") != "2024-01-01"
+    assert backend.increment_get(SITE, "2") == "2024-02-01"
+
+
+class _SliceAPI:
+    """Observations API failing on a slice, with its own error status."""
+
+    controler = "observations"
+
+    def __init__(self):
+        self.transfer_errors = 0
+        self.http_status = 200
+        self.last_response_bytes = 0
+
+    def api_diff(self, taxo, since, **kw):
+        return [{"id_sighting": str(i), "id_universal": "1", "modification_type": "updated"} for i in range(4)]
+
+    def api_list(self, taxo, id_sightings_list, **kw):
+        if id_sightings_list == "2,3":
+            self.transfer_errors = 3
+            self.http_status = 504
+            raise HTTPError(504)
+        return {"data": {"sightings": [{"id": i} for i in id_sightings_list.split(",")]}}
+
+
+def test_update_error_logged_from_failing_copy():
+    """HTTP errors of concurrent downloads are logged with the status of the API copy that failed."""
+    backend = MemoryBackend()
+    backend.increment_log(SITE, "1", "2024-01-01")
+    obs = _make_observations(backend, search_workers=2, max_list_length=2)
+    obs._api_instance = _SliceAPI()
+    obs.update(id_taxo_group="1")
+    assert len(backend.stored) == 1
+    assert backend.logged[-1] == (SITE, "observations", 3, 504, "HTTP error during download")
+    assert backend.increment_get(SITE, "1") == "2024-01-01"
@@ -92,13 +92,12 @@ def _make_observations(backend):
 # ---------------------------------------------------------------------------
 # Bug 1: the watermark must not advance past data that was not persisted.
 # ---------------------------------------------------------------------------
-@pytest.mark.xfail(strict=True, reason="bug: increment_log(now) is called before store(); remove when fixed")
 def test_increment_watermark_not_advanced_on_failure():
     """If fetching/persisting the updates fails, the watermark must stay put.
 
-    Reproduces the core data-loss bug: Observations.update() calls
+    Reproduces the core data-loss bug: Observations.update() called
     increment_log(now) *before* api_diff() and store(). If the download then
-    fails, the next run starts from `now` and never re-downloads the
+    failed, the next run started from `now` and never re-downloaded the
     observations modified in between.
     """
     t0 = datetime(2024, 1, 1, 0, 0, 0)
@@ -148,14 +147,11 @@ def test_increment_watermark_advances_on_success():
 # ---------------------------------------------------------------------------
 # Bug 2: an empty server response must be absorbed, not abort the download.
 # ---------------------------------------------------------------------------
-@pytest.mark.xfail(strict=True, reason='bug: resp.json("{}") raises TypeError on empty body; remove when fixed')
 def test_empty_response_does_not_abort(requests_mock):
     """A 200 response with an empty body must not raise.
 
-    After a Gateway Timeout the server may return an empty body. In
-    BiolovisionAPI._url the empty branch calls ``resp.json("{}")`` which raises
-    TypeError (json() takes no positional argument), aborting the whole
-    download instead of treating the chunk as "no data".
+    After a Gateway Timeout the server may return an empty body. It must be
+    treated as "no data", instead of aborting the whole download.
     """
     api = EntitiesAPI(
         user_email="test@example.org",
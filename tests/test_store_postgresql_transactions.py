@@ -14,10 +14,11 @@ They cover the behavior introduced by the SQLAlchemy 2.0 migration:
 
 import pytest
 from dynaconf import Dynaconf
+from pyproj import Transformer
 from sqlalchemy import create_engine, exc, text
 from sqlalchemy.engine.url import URL
 
-from export_vn.store_postgresql import ReadPostgresql, StorePostgresql
+from export_vn.store_postgresql import PostgresqlUtils, ReadPostgresql, StorePostgresql, dispose_engines
 
 FILE = "evn_test.toml"
 
@@ -138,3 +139,294 @@ def test_reads_release_transaction(store_pg, monitor):
     store_pid = _backend_pid(store_pg)
     store_pg.increment_get(settings["SITE"]["name"], 1)
     assert _backend_state(monitor, store_pid) == "idle"
+
+
+def test_read_iter_projects_fields(store_pg, monitor):
+    """read_iter streams items, with only the requested keys, and releases the transaction."""
+    items = {"data": [{"id": i, "short_name": "pytest entity", "full_name": "not read"} for i in TEST_IDS]}
+    assert store_pg.store("entities", "1", items) == 2
+    with ReadPostgresql(**_pg_params()) as read_pg:
+        read_pid = _backend_pid(read_pg)
+        streamed = [
+            item for item in read_pg.read_iter("entities", ["id", "short_name"], yield_per=1) if item["id"] in TEST_IDS
+        ]
+        assert sorted(streamed, key=lambda item: item["id"]) == [
+            {"id": i, "short_name": "pytest entity"} for i in TEST_IDS
+        ]
+        assert _backend_state(monitor, read_pid) == "idle"
+        read_ids = [row.item["id"] for row in read_pg.read("entities", ["id"]) if row.item["id"] in TEST_IDS]
+        assert sorted(read_ids) == TEST_IDS
+
+
+def test_store_batches_upsert(store_pg, monitor):
+    """Batched upsert inserts, then updates, keeping the last duplicate."""
+    batch_pg = StorePostgresql(**_pg_params(), batch_size=1)
+    try:
+        items = {
+            "data": [
+                {"id": TEST_IDS[0], "short_name": "first"},
+                {"id": TEST_IDS[1], "short_name": "second"},
+                {"id": TEST_IDS[0], "short_name": "first, updated in page"},
+            ]
+        }
+        assert batch_pg.store("entities", "1", items) == 3
+        assert _count_test_rows(monitor) == 2
+        items = {"data": [{"id": TEST_IDS[1], "short_name": "second, updated"}]}
+        assert store_pg.store("entities", "2", items) == 1
+    finally:
+        batch_pg.__exit__(None, None, None)
+    schema = settings["DATABASE"]["db_schema_import"]
+    with monitor.connect() as conn:
+        names = conn.execute(
+            text(f"SELECT id, item->>'short_name' FROM {schema}.entities_json WHERE id = ANY(:ids) ORDER BY id"),  # noqa: S608
+            {"ids": TEST_IDS},
+        ).all()
+    assert [tuple(n) for n in names] == [
+        (TEST_IDS[0], "first, updated in page"),
+        (TEST_IDS[1], "second, updated"),
+    ]
+
+
+def _sighting(id_sighting, ts, comment):
+    return {
+        "date": {"@timestamp": str(ts)},
+        "species": {"@id": "1"},
+        "comment": comment,
+        "observers": [
+            {
+                "@uid": "1",
+                "id_sighting": str(id_sighting),
+                "id_universal": f"1_{id_sighting}",
+                "update_date": ts,
+                "coord_lon": 5.72,
+                "coord_lat": 45.18,
+            }
+        ],
+    }
+
+
+def test_store_bulk_load_observations(monitor):
+    """Bulk load keeps the most recent version of each observation."""
+    bulk_pg = StorePostgresql(**_pg_params(), bulk_load=True)
+    schema = settings["DATABASE"]["db_schema_import"]
+    try:
+        items = {
+            "data": {
+                "sightings": [
+                    _sighting(TEST_IDS[0], 1700000000, "first"),
+                    _sighting(TEST_IDS[1], 1700000000, "second"),
+                    _sighting(TEST_IDS[0], 1700000100, "first, updated in page"),
+                ]
+            }
+        }
+        assert bulk_pg.store("observations", "1", items) == 3
+        items = {
+            "data": {
+                "sightings": [
+                    _sighting(TEST_IDS[0], 1700000050, "first, older"),
+                    _sighting(TEST_IDS[1], 1700000200, "second, updated"),
+                ]
+            }
+        }
+        assert bulk_pg.store("observations", "2", items) == 2
+        with monitor.connect() as conn:
+            rows = conn.execute(
+                text(
+                    f"SELECT id, update_ts, item->>'comment' FROM {schema}.observations_json "  # noqa: S608
+                    "WHERE id = ANY(:ids) ORDER BY id"
+                ),
+                {"ids": TEST_IDS},
+            ).all()
+        assert [tuple(r) for r in rows] == [
+            (TEST_IDS[0], 1700000100, "first, updated in page"),
+            (TEST_IDS[1], 1700000200, "second, updated"),
+        ]
+    finally:
+        bulk_pg.__exit__(None, None, None)
+        with monitor.begin() as conn:
+            conn.execute(
+                text(f"DELETE FROM {schema}.observations_json WHERE id = ANY(:ids)"),  # noqa: S608
+                {"ids": TEST_IDS},
+            )
+
+
+def test_store_reprojects_page(store_pg, monitor):
+    """Sightings, sightings in forms and forms get the same local coordinates as a scalar transform."""
+    schema = settings["DATABASE"]["db_schema_import"]
+    form = {
+        "@id": str(TEST_IDS[0]),
+        "id_form_universal": f"1_{TEST_IDS[0]}",
+        "lon": 5.9,
+        "lat": 45.5,
+        "sightings": [_sighting(TEST_IDS[1], 1700000000, "in form")],
+    }
+    items = {"data": {"sightings": [_sighting(TEST_IDS[0], 1700000000, "single")], "forms": [form]}}
+    try:
+        assert store_pg.store("observations", "1", items) == 2
+        with monitor.connect() as conn:
+            obs = conn.execute(
+                text(
+                    f"SELECT (item->'observers'->0->>'coord_x_local')::float, "  # noqa: S608
+                    f"(item->'observers'->0->>'coord_y_local')::float FROM {schema}.observations_json "
+                    "WHERE id = ANY(:ids) ORDER BY id"
+                ),
+                {"ids": TEST_IDS},
+            ).all()
+            forms = conn.execute(
+                text(
+                    f"SELECT (item->>'coord_x_local')::float, (item->>'coord_y_local')::float "  # noqa: S608
+                    f"FROM {schema}.forms_json WHERE id = :id"
+                ),
+                {"id": TEST_IDS[0]},
+            ).all()
+    finally:
+        with monitor.begin() as conn:
+            for table in ("observations_json", "forms_json"):
+                conn.execute(
+                    text(f"DELETE FROM {schema}.{table} WHERE id = ANY(:ids)"),  # noqa: S608
+                    {"ids": TEST_IDS},
+                )
+    transformer = Transformer.from_proj(4326, int(settings["DATABASE"]["db_out_proj"]), always_xy=True)
+    assert [tuple(o) for o in obs] == [pytest.approx(transformer.transform(5.72, 45.18))] * 2
+    assert tuple(forms[0]) == pytest.approx(transformer.transform(5.9, 45.5))
+
+
+def test_delete_obs_batches(monitor):
+    """Batched delete returns the exact count of observations deleted."""
+    batch_pg = StorePostgresql(**_pg_params(), batch_size=1)
+    schema = settings["DATABASE"]["db_schema_import"]
+    try:
+        items = {"data": {"sightings": [_sighting(i, 1700000000, "to delete") for i in TEST_IDS]}}
+        assert batch_pg.store("observations", "1", items) == 2
+        # Unknown ids are not counted
+        assert batch_pg.delete_obs([str(i) for i in TEST_IDS] + ["999999999"]) == 2
+        with monitor.connect() as conn:
+            nb_obs = conn.execute(
+                text(f"SELECT COUNT(*) FROM {schema}.observations_json WHERE id = ANY(:ids)"),  # noqa: S608
+                {"ids": TEST_IDS},
+            ).scalar()
+        assert nb_obs == 0
+    finally:
+        batch_pg.__exit__(None, None, None)
+
+
+def test_refresh_col_tables(monitor):
+    """With triggers disabled, column table is only updated by the set-based refresh."""
+    params = _pg_params()
+    site = params.pop("site")
+    params.pop("db_out_proj")
+    utils = PostgresqlUtils(**params)
+    store = StorePostgresql(**_pg_params(), bulk_load=True)
+    schema_import = settings["DATABASE"]["db_schema_import"]
+    schema_vn = settings["DATABASE"]["db_schema_vn"]
+
+    def col_comments():
+        with monitor.connect() as conn:
+            rows = conn.execute(
+                text(
+                    f"SELECT id_sighting, comment FROM {schema_vn}.observations "  # noqa: S608
+                    "WHERE id_sighting = ANY(:ids) AND site = :site ORDER BY id_sighting"
+                ),
+                {"ids": TEST_IDS, "site": site},
+            ).all()
+        return [tuple(r) for r in rows]
+
+    try:
+        # Triggers are kept while other sites are stored in the database
+        with monitor.begin() as conn:
+            conn.execute(
+                text(f"INSERT INTO {schema_import}.increment_log (site, taxo_group) VALUES ('pytest_other', 1)")  # noqa: S608
+            )
+        assert not utils.disable_col_triggers([site])
+        with monitor.begin() as conn:
+            conn.execute(text(f"DELETE FROM {schema_import}.increment_log WHERE site = 'pytest_other'"))  # noqa: S608
+        assert utils.disable_col_triggers([site])
+        items = {"data": {"sightings": [_sighting(i, 1700000000, "bulk") for i in TEST_IDS]}}
+        assert store.store("observations", "1", items) == 2
+        assert col_comments() == []
+        assert utils.refresh_col_tables(site, since=1700000000) >= 2
+        assert col_comments() == [(TEST_IDS[0], "bulk"), (TEST_IDS[1], "bulk")]
+        # Trigger is enabled again
+        assert store.delete_obs([str(TEST_IDS[0])]) == 1
+        assert col_comments() == [(TEST_IDS[1], "bulk")]
+    finally:
+        store.__exit__(None, None, None)
+        with monitor.begin() as conn:
+            conn.execute(
+                text(f"DELETE FROM {schema_import}.observations_json WHERE id = ANY(:ids)"),  # noqa: S608
+                {"ids": TEST_IDS},
+            )
+
+
+def test_statement_triggers_places(store_pg, monitor):
+    """A page of places is copied to the column table, then deleted, by statement triggers."""
+    site = settings["SITE"]["name"]
+    schema_import = settings["DATABASE"]["db_schema_import"]
+    schema_vn = settings["DATABASE"]["db_schema_vn"]
+
+    def col_names():
+        with monitor.connect() as conn:
+            rows = conn.execute(
+                text(
+                    f"SELECT id, name FROM {schema_vn}.places "  # noqa: S608
+                    "WHERE id = ANY(:ids) AND site = :site ORDER BY id"
+                ),
+                {"ids": TEST_IDS, "site": site},
+            ).all()
+        return [tuple(r) for r in rows]
+
+    places = [{"id": str(i), "name": f"place {i}", "coord_lon": 5.72, "coord_lat": 45.18} for i in TEST_IDS]
+    try:
+        assert store_pg.store("places", "1", {"data": places}) == 2
+        assert col_names() == [(i, f"place {i}") for i in TEST_IDS]
+        places[0]["name"] = "renamed"
+        assert store_pg.store("places", "2", {"data": places}) == 2
+        assert col_names() == [(TEST_IDS[0], "renamed"), (TEST_IDS[1], f"place {TEST_IDS[1]}")]
+        assert store_pg.delete_place([str(i) for i in TEST_IDS]) == 2
+        assert col_names() == []
+    finally:
+        with monitor.begin() as conn:
+            conn.execute(
+                text(f"DELETE FROM {schema_import}.places_json WHERE id = ANY(:ids)"),  # noqa: S608
+                {"ids": TEST_IDS},
+            )
+
+
+def test_engine_and_tables_shared():
+    """Stores of the same database share the engine and the reflected tables."""
+    dispose_engines()
+    with StorePostgresql(**_pg_params()) as store_1, ReadPostgresql(**_pg_params()) as store_2:
+        assert store_1._db is store_2._db
+        assert store_1._metadata is store_2._metadata
+        assert store_1._table_defs["entities"]["metadata"] is store_2._table_defs["entities"]["metadata"]
+    dispose_engines()
+    with StorePostgresql(**_pg_params()) as store_3:
+        assert store_3._db is not store_1._db
+        assert store_3._metadata is not store_1._metadata
+
+
+def test_log_write_behind(monitor):
+    """With log_interval, download_log entries are buffered and written on exit."""
+    schema = settings["DATABASE"]["db_schema_import"]
+    comment = "pytest write-behind"
+
+    def count_logs():
+        with monitor.connect() as conn:
+            return conn.execute(
+                text(f"SELECT COUNT(*) FROM {schema}.download_log WHERE comment = :comment"),  # noqa: S608
+                {"comment": comment},
+            ).scalar()
+
+    try:
+        with StorePostgresql(**_pg_params(), log_interval=3600) as log_pg:
+            for _i in range(3):
+                log_pg.log(settings["SITE"]["name"], "entities", 0, 200, comment, 10, 5)
+            assert count_logs() == 0
+        assert count_logs() == 3
+    finally:
+        dispose_engines()
+        with monitor.begin() as conn:
+            conn.execute(
+                text(f"DELETE FROM {schema}.download_log WHERE comment = :comment"),  # noqa: S608
+                {"comment": comment},
+            )
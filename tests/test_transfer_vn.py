@@ -2,6 +2,8 @@
 Test transfer_vn main.
 """
 
+import inspect
+import re
 from pathlib import Path
 from unittest.mock import patch
 
@@ -94,3 +96,195 @@ def test_status():
     file_toml = "evn_test.toml"
     with patch("sys.argv", ["py.test", "--status", file_toml]):
         transfer_vn.run()
+
+
+_jobs_added = []
+
+
+class _RecordingJobs:
+    """Stand-in for Jobs, recording the jobs added."""
+
+    def __init__(self, url, nb_executors, executor):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def start(self, paused=False):
+        pass
+
+    def resume(self):
+        pass
+
+    def remove_all_jobs(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+    def count_jobs(self):
+        return 0
+
+    def add_job_once(self, job_fn, args=None, kwargs=None, job_id=None):
+        _jobs_added.append((job_id, args[1]["SITE"]["name"]))
+
+
+def _site_settings(name, controlers):
+    return Dynaconf(
+        SITE={"name": name, "site_url": f"https://{name}.example.org/"},
+        DATABASE={
+            "enabled": False,
+            **dict.fromkeys(
+                ("db_user", "db_pw", "db_host", "db_port", "db_name", "db_schema_import", "db_schema_vn", "db_group"),
+                "unused",
+            ),
+        },
+        CONTROLER={ctrl: {"enabled": ctrl in controlers} for ctrl in transfer_vn.CTRL_DEFS},
+        TUNING={
+            "pool_size": 2,
+            "max_retry": 1,
+            "requests_per_second": 0,
+            "max_concurrent_requests": 0,
+            "circuit_failures": 0,
+            "circuit_reset": 1,
+            "sched_sqllite_file": "unused.sqlite",
+            "sched_executors": 2,
+            "sched_executor_type": "thread",
+            "reference_ttl": 3600,
+        },
+    )
+
+
+def test_multi_site_full_download(monkeypatch):
+    """Controlers of all sites are scheduled in a single scheduler, interleaved by controler."""
+    monkeypatch.setattr(transfer_vn, "Jobs", _RecordingJobs)
+    _jobs_added.clear()
+    transfer_vn.full_download([
+        _site_settings("s1", ["species", "observations"]),
+        _site_settings("s2", ["species", "observations", "places"]),
+    ])
+    assert _jobs_added == [
+        ("s1_observations", "s1"),
+        ("s2_observations", "s2"),
+        ("s2_places", "s2"),
+        ("s1_species", "s1"),
+        ("s2_species", "s2"),
+    ]
+
+
+def test_multi_site_arguments():
+    """Several configuration files can be given, one per site."""
+    args = transfer_vn.arguments(["--full", "evn_38.toml", "evn_73.toml"])
+    assert args.file == ["evn_38.toml", "evn_73.toml"]
+
+
+# Configuration written before tuning parameters were added
+_OLD_CONFIG = """
+[site]
+name = "faune-xxx"
+site_url = "https://www.faune-xxx.org/"
+user_email = "nom.prenom@example.net"
+user_pw = "user_pw"
+client_key = "client_key_0123456789"
+client_secret = "client_secret"
+
+[file]
+file_store = "VN_files"
+
+[database]
+enabled = false
+db_host = "localhost"
+db_port = 5432
+db_name = "faune_xxx"
+db_schema_import = "import"
+db_schema_vn = "src_vn"
+db_group = "lpo_xxx"
+db_user = "xferxx"
+db_pw = "db_password"
+db_out_proj = 2154
+
+[tuning]
+max_list_length = 100
+max_chunks = 1000
+sched_executors = 1
+"""
+
+
+def test_load_settings_defaults(tmp_path):
+    """Parameters missing from an older configuration get defaults, read with lowercase keys by jobs."""
+    config = tmp_path / "evn_old.toml"
+    config.write_text(_OLD_CONFIG)
+    settings = transfer_vn.load_settings(str(config)).as_dict()
+    assert settings["TUNING"]["reference_ttl"] == 3600
+    assert settings["TUNING"]["pool_size"] == 10
+    assert settings["TUNING"]["db_bulk_load"] is False
+    assert settings["TUNING"]["db_log_interval"] == 0
+    assert settings["TUNING"]["max_list_length"] == 100
+    assert settings["SITE"]["enabled"] is True
+    transfer_vn._site_pools(settings)
+
+
+def test_load_settings_download_defaults(tmp_path):
+    """Tuning parameters read by download jobs all have defaults in an older configuration."""
+    config = tmp_path / "evn_old.toml"
+    config.write_text(_OLD_CONFIG)
+    settings = transfer_vn.load_settings(str(config)).as_dict()
+    source = inspect.getsource(transfer_vn.full_download_1) + inspect.getsource(transfer_vn.increment_download_1)
+    keys = set(re.findall(r'settings\["TUNING"\]\["(\w+)"\]', source))
+    assert {"db_batch_size", "db_log_interval", "search_workers", "prefetch_chunks"} <= keys
+    assert keys <= settings["TUNING"].keys()
+
+
+def test_refresh_scheduled_jobs(tmp_path):
+    """Jobs scheduled with an older configuration get the current settings."""
+    url = "sqlite:///" + str(tmp_path / "jobs.sqlite")
+    old_settings = {"SITE": {"name": "s1"}, "TUNING": {"max_list_length": 100}}
+    jobs = transfer_vn.Jobs(url=url)
+    jobs.add_job_schedule(
+        job_fn=transfer_vn.increment_download_1,
+        args=["species", old_settings],
+        hour="3",
+        job_id="species",
+    )
+    jobs.add_job_schedule(
+        job_fn=transfer_vn.increment_download_1,
+        args=["places", old_settings],
+        hour="3",
+        job_id="places",
+    )
+    jobs.start(paused=True)
+    jobs.shutdown()
+
+    settings = _site_settings("s1", ["species"])
+    jobs = transfer_vn.Jobs(url=url)
+    jobs.start(paused=True)
+    jobs.refresh_jobs({"species": ["species", settings.as_dict()]})
+    stored = {j.id: j.args for j in jobs._scheduler.get_jobs()}
+    jobs.shutdown()
+    assert stored["species"][1]["TUNING"]["reference_ttl"] == 3600
+    assert stored["places"][1] == old_settings
+
+
+def _observations_columns(sql, function, alias):
+    """Return the expression of each column inserted into observations by a SQL function, and the columns updated."""
+    body = sql.split(f"FUNCTION {function}(")[1].split("LANGUAGE plpgsql")[0]
+    insert = re.search(
+        r"INSERT INTO \{\{ db_schema_vn \}\}\.observations \((.*?)\)\s*SELECT(.*?)\n\s*FROM ", body, re.S
+    )
+    columns = [c.strip() for c in insert.group(1).split(",")]
+    expressions = [e.strip().replace(alias + ".", "") for e in insert.group(2).split(",\n")]
+    updated = re.findall(r"^\s*\"?(\w+)\"?\s*= EXCLUDED\.", body.split("DO UPDATE SET")[1], re.M)
+    return dict(zip(columns, expressions, strict=True)), updated
+
+
+def test_refresh_observations_columns():
+    """The set-based refresh extracts the same observations columns as the trigger."""
+    sql = (Path(transfer_vn.__file__).parent / "sql" / "create-vn-tables.sql").read_text()
+    trigger, trigger_updated = _observations_columns(sql, "update_observations", "n")
+    refresh, refresh_updated = _observations_columns(sql, "refresh_observations", "j")
+    assert len(trigger) == 35
+    assert refresh == trigger
+    assert sorted(refresh_updated) == sorted(trigger_updated) == sorted(set(trigger) - {"site", "id_sighting"})
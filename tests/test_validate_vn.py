@@ -0,0 +1,108 @@
+"""
+Test validation of downloaded files by validate_vn.
+
+No VisioNature account is needed. Tests of compiled schemas are skipped if fastjsonschema is not installed.
+"""
+
+import gzip
+import json
+import logging
+
+import pytest
+from click.testing import CliRunner
+
+from schemas import validate_vn
+
+CONFIG = "evn_validate.toml"
+
+
+def _write(path, js):
+    with gzip.open(path, "wt") as f:
+        json.dump(js, f)
+    return path
+
+
+@pytest.fixture
+def compiled(tmp_path):
+    """Compiled schemas cached in a temporary directory."""
+    pytest.importorskip("fastjsonschema")
+    validate_vn.set_compiled_cache(tmp_path / "cache")
+    yield tmp_path / "cache"
+    validate_vn.set_compiled_cache(None)
+
+
+def test_compiled_cached(compiled):
+    """Schemas are compiled once, then loaded from the cache."""
+    validate = validate_vn._compiled_validator("taxo_groups")
+    cached = list(compiled.glob("taxo_groups_*.py"))
+    assert len(cached) == 1
+    validate_vn.set_compiled_cache(compiled)
+    mtime = cached[0].stat().st_mtime_ns
+    assert validate_vn._compiled_validator("taxo_groups") is not validate
+    assert list(compiled.glob("taxo_groups_*.py")) == cached
+    assert cached[0].stat().st_mtime_ns == mtime
+
+
+def test_compiled_same_errors(compiled, tmp_path):
+    """Compiled and interpreted schemas report the same errors."""
+    files = [
+        _write(tmp_path / "taxo_groups_1.json.gz", {"data": [{"id": "1", "name": "Oiseaux"}]}),
+        _write(tmp_path / "taxo_groups_2.json.gz", {"data": [{"id": 1}]}),
+        _write(tmp_path / "taxo_groups_3.json.gz", {"data": "1"}),
+    ]
+    errors = [validate_vn._validate_file("taxo_groups", f) for f in files]
+    validate_vn.set_compiled_cache(None)
+    assert [validate_vn._validate_file("taxo_groups", f) for f in files] == errors
+    assert errors[0] is None
+    assert errors[1] is not None
+    assert errors[2] is not None
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """File store and configuration file in a temporary home directory."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / CONFIG).write_text('[file]\nfile_store = "store"\n')
+    (tmp_path / "store").mkdir()
+    handlers = list(validate_vn.logger.handlers)
+    yield tmp_path / "store"
+    # Remove handlers added by each command
+    validate_vn.logger.handlers = handlers
+    validate_vn.set_compiled_cache(None)
+
+
+def _validate(*args):
+    return CliRunner().invoke(validate_vn.main, ["validate", "--interpreted", *args, CONFIG])
+
+
+def _done(store):
+    return sorted(f.name for f in store.glob("*.done"))
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_validate_jobs(store, caplog, jobs):
+    """Files are validated in parallel with the same results, reported by schema."""
+    for i in range(4):
+        _write(store / f"taxo_groups_{i}.json.gz", {"data": [{"id": str(i), "name": "Oiseaux"}]})
+    _write(store / "taxo_groups_8.json.gz", {"data": [{"id": 8}]})
+    _write(store / "taxo_groups_9.json.gz", {"data": "9"})
+    with caplog.at_level(logging.INFO, logger=validate_vn.__name__):
+        result = _validate("--samples", "6", "--jobs", jobs)
+    assert result.exit_code == 1
+    assert "2 files do not match their schema" in result.output
+    assert _done(store) == [f"taxo_groups_{i}.json.gz.done" for i in range(4)]
+    assert "Schema taxo_groups: 4 files validated, 2 files with errors" in caplog.messages
+
+
+def test_validate_seed(store):
+    """Files sampled with the same seed are the same."""
+    for i in range(10):
+        _write(store / f"species_{i}.json.gz", {"data": []})
+    assert _validate("--samples", "3", "--seed", "7").exit_code == 0
+    sampled = _done(store)
+    assert len(sampled) == 3
+    for f in store.glob("*.done"):
+        f.rename(f.with_suffix(""))
+    assert _validate("--samples", "3", "--seed", "7", "--jobs", "2").exit_code == 0
+    assert _done(store) == sampled